@@ -0,0 +1,351 @@
+# analyzer/ast_nodes.py
+# Nodos del AST con posición en el código fuente
+#
+# Cada tipo de nodo es una clase con __slots__ (sin __dict__ por instancia) y
+# campos con nombre: node.left, node.op, node.right... Para no romper el
+# código que trata los nodos como tuplas ('binop', izq, op, der, linea), cada
+# nodo se indexa, desempaqueta, compara y se imprime igual que esa tupla.
+
+from operator import attrgetter
+
+
+class Node:
+    """
+    Base de los nodos del AST. `kind` es el primer elemento de la tupla
+    equivalente y `fields` los nombres del resto, en orden. `start` y `end`
+    son el rango [start, end) de offsets del código fuente que cubre.
+
+    La igualdad es estructural (también contra tuplas), así que los nodos no
+    son hasheables, igual que sus tuplas equivalentes, que contienen listas.
+    Las cachés por nodo usan id(nodo) como clave.
+    """
+
+    __slots__ = ('start', 'end')
+    kind = None
+    fields = ()
+
+    def as_tuple(self):
+        """Tupla equivalente (solo el primer nivel)."""
+        # Cada subclase tiene una versión generada sin bucle
+        return (self.kind,) + tuple([getattr(self, name) for name in self.fields])
+
+    @property
+    def span(self):
+        return self.start, self.end
+
+    def __getitem__(self, index):
+        if index == 0:
+            return self.kind
+        return self.as_tuple()[index]
+
+    def __len__(self):
+        return len(self.fields) + 1
+
+    def __iter__(self):
+        return iter(self.as_tuple())
+
+    def __eq__(self, other):
+        if isinstance(other, Node):
+            return self is other or self.as_tuple() == other.as_tuple()
+        if isinstance(other, tuple):
+            return self.as_tuple() == other
+        return NotImplemented
+
+    __hash__ = None
+
+    def __reduce__(self):
+        # Se serializa el subárbol entero aplanado (ver flatten): pickle no
+        # recorre nodos anidados, que con árboles profundos agotarían su
+        # recursión
+        return unflatten, (flatten(self),)
+
+    def __repr__(self):
+        return tuple_repr(self)
+
+
+# Campos de cada tipo de nodo, en el orden de la tupla que arma el parser
+NODE_FIELDS = {
+    'program': ('items',),
+    # Declaraciones
+    'fn': ('name', 'params', 'return_type', 'body'),
+    'param': ('name', 'param_type'),
+    'struct': ('name', 'fields_list'),
+    'field': ('name', 'field_type'),
+    'enum_decl': ('name', 'variants'),
+    'trait_decl': ('name', 'items'),
+    'fn_signature': ('name', 'params', 'return_type'),
+    'impl_block': ('name', 'target', 'items'),
+    'const': ('name', 'declared_type', 'value'),
+    'static': ('name', 'declared_type', 'value'),
+    'static_mut': ('name', 'declared_type', 'value'),
+    # Sentencias
+    'let': ('name', 'declared_type', 'value', 'line'),
+    'let_mut': ('name', 'declared_type', 'value', 'line'),
+    'assign': ('target', 'op', 'value', 'line'),
+    'input_stmt': ('target', 'receiver', 'method', 'args'),
+    'println': ('format', 'args'),
+    'if': ('condition', 'body'),
+    'if_else': ('condition', 'then_body', 'else_body'),
+    'while_loop': ('condition', 'body'),
+    'for_loop': ('variable', 'iterable', 'body'),
+    'infinite_loop': ('body',),
+    'break_stmt': (),
+    'continue_stmt': (),
+    'return_stmt': ('value',),
+    # Expresiones
+    'literal': ('value', 'token_type'),
+    'binop': ('left', 'op', 'right', 'line'),
+    'comparison': ('left', 'op', 'right'),
+    'range': ('low', 'high'),
+    'and': ('left', 'right'),
+    'or': ('left', 'right'),
+    'not': ('operand',),
+    'path_expr': ('path',),
+    'array_literal': ('elements',),
+    'array_repeat': ('value', 'size'),
+    'tuple_literal': ('elements',),
+    'struct_init': ('name', 'fields_list'),
+    'struct_field': ('name', 'value'),
+    'closure': ('params', 'return_type', 'body'),
+    'block': ('statements',),
+    'input_expr': (),
+    'function_call': ('name', 'args'),
+    'method_call': ('receiver', 'method', 'args'),
+    'property_access': ('receiver', 'name'),
+    'path_call': ('path', 'args'),
+    'reference': ('mode', 'target'),
+    # Código descartado por la recuperación de errores sintácticos
+    'error': ('line',),
+}
+
+# Campos de cada tipo de nodo que contienen otros nodos: NODE (un nodo o
+# None) o NODES (lista de nodos). El resto de los campos son valores: nombres,
+# tipos, operadores, líneas...
+NODE = 'node'
+NODES = 'nodes'
+NODE_CHILDREN = {
+    'program': {'items': NODES},
+    'fn': {'params': NODES, 'body': NODES},
+    'struct': {'fields_list': NODES},
+    'trait_decl': {'items': NODES},
+    'fn_signature': {'params': NODES},
+    'impl_block': {'items': NODES},
+    'const': {'value': NODE},
+    'static': {'value': NODE},
+    'static_mut': {'value': NODE},
+    'let': {'value': NODE},
+    'let_mut': {'value': NODE},
+    'assign': {'value': NODE},
+    'input_stmt': {'receiver': NODE, 'args': NODES},
+    'println': {'args': NODES},
+    'if': {'condition': NODE, 'body': NODES},
+    'if_else': {'condition': NODE, 'then_body': NODES, 'else_body': NODES},
+    'while_loop': {'condition': NODE, 'body': NODES},
+    'for_loop': {'iterable': NODE, 'body': NODES},
+    'infinite_loop': {'body': NODES},
+    'return_stmt': {'value': NODE},
+    'binop': {'left': NODE, 'right': NODE},
+    'comparison': {'left': NODE, 'right': NODE},
+    'range': {'low': NODE, 'high': NODE},
+    'and': {'left': NODE, 'right': NODE},
+    'or': {'left': NODE, 'right': NODE},
+    'not': {'operand': NODE},
+    'array_literal': {'elements': NODES},
+    'array_repeat': {'value': NODE, 'size': NODE},
+    'tuple_literal': {'elements': NODES},
+    'struct_init': {'fields_list': NODES},
+    'struct_field': {'value': NODE},
+    'closure': {'params': NODES, 'body': NODE},
+    'block': {'statements': NODES},
+    'function_call': {'args': NODES},
+    'method_call': {'receiver': NODE, 'args': NODES},
+    'property_access': {'receiver': NODE},
+    'path_call': {'args': NODES},
+}
+
+# Lo mismo en orden de campos: (índice en la tupla equivalente, nombre del
+# slot, es_lista) de cada campo con nodos. El índice sirve para tuplas y
+# registros aplanados, el nombre para leer el slot de un nodo
+CHILD_LAYOUTS = {
+    kind: tuple(
+        (index, field, NODE_CHILDREN[kind][field] == NODES)
+        for index, field in enumerate(fields, 1) if field in NODE_CHILDREN.get(kind, ())
+    )
+    for kind, fields in NODE_FIELDS.items()
+}
+
+# Constructor, conversión a tupla, indexación e iteración de cada clase,
+# generados (como hace namedtuple) para recorrer los slots sin un bucle por
+# campo
+_CLASS_TEMPLATE = """\
+def build(values, start=None, end=None):
+    node = new(cls)
+    {assign}
+    node.start = start
+    node.end = end
+    return node
+
+def as_tuple(self):
+    return (kind, {values})
+
+def __getitem__(self, index):
+    if index == 0:
+        return kind
+    if type(index) is int:
+        return getters[index](self)
+    return (kind, {values})[index]
+
+def __iter__(self):
+    return iter((kind, {values}))
+"""
+
+
+def _node_class(kind, fields):
+    name = ''.join(part.capitalize() for part in kind.split('_')) + 'Node'
+    cls = type(name, (Node,), {'__slots__': fields, 'kind': kind, 'fields': fields})
+    if fields:
+        assign = '{}, = values'.format(', '.join('node.' + field for field in fields))
+    else:
+        assign = 'pass'
+    values = ''.join('self.{}, '.format(field) for field in fields)
+    # Lectura de cada posición de la tupla equivalente: el tipo y luego el
+    # slot de cada campo, sin armar la tupla
+    getters = (lambda node: kind,) + tuple(attrgetter(field) for field in fields)
+    namespace = {'new': object.__new__, 'cls': cls, 'kind': kind, 'getters': getters}
+    exec(_CLASS_TEMPLATE.format(assign=assign, values=values), namespace)
+    cls.build = staticmethod(namespace['build'])
+    for name in ('as_tuple', '__getitem__', '__iter__'):
+        setattr(cls, name, namespace[name])
+    return cls
+
+
+NODE_CLASSES = {kind: _node_class(kind, fields) for kind, fields in NODE_FIELDS.items()}
+# Las clases quedan también como nombres del módulo (FnNode, BinopNode...)
+globals().update({cls.__name__: cls for cls in NODE_CLASSES.values()})
+
+
+def make_node(fields, start=None, end=None):
+    """
+    Convierte la tupla que arma una regla, ('binop', izq, op, der, linea), en
+    su nodo. Las tuplas de un tipo desconocido se devuelven sin cambios.
+    """
+    cls = NODE_CLASSES.get(fields[0]) if fields else None
+    if cls is None:
+        return fields
+    return cls.build(fields[1:], start, end)
+
+
+def as_nodes(root):
+    """
+    Convierte un árbol armado con tuplas, ('let', 'x', None, ('literal', ...),
+    1), en nodos, sin recursión. Los nodos que ya lo son se conservan y las
+    tuplas de un tipo desconocido quedan como tuplas (sin revisar su
+    contenido). Un `root` que no es tupla se devuelve sin cambios.
+    """
+    if not _is_node_tuple(root):
+        return root
+    # Tuplas a convertir en preorden; se arman de atrás hacia adelante para
+    # que los hijos estén listos antes que su padre
+    pending = [root]
+    for value in pending:
+        for index, _, is_list in CHILD_LAYOUTS[value[0]]:
+            children = value[index] if is_list else (value[index],)
+            pending.extend(child for child in children if _is_node_tuple(child))
+    built = {}
+    for value in reversed(pending):
+        fields = list(value)
+        for index, _, is_list in CHILD_LAYOUTS[value[0]]:
+            child = fields[index]
+            if is_list:
+                fields[index] = [built.get(id(item), item) for item in child]
+            else:
+                fields[index] = built.get(id(child), child)
+        built[id(value)] = NODE_CLASSES[value[0]].build(fields[1:])
+    return built[id(root)]
+
+
+def _is_node_tuple(value):
+    return type(value) is tuple and len(value) > 0 and value[0] in NODE_CLASSES
+
+
+def node_span(node):
+    """Rango (start, end) de un nodo, o None si no tiene posición."""
+    start = getattr(node, 'start', None)
+    if start is None:
+        return None
+    return start, node.end
+
+
+def flatten(root):
+    """
+    Nodos del subárbol de `root` en anchura, cada uno como la lista
+    [tipo, campos..., start, end] de su tupla equivalente con cada hijo
+    reemplazado por su posición en el resultado, y cada lista de hijos (que
+    quedan contiguos) por (primera posición, cantidad). Sin recursión.
+    """
+    records = []
+    nodes = [root]
+    for node in nodes:
+        values = list(node.as_tuple())
+        for index, _, is_list in CHILD_LAYOUTS[values[0]]:
+            value = values[index]
+            if is_list:
+                values[index] = (len(nodes), len(value))
+                nodes.extend(value)
+            elif value is not None:
+                values[index] = len(nodes)
+                nodes.append(value)
+        values.append(node.start)
+        values.append(node.end)
+        records.append(values)
+    return records
+
+
+def unflatten(records):
+    """Reconstruye el árbol que `flatten` aplanó y devuelve su raíz."""
+    # Los hijos siempre están después de su padre: se arma de atrás hacia
+    # adelante
+    nodes = [None] * len(records)
+    for position in range(len(records) - 1, -1, -1):
+        values = records[position]
+        kind = values[0]
+        for index, _, is_list in CHILD_LAYOUTS[kind]:
+            value = values[index]
+            if is_list:
+                first, count = value
+                values[index] = nodes[first:first + count]
+            elif value is not None:
+                values[index] = nodes[value]
+        nodes[position] = NODE_CLASSES[kind].build(values[1:-2], values[-2], values[-1])
+    return nodes[0]
+
+
+def tuple_repr(root):
+    """
+    repr() de la tupla equivalente a `root` (con los nodos anidados también
+    como tuplas), armado sin recursión.
+    """
+    parts = []
+    # (es_texto, valor): texto ya armado o valor a mostrar
+    stack = [(False, root)]
+    while stack:
+        is_text, value = stack.pop()
+        if is_text:
+            parts.append(value)
+            continue
+        if isinstance(value, Node):
+            value = value.as_tuple()
+        if type(value) is tuple:
+            opening, closing = '(', ',)' if len(value) == 1 else ')'
+        elif type(value) is list:
+            opening, closing = '[', ']'
+        else:
+            parts.append(repr(value))
+            continue
+        parts.append(opening)
+        stack.append((True, closing))
+        for position in range(len(value) - 1, -1, -1):
+            stack.append((False, value[position]))
+            if position:
+                stack.append((True, ', '))
+    return ''.join(parts)
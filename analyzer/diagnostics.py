@@ -0,0 +1,179 @@
+# analyzer/diagnostics.py
+# Diagnósticos del analizador semántico
+#
+# Una regla que encuentra un error no arma el mensaje: registra un
+# Diagnostic con el código de la regla, sus argumentos (nombres, tipos,
+# operadores) y la línea. El texto se arma solo al pedirlo, en el idioma
+# pedido, así que filtrar, ordenar, deduplicar o recortar los diagnósticos
+# no formatea ningún mensaje.
+
+ERROR = 'error'
+WARNING = 'warning'
+
+DEFAULT_LOCALE = 'es'
+
+# Plantilla de cada código por idioma. Los argumentos se formatean con
+# str.format; los tipos (semantic_types.Type) se muestran como texto.
+MESSAGES = {
+    'es': {
+        'undeclared-variable': "Identificador no encontrado. La variable '{name}' no ha sido declarada en este alcance.",
+        'out-of-scope': "El identificador '{name}' no es accesible. Fue definido en un alcance interno que ya finalizó.",
+        'uninitialized-variable': "se usó la variable no inicializada '{name}'.",
+        'missing-type': "las declaraciones sin valor deben tener un tipo explícito.",
+        'let-type-mismatch': "Discrepancia de tipos. Se esperaba tipo '{expected}' pero se encontró tipo '{found}' en la asignación de '{name}'.",
+        'assign-type-mismatch': "Discrepancia de tipos en la reasignación. La variable '{name}' tiene el tipo '{expected}', pero se intentó asignar un valor de tipo '{found}'.",
+        'immutable-assign': "No se puede asignar a la variable inmutable '{name}'. Las variables deben ser declaradas con 'mut' para poder ser reasignadas.",
+        'array-size': "el tamaño del array debe ser un entero, pero se encontró tipo '{found}'.",
+        'arithmetic-operand': "Operador aritmético '{op}' no puede aplicarse a tipo '{found}'. Se esperaba un tipo numérico.",
+        'arithmetic-mismatch': "Operador aritmético '{op}' no puede aplicarse a tipos '{left}' y '{right}'. No existe una implementación para esta operación.",
+        'logical-operand': "Operador lógico '{op}' no puede aplicarse al tipo '{found}'. Se esperaba 'bool'.",
+        'range-start': "Rango debe tener inicio numérico, se encontró '{found}'.",
+        'range-end': "Rango debe tener fin numérico, se encontró '{found}'.",
+        'break-outside-loop': "'break' solo puede usarse dentro de un bucle (while, for, loop).",
+        'continue-outside-loop': "'continue' solo puede usarse dentro de un bucle (while, for, loop).",
+        'return-outside-function': "'return' solo puede usarse dentro de una función.",
+        'internal-error': "Error en análisis semántico: {message}",
+    },
+    'en': {
+        'undeclared-variable': "Identifier not found. The variable '{name}' has not been declared in this scope.",
+        'out-of-scope': "The identifier '{name}' is not accessible. It was defined in an inner scope that has already ended.",
+        'uninitialized-variable': "used the uninitialized variable '{name}'.",
+        'missing-type': "declarations without a value must have an explicit type.",
+        'let-type-mismatch': "Mismatched types. Expected type '{expected}' but found type '{found}' in the assignment of '{name}'.",
+        'assign-type-mismatch': "Mismatched types in reassignment. The variable '{name}' has type '{expected}', but a value of type '{found}' was assigned.",
+        'immutable-assign': "Cannot assign to the immutable variable '{name}'. Variables must be declared with 'mut' to be reassigned.",
+        'array-size': "the array size must be an integer, but found type '{found}'.",
+        'arithmetic-operand': "Arithmetic operator '{op}' cannot be applied to type '{found}'. Expected a numeric type.",
+        'arithmetic-mismatch': "Arithmetic operator '{op}' cannot be applied to types '{left}' and '{right}'. There is no implementation for this operation.",
+        'logical-operand': "Logical operator '{op}' cannot be applied to type '{found}'. Expected 'bool'.",
+        'range-start': "Range must have a numeric start, found '{found}'.",
+        'range-end': "Range must have a numeric end, found '{found}'.",
+        'break-outside-loop': "'break' can only be used inside a loop (while, for, loop).",
+        'continue-outside-loop': "'continue' can only be used inside a loop (while, for, loop).",
+        'return-outside-function': "'return' can only be used inside a function.",
+        'internal-error': "Semantic analysis failed: {message}",
+    },
+}
+
+# Encabezado de los mensajes de las reglas: (título, etiqueta de línea)
+HEADERS = {
+    'es': ('Error Semántico', 'Línea'),
+    'en': ('Semantic error', 'line'),
+}
+
+# Códigos cuyo mensaje se muestra sin encabezado
+_BARE_CODES = frozenset(('internal-error',))
+
+_PLAIN_TYPES = (str, int, float, bool, type(None))
+
+
+def _plain(value):
+    """`value` si es un valor simple; si no (un tipo, por ejemplo), su texto."""
+    return value if type(value) in _PLAIN_TYPES else str(value)
+
+
+def _plain_args(args):
+    return {name: _plain(value) for name, value in args.items()}
+
+
+class Diagnostic:
+    """
+    Error (o advertencia) encontrado por una regla semántica.
+
+    `code` identifica la regla (ver MESSAGES), `args` son los valores que
+    completan su mensaje y `line` la línea que muestra el mensaje (None si la
+    regla no la conoce). `span` es el rango (start, end) de offsets del nodo
+    que se visitaba y `position` la (línea, columna) real de su inicio en el
+    código; ambos se completan después de registrar el diagnóstico.
+    """
+
+    __slots__ = ('code', 'severity', 'line', 'args', 'span', 'position')
+
+    def __init__(self, code, line=None, args=None, severity=ERROR, span=None, position=None):
+        self.code = code
+        self.severity = severity
+        self.line = line
+        self.args = args or {}
+        self.span = span
+        self.position = position
+
+    def render(self, locale=DEFAULT_LOCALE):
+        """Mensaje del diagnóstico en `locale` (o en español si no está)."""
+        messages = MESSAGES.get(locale)
+        if messages is None:
+            locale, messages = DEFAULT_LOCALE, MESSAGES[DEFAULT_LOCALE]
+        text = messages[self.code].format(**self.args)
+        if self.code in _BARE_CODES:
+            return text
+        title, line_label = HEADERS[locale]
+        if self.line:
+            return f'{title} ({line_label} {self.line}): {text}'
+        return f'{title}: {text}'
+
+    def __str__(self):
+        return self.render()
+
+    def __format__(self, spec):
+        return format(self.render(), spec)
+
+    def __repr__(self):
+        return f'Diagnostic({self.code!r}, line={self.line!r}, args={self.args!r})'
+
+    @property
+    def key(self):
+        """
+        Lo que identifica al diagnóstico: dos con la misma clave dicen lo
+        mismo. Los tipos están internados, así que se comparan por identidad
+        sin armar su texto.
+        """
+        return self.code, self.line, tuple(self.args.items())
+
+    def __eq__(self, other):
+        if not isinstance(other, Diagnostic):
+            return NotImplemented
+        # Los argumentos se comparan como texto: un diagnóstico deserializado
+        # (con los tipos como texto) es igual al original
+        return (self.code, self.line, self.severity, self.span, self.position) == \
+            (other.code, other.line, other.severity, other.span, other.position) and \
+            _plain_args(self.args) == _plain_args(other.args)
+
+    def __hash__(self):
+        return hash((self.code, self.line))
+
+    def __reduce__(self):
+        # Los tipos viajan como texto: un tipo muy anidado agotaría la
+        # recursión de pickle, y fuera del análisis solo se muestran
+        return Diagnostic, (self.code, self.line, _plain_args(self.args), self.severity, self.span, self.position)
+
+
+def locate_diagnostics(diagnostics, line_index):
+    """Completa `position` de cada diagnóstico a partir de su `span`."""
+    for diagnostic in diagnostics:
+        if diagnostic.span is not None:
+            diagnostic.position = line_index.position(diagnostic.span[0])
+
+
+def select_diagnostics(diagnostics, severities=None, unique=False, ordered=False, limit=None):
+    """
+    Diagnósticos de las severidades pedidas (todas si es None), sin repetir
+    los que dicen lo mismo en la misma línea si `unique`, ordenados por
+    posición en el código si `ordered` (los que no tienen posición van al
+    final, en su orden) y como mucho `limit`. No arma ningún mensaje.
+    """
+    selected = diagnostics
+    if severities is not None:
+        selected = [diagnostic for diagnostic in selected if diagnostic.severity in severities]
+    if unique:
+        seen = set()
+        selected = [
+            diagnostic for diagnostic in selected
+            if not (diagnostic.key in seen or seen.add(diagnostic.key))
+        ]
+    if ordered:
+        selected = sorted(
+            selected,
+            key=lambda diagnostic: diagnostic.span[0] if diagnostic.span is not None else float('inf'),
+        )
+    if limit is not None:
+        selected = selected[:limit]
+    return list(selected)
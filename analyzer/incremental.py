@@ -0,0 +1,246 @@
+# analyzer/incremental.py
+# Re-análisis incremental a nivel de items de primer nivel
+#
+# Un programa es una secuencia de items (fn, struct, enum, trait, impl, const,
+# static) que se analizan de forma independiente: el AST de un item no depende
+# de los demás. Tras una edición solo se vuelven a analizar los items cuyos
+# tokens cambiaron; el resto se reutiliza tal cual.
+
+try:
+    from .ply_lexer import TOKEN_TYPE_IDS, relex_edit, tokenize_source
+    from .ply_parser_final import ParseSession
+    from .ast_nodes import Node, flatten, make_node, unflatten
+except ImportError:
+    from ply_lexer import TOKEN_TYPE_IDS, relex_edit, tokenize_source
+    from ply_parser_final import ParseSession
+    from ast_nodes import Node, flatten, make_node, unflatten
+
+# Tokens que abren un item de primer nivel. const/static terminan en ';' y el
+# resto al cerrar su bloque '{ ... }'.
+_BLOCK_ITEMS = frozenset(TOKEN_TYPE_IDS[name] for name in ("FN", "STRUCT", "ENUM", "TRAIT", "IMPL"))
+_STATEMENT_ITEMS = frozenset(TOKEN_TYPE_IDS[name] for name in ("CONST", "STATIC"))
+_LBRACE = TOKEN_TYPE_IDS["LBRACE"]
+_RBRACE = TOKEN_TYPE_IDS["RBRACE"]
+_SEMICOLON = TOKEN_TYPE_IDS["SEMICOLON"]
+
+# Nodos del AST que guardan su número de línea en la última posición
+LINE_NODES = frozenset(('let', 'let_mut', 'binop', 'assign'))
+
+
+def split_items(tokens, start=0, stop=None):
+    """
+    Divide los tokens [start, stop) en items de primer nivel contando llaves.
+    Devuelve una lista de rangos (inicio, fin) o None si el rango no es una
+    secuencia limpia de items (tokens sueltos, llaves sin balancear...).
+    """
+    types = tokens.types
+    stop = len(types) if stop is None else stop
+    spans = []
+    index = start
+    while index < stop:
+        kind = types[index]
+        if kind in _STATEMENT_ITEMS:
+            terminator = _SEMICOLON
+        elif kind in _BLOCK_ITEMS:
+            terminator = _RBRACE
+        else:
+            return None
+
+        depth = 0
+        end = None
+        for position in range(index + 1, stop):
+            type_id = types[position]
+            if type_id == _LBRACE:
+                depth += 1
+            elif type_id == _RBRACE:
+                depth -= 1
+                if depth < 0:
+                    return None
+            if depth == 0 and type_id == terminator:
+                end = position + 1
+                break
+        if end is None:
+            return None
+        spans.append((index, end))
+        index = end
+    return spans
+
+
+def rebase(node, line_delta, offset_delta):
+    """
+    Copia de `node` (o de una lista de nodos) con los números de línea
+    desplazados en `line_delta` y los rangos en el código fuente en
+    `offset_delta`. Se copia aplanado (ver flatten), sin recursión, así que
+    no depende de la profundidad del árbol.
+    """
+    if type(node) is list:
+        return [rebase(child, line_delta, offset_delta) for child in node]
+    if not isinstance(node, Node):
+        return node
+    records = flatten(node)
+    for values in records:
+        if values[-2] is not None:
+            values[-2] += offset_delta
+        if values[-1] is not None:
+            values[-1] += offset_delta
+        if line_delta and values[0] in LINE_NODES:
+            values[-3] += line_delta
+    return unflatten(records)
+
+
+class IncrementalParser:
+    """
+    Mantiene el AST de un documento y lo actualiza tras cada edición.
+
+    Cada item recuerda su rango de tokens. Una edición re-tokeniza solo la
+    zona afectada (`relex_edit`) y re-analiza solo los items que tocan los
+    tokens cambiados. Los items anteriores a la edición conservan su
+    identidad; los posteriores también si la edición no cambia la longitud
+    del texto, y si no solo acumulan el desplazamiento de líneas y offsets,
+    que se aplica (copiándolos) recién al leer `ast`.
+
+    Si algún item nuevo tiene errores, o la edición rompe la estructura de
+    items, se hace un análisis completo para que los errores coincidan con
+    los de `parse_source`.
+    """
+
+    def __init__(self, source=""):
+        self.session = ParseSession()
+        self.tokens = None
+        self.syntax_errors = []
+        # AST completo cuando el último análisis no dejó una secuencia limpia
+        # de items; si no, el programa se arma a partir de `_items`
+        self._ast = None
+        self._items = []
+        # Desplazamiento pendiente (líneas, offset) de cada item
+        self._shifts = []
+        # Rangos de tokens de cada item; None si no hay secuencia limpia
+        self.spans = None
+        # Cantidad de items analizados en la última actualización
+        self.reparsed = 0
+        self.parse(source)
+
+    @property
+    def source(self):
+        return self.tokens.source
+
+    @property
+    def ast(self):
+        if self.spans is None:
+            return self._ast
+        if any(self._shifts):
+            self._items = [
+                rebase(item, *shift) if shift else item
+                for item, shift in zip(self._items, self._shifts)
+            ]
+            self._shifts = [None] * len(self._items)
+            self._ast = None
+        if self._ast is None:
+            items = list(self._items)
+            if items:
+                self._ast = make_node(('program', items), items[0].start, items[-1].end)
+            else:
+                self._ast = make_node(('program', items))
+        return self._ast
+
+    def parse(self, source):
+        """Analiza `source` completo y devuelve (ast, errores_sintacticos)."""
+        self.tokens = tokenize_source(source, self.session.lexer)
+        self._parse_all()
+        return self.ast, self.syntax_errors
+
+    def _parse_all(self):
+        ast, errors = self.session.parse_tokens(self.tokens)
+        spans = None
+        if ast is not None and not errors:
+            spans = split_items(self.tokens)
+            if spans is not None and len(spans) != len(ast[1]):
+                spans = None
+        self._ast, self.syntax_errors, self.spans = ast, errors, spans
+        self._items = list(ast[1]) if spans is not None else []
+        self._shifts = [None] * len(self._items)
+        self.reparsed = len(ast[1]) if ast else 0
+
+    def apply_edits(self, edits):
+        """
+        Aplica ediciones `(start, end, replacement)` expresadas sobre el texto
+        actual (sin solaparse). El resultado queda en `ast` y `syntax_errors`.
+        """
+        reparsed = 0
+        for start, end, replacement in sorted(edits, key=lambda edit: edit[0], reverse=True):
+            self.edit(start, end, replacement)
+            reparsed += self.reparsed
+        self.reparsed = reparsed
+
+    def edit(self, start, end, replacement):
+        """
+        Reemplaza source[start:end] por `replacement` y actualiza el análisis.
+        No arma el AST: se obtiene con `ast` cuando se necesita.
+        """
+        old_source = self.tokens.source
+        line_delta = replacement.count("\n") - old_source.count("\n", start, end)
+        offset_delta = len(replacement) - (end - start)
+        self.tokens, first, old_stop, new_stop = relex_edit(
+            self.tokens, start, end, replacement, self.session.lexer
+        )
+        if self.spans is None:
+            return self._parse_all()
+
+        spans = self.spans
+        # Items afectados: los que contienen tokens cambiados o, si solo se
+        # insertaron tokens, los que contienen el punto de inserción. Un
+        # desplazamiento dentro de un item también obliga a re-analizarlo.
+        if old_stop > first:
+            dirty = [i for i, (a, b) in enumerate(spans) if a < old_stop and b > first]
+        elif new_stop > first or line_delta or offset_delta:
+            dirty = [i for i, (a, b) in enumerate(spans) if a < first < b]
+        else:
+            dirty = []
+
+        if dirty:
+            low, high = dirty[0], dirty[-1] + 1
+            region_start, region_stop = spans[low][0], spans[high - 1][1]
+        else:
+            low = high = next((i for i, (a, _) in enumerate(spans) if a >= first), len(spans))
+            region_start = region_stop = first
+            if new_stop == first:
+                # Solo cambiaron espacios o comentarios
+                return self._splice(low, high, [], [], 0, line_delta, offset_delta)
+
+        shift = new_stop - old_stop
+        # Si la edición desbalanceó llaves, el item absorbe a los siguientes
+        while True:
+            new_spans = split_items(self.tokens, region_start, region_stop + shift)
+            if new_spans is not None or high == len(spans):
+                break
+            region_stop = spans[high][1]
+            high += 1
+        if new_spans is None:
+            return self._parse_all()
+
+        nodes = []
+        for item_start, item_stop in new_spans:
+            ast, errors = self.session.parse_tokens(self.tokens, item_start, item_stop)
+            if ast is None or errors or len(ast[1]) != 1:
+                return self._parse_all()
+            nodes.append(ast[1][0])
+        self._splice(low, high, new_spans, nodes, shift, line_delta, offset_delta)
+
+    def _splice(self, low, high, new_spans, nodes, shift, line_delta, offset_delta):
+        tail_shifts = self._shifts[high:]
+        if line_delta or offset_delta:
+            tail_shifts = [
+                (pending[0] + line_delta, pending[1] + offset_delta) if pending
+                else (line_delta, offset_delta)
+                for pending in tail_shifts
+            ]
+        tail_spans = self.spans[high:]
+        if shift:
+            tail_spans = [(a + shift, b + shift) for a, b in tail_spans]
+
+        self.spans = self.spans[:low] + new_spans + tail_spans
+        self._items[low:high] = nodes
+        self._shifts = self._shifts[:low] + [None] * len(nodes) + tail_shifts
+        self._ast = None
+        self.syntax_errors = []
+        self.reparsed = len(nodes)
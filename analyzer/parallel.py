@@ -0,0 +1,208 @@
+# analyzer/parallel.py
+# Análisis sintáctico en paralelo de archivos grandes.
+#
+# Los items de primer nivel se analizan de forma independiente, así que un
+# archivo grande se puede cortar entre items y repartir los trozos entre
+# procesos. Un pre-escaneo barato (una expresión regular que solo reconoce
+# llaves, ';', cadenas, caracteres y comentarios) encuentra los puntos de
+# corte sin tokenizar; cada proceso tokeniza y analiza su trozo desde la
+# línea donde empieza y devuelve los items con los offsets del archivo
+# completo, y el proceso principal concatena los items y los errores en un
+# único nodo 'program'.
+#
+# Configuración (variables de entorno):
+#   PARALLEL_PARSE_WORKERS    procesos del pool (por defecto, los núcleos)
+#   PARALLEL_PARSE_MIN_BYTES  tamaño mínimo del código para analizar en
+#                             paralelo; por debajo se analiza en serie
+
+import gc
+import multiprocessing
+import os
+import pickle
+import re
+from concurrent.futures import ProcessPoolExecutor
+
+try:
+    from .ast_nodes import flatten, make_node, unflatten
+    from .ply_lexer import tokenize_source
+    from .ply_parser_final import ParseSession
+except ImportError:
+    from ast_nodes import flatten, make_node, unflatten
+    from ply_lexer import tokenize_source
+    from ply_parser_final import ParseSession
+
+
+# Lo único que mira el pre-escaneo. Cadenas, caracteres y comentarios se
+# reconocen igual que en el lexer para no contar las llaves que contienen.
+_SCAN_PATTERN = re.compile(
+    r'"(?:[^"\\\n]|\\[^\n])*"'
+    r"|'(?:[^'\\\n]|\\[^\n])'"
+    r"|//[^\n]*"
+    r"|/\*[\s\S]*?\*/"
+    r"|[{};]"
+)
+# Un corte solo es válido si lo que sigue (salvo espacios y comentarios) es el
+# inicio de un item: así `static S: P = P { x: 1 };` no se corta tras la '}'
+_ITEM_START = re.compile(
+    r"(?:\s|//[^\n]*|/\*[\s\S]*?\*/)*(?:fn|struct|enum|trait|impl|const|static)\b"
+)
+
+# Trozos por proceso: algo más de uno reparte mejor la carga cuando los
+# items tienen tamaños muy distintos
+CHUNKS_PER_WORKER = 4
+
+
+def split_chunks(source, count):
+    """
+    Divide `source` en hasta `count` trozos de tamaño parecido cortando solo
+    entre items de primer nivel. Devuelve la lista de offsets de inicio de
+    cada trozo (el primero es siempre 0).
+    """
+    target = len(source) // max(count, 1)
+    offsets = [0]
+    next_cut = target
+    depth = 0
+    for match in _SCAN_PATTERN.finditer(source):
+        char = match.group()
+        if char == "{":
+            depth += 1
+            continue
+        if char == "}":
+            # Una '}' de más no debe impedir cortar el resto del archivo
+            depth = max(depth - 1, 0)
+        elif char != ";":
+            continue
+        end = match.end()
+        if depth == 0 and end >= next_cut and _ITEM_START.match(source, end):
+            offsets.append(end)
+            next_cut = end + target
+    return offsets
+
+
+def _parse_chunk(text, first_line, offset):
+    """
+    Analiza un trozo del archivo (en un proceso del pool) y devuelve sus items
+    y errores con las líneas y offsets del archivo completo, serializados
+    (ver `_load`).
+    """
+    session = ParseSession()
+    # Los tokens y errores salen ya con las líneas del archivo completo; los
+    # offsets de los nodos son relativos al trozo y se corren al aplanar cada
+    # item, que es lo que hace pickle con un nodo de todos modos
+    tokens = tokenize_source(text, session.lexer, line=first_line)
+    ast, errors = session.parse_tokens(tokens)
+    items = []
+    for item in (ast.items if ast is not None else ()):
+        records = flatten(item)
+        for values in records:
+            if values[-2] is not None:
+                values[-2] += offset
+            if values[-1] is not None:
+                values[-1] += offset
+        items.append(records)
+    return pickle.dumps((items, errors, session.truncated), pickle.HIGHEST_PROTOCOL)
+
+
+def _load(data):
+    """
+    Deserializa el resultado de un trozo y arma sus items con el recolector
+    de ciclos parado: crear cientos de miles de nodos lo dispara una y otra
+    vez y cada pasada recorre todo lo creado hasta entonces (5 veces más
+    lento). Los nodos no forman ciclos, así que no queda nada sin liberar.
+    """
+    enabled = gc.isenabled()
+    gc.disable()
+    try:
+        items, errors, truncated = pickle.loads(data)
+        return [unflatten(records) for records in items], errors, truncated
+    finally:
+        if enabled:
+            gc.enable()
+
+
+def _noop():
+    return None
+
+
+class ParallelParser:
+    """
+    Analiza archivos grandes repartiendo los items entre procesos.
+
+    `parse` devuelve (ast, errores_sintacticos) como `parse_source`, con los
+    errores de todos los trozos en orden. Cada trozo se recupera de sus
+    errores por separado y `max_errors` se aplica al total.
+    Las entradas menores que `min_bytes`, o que no se pueden cortar, se
+    analizan en serie en el proceso actual. El pool se crea en el primer
+    análisis paralelo y se reutiliza hasta `close()`.
+    """
+
+    def __init__(self, workers=None, min_bytes=None, max_errors=None):
+        if workers is None:
+            workers = int(os.getenv("PARALLEL_PARSE_WORKERS", os.cpu_count() or 1))
+        if min_bytes is None:
+            min_bytes = int(os.getenv("PARALLEL_PARSE_MIN_BYTES", 512 * 1024))
+        self.workers = workers
+        self.min_bytes = min_bytes
+        self.session = ParseSession(max_errors=max_errors)
+        self.truncated = False
+        # Trozos del último análisis (1 si fue en serie)
+        self.chunks = 0
+        self._executor = None
+
+    def start(self):
+        """Crea el pool y espera a que todos los procesos estén listos."""
+        if self._executor is None:
+            context = multiprocessing.get_context("spawn")
+            self._executor = ProcessPoolExecutor(max_workers=self.workers, mp_context=context)
+            for future in [self._executor.submit(_noop) for _ in range(self.workers)]:
+                future.result()
+        return self
+
+    def close(self):
+        if self._executor is not None:
+            self._executor.shutdown()
+            self._executor = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def parse(self, source):
+        """Analiza código fuente Rust y devuelve (ast, errores_sintacticos)."""
+        offsets = []
+        if self.workers > 1 and len(source) >= self.min_bytes:
+            offsets = split_chunks(source, self.workers * CHUNKS_PER_WORKER)
+        if len(offsets) < 2:
+            self.chunks = 1
+            ast, errors = self.session.parse(source)
+            self.truncated = self.session.truncated
+            return ast, errors
+
+        self.start()
+        bounds = offsets + [len(source)]
+        futures = []
+        line = 1
+        for index, offset in enumerate(offsets):
+            if index:
+                line += source.count("\n", offsets[index - 1], offset)
+            text = source[offset:bounds[index + 1]]
+            futures.append(self._executor.submit(_parse_chunk, text, line, offset))
+
+        items, errors = [], []
+        self.truncated = False
+        max_errors = self.session.max_errors
+        for future in futures:
+            chunk_items, chunk_errors, truncated = _load(future.result())
+            if not self.truncated:
+                items.extend(chunk_items)
+                errors.extend(chunk_errors)
+                self.truncated = truncated or 0 < max_errors <= len(errors)
+        if self.truncated and max_errors > 0:
+            del errors[max_errors:]
+        self.chunks = len(offsets)
+
+        if not items:
+            return make_node(("program", items)), errors
+        return make_node(("program", items), items[0].start, items[-1].end), errors
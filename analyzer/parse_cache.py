@@ -0,0 +1,131 @@
+# analyzer/parse_cache.py
+# Caché de análisis sintáctico por item de primer nivel.
+#
+# Entre dos versiones de un archivo la mayoría de los items (fn, impl, struct,
+# ...) no cambian ni un byte. La caché divide los tokens en items, usa como
+# clave el sha256 del texto de cada uno y reutiliza el subárbol ya analizado
+# cuando el texto coincide, desplazando sus líneas y rangos a la posición
+# actual del item.
+#
+# Configuración (variables de entorno):
+#   PARSE_CACHE_MAX_BYTES  tamaño máximo aproximado de la caché (bytes);
+#                          0 la desactiva en el pipeline
+
+import hashlib
+import os
+import threading
+from collections import OrderedDict
+
+try:
+    from .ast_nodes import make_node
+    from .incremental import rebase, split_items
+    from .ply_parser_final import ParseSession
+except ImportError:
+    from ast_nodes import make_node
+    from incremental import rebase, split_items
+    from ply_parser_final import ParseSession
+
+
+# Memoria aproximada del subárbol de un item por cada uno de sus tokens
+# (nodos, listas y valores: entre 60 y 100 bytes en los programas de prueba).
+# Contarla nodo por nodo costaría casi un 20% del análisis de cada item.
+BYTES_PER_TOKEN = 80
+
+
+class ItemParseCache:
+    """
+    LRU de subárboles de items acotada por tamaño en bytes.
+    Solo se guardan items sin errores; si algún item nuevo tiene errores, o
+    los tokens no forman una secuencia limpia de items, se analiza el archivo
+    completo para que los errores coincidan con los de `parse_source`.
+    Se puede compartir entre hilos.
+    """
+
+    def __init__(self, max_bytes=None):
+        if max_bytes is None:
+            max_bytes = int(os.getenv("PARSE_CACHE_MAX_BYTES", 32 * 1024 * 1024))
+        self.max_bytes = max_bytes
+        # sha256 del texto -> (nodo, línea, offset, tamaño)
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.current_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def parse(self, source, session=None):
+        """Analiza `source` y devuelve (ast, errores_sintacticos)."""
+        session = session or ParseSession()
+        return self.parse_tokens(session.tokenize(source), session)
+
+    def parse_tokens(self, tokens, session=None):
+        """Analiza un TokenBuffer reutilizando los items ya cacheados."""
+        session = session or ParseSession()
+        spans = split_items(tokens)
+        if not spans:
+            return session.parse_tokens(tokens)
+
+        source, starts, lengths, lines = tokens.source, tokens.starts, tokens.lengths, tokens.lines
+        items = []
+        for first, stop in spans:
+            begin = starts[first]
+            end = starts[stop - 1] + lengths[stop - 1]
+            key = hashlib.sha256(source[begin:end].encode("utf-8")).digest()
+            entry = self._get(key)
+            if entry is not None:
+                node, line, offset = entry
+                line_delta, offset_delta = lines[first] - line, begin - offset
+                if line_delta or offset_delta:
+                    node = rebase(node, line_delta, offset_delta)
+                items.append(node)
+                continue
+
+            ast, errors = session.parse_tokens(tokens, first, stop)
+            if ast is None or errors or len(ast[1]) != 1:
+                return session.parse_tokens(tokens)
+            node = ast[1][0]
+            self._put(key, node, lines[first], begin, (stop - first) * BYTES_PER_TOKEN + end - begin)
+            items.append(node)
+        return make_node(('program', items), items[0].start, items[-1].end), []
+
+    def _get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[:3]
+
+    def _put(self, key, node, line, offset, size):
+        if size > self.max_bytes:
+            return
+        with self._lock:
+            previous = self._entries.pop(key, None)
+            if previous is not None:
+                self.current_bytes -= previous[3]
+            self._entries[key] = (node, line, offset, size)
+            self.current_bytes += size
+            while self.current_bytes > self.max_bytes:
+                _key, evicted = self._entries.popitem(last=False)
+                self.current_bytes -= evicted[3]
+                self.evictions += 1
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self.current_bytes = 0
+
+    def stats(self):
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+            "evictions": self.evictions,
+            "entries": len(self._entries),
+            "bytes": self.current_bytes,
+            "max_bytes": self.max_bytes,
+        }
+
@@ -0,0 +1,141 @@
+# analyzer/pipeline.py
+# Pipeline de análisis completo: léxico -> sintáctico -> semántico
+#
+# El código se lexea una sola vez y el mismo flujo de tokens se usa tanto para
+# el listado de tokens como para alimentar al parser.
+
+import os
+
+try:
+    from .ply_lexer import tokenize_source
+    from .ply_parser_final import MAX_SYNTAX_ERRORS, ParseSession
+    from .parse_cache import ItemParseCache
+    from .semantic_analyzer import SemanticAnalyzer, TooManySemanticErrors
+    from .diagnostics import Diagnostic, locate_diagnostics
+except ImportError:
+    from ply_lexer import tokenize_source
+    from ply_parser_final import MAX_SYNTAX_ERRORS, ParseSession
+    from parse_cache import ItemParseCache
+    from semantic_analyzer import SemanticAnalyzer, TooManySemanticErrors
+    from diagnostics import Diagnostic, locate_diagnostics
+
+# Etapas que expone la API; cada una corresponde a un endpoint /analyze/<etapa>
+STAGES = ('lexico', 'sintactico', 'semantico', 'completo')
+
+# Máximo de errores de cada fase (léxica, sintáctica y semántica) por
+# análisis: al alcanzarlo la fase se corta y el resultado queda marcado como
+# truncado. Acota el tiempo y el tamaño de la respuesta ante entradas que no
+# son código. Un valor <= 0 desactiva el límite.
+MAX_ERRORS = int(os.environ.get('RUST_ANALYZER_MAX_ERRORS', str(MAX_SYNTAX_ERRORS)))
+
+# Segundos que cada fase puede seguir produciendo errores desde el primero:
+# pasado ese plazo, el siguiente error corta la fase y el resultado queda
+# truncado aunque no se haya llegado a MAX_ERRORS (entradas en las que cada
+# error es caro, p. ej. por la recuperación del parser). Un valor <= 0
+# desactiva el plazo.
+MAX_ERROR_SECONDS = float(os.environ.get('RUST_ANALYZER_MAX_ERROR_SECONDS', '2'))
+
+# Caché de items compartida por los análisis de este proceso; con
+# PARSE_CACHE_MAX_BYTES=0 queda desactivada
+parse_cache = ItemParseCache()
+if parse_cache.max_bytes <= 0:
+    parse_cache = None
+
+
+def parse_cache_stats():
+    """
+    Estadísticas de la caché de items de este proceso (None si está
+    desactivada). Es una función de módulo para poder enviarse al pool.
+    """
+    if parse_cache is None:
+        return None
+    return dict(parse_cache.stats(), pid=os.getpid())
+
+
+def run_pipeline(source, with_semantic=True, max_errors=None, max_error_seconds=None):
+    """
+    Ejecuta el análisis sobre `source` y devuelve un diccionario con:
+    - tokens: lista de tokens de `tokenize_source`
+    - ast: AST generado (o None)
+    - syntax_errors: errores sintácticos
+    - semantic_errors: errores semánticos como Diagnostic, con su posición
+      (línea, columna) en el código (solo si no hubo errores sintácticos);
+      str(error) es el mensaje en español
+    - semantic_error_lines: línea de cada error semántico (None si se desconoce)
+    - truncated: si alguna fase se cortó al llegar a `max_errors` errores
+      (por defecto MAX_ERRORS) o a `max_error_seconds` desde su primer error
+      (por defecto MAX_ERROR_SECONDS)
+    """
+    max_errors = MAX_ERRORS if max_errors is None else max_errors
+    if max_error_seconds is None:
+        max_error_seconds = MAX_ERROR_SECONDS
+    session = ParseSession(max_errors=max_errors, max_error_seconds=max_error_seconds)
+    tokens = session.tokenize(source)
+    if parse_cache is not None:
+        ast, syntax_errors = parse_cache.parse_tokens(tokens, session)
+    else:
+        ast, syntax_errors = session.parse_tokens(tokens)
+    truncated = tokens.truncated or session.truncated
+
+    semantic_errors = []
+    semantic_error_lines = []
+    if with_semantic and ast and not syntax_errors:
+        analyzer = SemanticAnalyzer(max_errors=max_errors, max_error_seconds=max_error_seconds)
+        try:
+            analyzer.visit(ast)
+            semantic_errors = analyzer.diagnostics
+        except TooManySemanticErrors:
+            semantic_errors = analyzer.diagnostics
+            truncated = True
+        except Exception as sem_error:
+            semantic_errors = [Diagnostic('internal-error', args={'message': str(sem_error)})]
+        locate_diagnostics(semantic_errors, tokens.line_index)
+        semantic_error_lines = [
+            error.position[0] if error.position else None for error in semantic_errors
+        ]
+
+    return {
+        'tokens': tokens,
+        'ast': ast,
+        'syntax_errors': syntax_errors,
+        'semantic_errors': semantic_errors,
+        'semantic_error_lines': semantic_error_lines,
+        'truncated': truncated,
+    }
+
+
+def run_stage(stage, source, max_errors=None, max_error_seconds=None):
+    """
+    Ejecuta la etapa de análisis pedida por un endpoint, con `max_errors`
+    errores como máximo por fase (por defecto MAX_ERRORS) y
+    `max_error_seconds` desde el primer error de cada fase (por defecto
+    MAX_ERROR_SECONDS).
+    Es una función de módulo para poder enviarse a un pool de procesos.
+    """
+    if stage == 'lexico':
+        max_errors = MAX_ERRORS if max_errors is None else max_errors
+        if max_error_seconds is None:
+            max_error_seconds = MAX_ERROR_SECONDS
+        tokens = tokenize_source(
+            source, max_errors=max_errors, max_error_seconds=max_error_seconds
+        )
+        return {'tokens': tokens, 'truncated': tokens.truncated}
+    if stage == 'sintactico':
+        return run_pipeline(source, False, max_errors, max_error_seconds)
+    if stage == 'semantico':
+        result = run_pipeline(source, True, max_errors, max_error_seconds)
+        # El endpoint semántico no devuelve tokens; no se envían de vuelta
+        result['tokens'] = []
+        return result
+    if stage == 'completo':
+        return run_pipeline(source, True, max_errors, max_error_seconds)
+    raise ValueError(f"Etapa de análisis desconocida: {stage}")
+
+
+def run_stage_with_cache_stats(stage, source, max_errors=None, max_error_seconds=None):
+    """
+    (resultado de `run_stage`, `parse_cache_stats()` del proceso que lo
+    ejecutó): así el backend conoce la caché de items de cada proceso del
+    pool sin poder elegir a cuál enviarle una consulta.
+    """
+    return run_stage(stage, source, max_errors, max_error_seconds), parse_cache_stats()
@@ -1,6 +1,9 @@
 # analyzer/ply_lexer.py
 # Lexer ágil usando PLY para prototipado y pruebas rápidas
 import codecs
+from array import array
+from bisect import bisect_left, bisect_right
+import time
 import ply.lex as lex
 
 # Lista de nombres de tokens de Rust
@@ -191,25 +194,35 @@ def t_number(t):
     return t
 
 
-def t_string(t):
-    r"\"([^\\\n]|(\\.))*?\" "
-    t.type = "STRING"
+def decode_string_literal(raw):
+    """Valor de un literal de cadena a partir de su texto (con comillas)."""
     # El orden es CRÍTICO. Reemplazar la doble barra PRIMERO.
-    s = t.value[1:-1]
+    s = raw[1:-1]
     s = s.replace("\\\\", "\\")  # 1. Convertir \\ a \
     s = s.replace('\\"', '"')  # 2. Convertir \" a "
     s = s.replace("\\'", "'")
     s = s.replace("\\n", "\n")  # 3. Convertir \n a newline
     s = s.replace("\\t", "\t")  # 4. Convertir \t a tab
     s = s.replace("\\r", "\r")
-    t.literal = s
+    return s
+
+
+def decode_char_literal(raw):
+    """Valor de un literal de carácter a partir de su texto (con comillas)."""
+    return codecs.decode(raw[1:-1], "unicode_escape")
+
+
+def t_string(t):
+    r"\"([^\\\n]|(\\.))*?\" "
+    t.type = "STRING"
+    t.literal = decode_string_literal(t.value)
     return t
 
 
 def t_char(t):
     r"'([^'\\\n]|\\.)'"
     t.type = "CHAR"
-    t.literal = codecs.decode(t.value[1:-1], "unicode_escape")
+    t.literal = decode_char_literal(t.value)
     return t
 
 
@@ -241,45 +254,707 @@ t_ignore = " \t"
 
 def t_error(t):
     """
-    Maneja los caracteres ilegales creando un token de ERROR.
+    Maneja los caracteres ilegales creando un token de ERROR. Una racha de
+    caracteres ilegales seguidos (hasta el próximo espacio o inicio de token)
+    forma un solo token, así que pegar texto que no es Rust produce un token
+    por zona con errores y no uno por carácter.
     """
+    lexer_instance = t.lexer
+    data, start = lexer_instance.lexdata, lexer_instance.lexpos
+    # La racha termina en el primer carácter ignorado o donde alguna regla
+    # reconoce un token (la misma prueba que hace PLY en cada posición)
+    ignore, lexre = lexer_instance.lexignore, lexer_instance.lexre
+    end, stop = start + 1, len(data)
+    while end < stop and data[end] not in ignore:
+        if any(regex.match(data, end) for regex, _ in lexre):
+            break
+        end += 1
     t.type = "ERROR"
-    t.value = t.value[0]
-    t.literal = f"Illegal character '{t.value[0]}'"
-    t.lexer.skip(1)
+    t.value = data[start:end]
+    t.literal = error_literal(t.value)
+    lexer_instance.skip(end - start)
     return t
 
 
+# Caracteres de una racha ilegal que se muestran en su mensaje
+ERROR_SAMPLE_CHARS = 20
+
+
+def error_sample(value):
+    """Muestra de una racha de caracteres ilegales para los mensajes."""
+    if len(value) <= ERROR_SAMPLE_CHARS:
+        return value
+    return value[:ERROR_SAMPLE_CHARS] + "..."
+
+
+def error_literal(value):
+    """Literal de un token ERROR: el carácter ilegal o una muestra de la racha."""
+    if len(value) == 1:
+        return f"Illegal character '{value}'"
+    return f"Illegal characters '{error_sample(value)}' ({len(value)} characters)"
+
+
 # --- Construcción y Ejecución ---
 
 lexer = lex.lex()
 
 
-def tokenize_source(source):
-    lexer.lineno = 1
-    lexer.input(source)
-    result = []
+# --- Buffer de tokens ---
+
+# Tipos de token que puede producir el lexer; el índice es el id del tipo
+TOKEN_TYPES = tokens + ("ERROR",)
+TOKEN_TYPE_IDS = {name: type_id for type_id, name in enumerate(TOKEN_TYPES)}
+
+_KEYWORD_LITERALS = {"TRUE": True, "FALSE": False}
+
+_INFINITY = float("inf")
+
+
+def token_literal(type_name, value):
+    """Reconstruye el literal de un token a partir de su tipo y su texto."""
+    if type_name == "NUMBER":
+        return int(value)
+    if type_name == "FLOAT":
+        return float(value)
+    if type_name == "STRING":
+        return decode_string_literal(value)
+    if type_name == "CHAR" and value.startswith("'"):
+        # CHAR es también el tipo de la palabra reservada `char`
+        return decode_char_literal(value)
+    if type_name == "ERROR":
+        return error_literal(value)
+    return _KEYWORD_LITERALS.get(type_name, value)
+
+
+class LineIndex:
+    """
+    Tabla con el offset de inicio de cada línea del código fuente. Convierte
+    offsets en (línea, columna) con búsqueda binaria, sin volver a recorrer el
+    texto. Líneas y columnas empiezan en 1.
+    """
+
+    __slots__ = ("starts",)
+
+    def __init__(self, source):
+        starts = array("I", [0])
+        find = source.find
+        position = find("\n")
+        while position >= 0:
+            starts.append(position + 1)
+            position = find("\n", position + 1)
+        self.starts = starts
+
+    def __len__(self):
+        return len(self.starts)
+
+    def line_of(self, offset):
+        """Línea que contiene `offset`."""
+        return bisect_right(self.starts, offset)
+
+    def position(self, offset):
+        """(línea, columna) de `offset`."""
+        line = bisect_right(self.starts, offset)
+        return line, offset - self.starts[line - 1] + 1
+
+    def offset_of(self, line, column=1):
+        """Offset de (línea, columna)."""
+        return self.starts[line - 1] + column - 1
+
+
+class TokenBuffer:
+    """
+    Secuencia de tokens en formato de columnas (structure of arrays).
+    Cada token ocupa un id de tipo, su offset de inicio, su longitud y su
+    línea en `array`s compactos; el texto se toma del código fuente y la
+    columna de literales se materializa solo si se pide. El acceso por índice
+    e iteración devuelven los mismos diccionarios que `tokenize_source`
+    devolvía antes, así que los consumidores existentes no cambian.
+    `truncated` indica que el lexeo se cortó antes del final del código
+    (ver `max_errors` en `tokenize_source`).
+
+    `relex_edit` modifica el buffer en el lugar y no reescribe los offsets y
+    líneas de los tokens que siguen a la edición: deja el desplazamiento
+    pendiente en `_shifts`, una lista ordenada de (índice, delta de offset,
+    delta de línea) que vale desde ese índice hasta el siguiente. `starts` y
+    `lines` aplican lo pendiente al leerse; `columns` devuelve un rango ya
+    desplazado sin tocar el resto.
+    """
+
+    __slots__ = (
+        "source", "types", "_starts", "lengths", "_lines", "truncated",
+        "_shifts", "_literals", "_line_index",
+    )
+
+    def __init__(self, source):
+        self.source = source
+        self.types = array("B")
+        self._starts = array("I")
+        self.lengths = array("I")
+        self._lines = array("I")
+        self.truncated = False
+        self._shifts = []
+        self._literals = None
+        self._line_index = None
+
+    @property
+    def starts(self):
+        if self._shifts:
+            self._settle()
+        return self._starts
+
+    @starts.setter
+    def starts(self, values):
+        self._settle()
+        self._starts = values
+
+    @property
+    def lines(self):
+        if self._shifts:
+            self._settle()
+        return self._lines
+
+    @lines.setter
+    def lines(self, values):
+        self._settle()
+        self._lines = values
+
+    def _segments(self, start=0, stop=None):
+        """
+        Divide los tokens [start, stop) en tramos (desde, hasta, delta de
+        offset, delta de línea) con el mismo desplazamiento pendiente.
+        """
+        stop = len(self.types) if stop is None else stop
+        low, offset_delta, line_delta = start, 0, 0
+        for index, next_offset_delta, next_line_delta in self._shifts:
+            if index >= stop:
+                break
+            if index > low:
+                yield low, index, offset_delta, line_delta
+                low = index
+            offset_delta, line_delta = next_offset_delta, next_line_delta
+        if low < stop:
+            yield low, stop, offset_delta, line_delta
+
+    def _settle(self):
+        """Aplica los desplazamientos pendientes a todo el buffer."""
+        for low, high, offset_delta, line_delta in self._segments():
+            if offset_delta:
+                self._starts[low:high] = array("I", map(offset_delta.__add__, self._starts[low:high]))
+            if line_delta:
+                self._lines[low:high] = array("I", map(line_delta.__add__, self._lines[low:high]))
+        self._shifts = []
+
+    def _shift_of(self, index):
+        """(delta de offset, delta de línea) pendiente del token `index`."""
+        shifts = self._shifts
+        position = bisect_right(shifts, (index, _INFINITY)) - 1
+        if position < 0:
+            return 0, 0
+        return shifts[position][1], shifts[position][2]
+
+    def _position(self, index):
+        """(offset, línea) del token `index`, sin aplicar lo pendiente al resto."""
+        offset_delta, line_delta = self._shift_of(index)
+        return self._starts[index] + offset_delta, self._lines[index] + line_delta
+
+    def _first_at(self, offset):
+        """Índice del primer token que empieza en `offset` o después."""
+        starts = self._starts
+        for low, high, offset_delta, _ in self._segments():
+            if starts[high - 1] + offset_delta >= offset:
+                return bisect_left(starts, offset - offset_delta, low, high)
+        return len(starts)
+
+    def columns(self, start=0, stop=None):
+        """
+        Copias de las columnas (types, starts, lengths, lines) de los tokens
+        [start, stop), con los offsets y líneas ya desplazados. Solo aplica
+        lo pendiente dentro del rango, así que cuesta lo que mide el rango.
+        """
+        starts, lines = self._starts[start:stop], self._lines[start:stop]
+        stop = len(self.types) if stop is None else min(stop, len(self.types))
+        for low, high, offset_delta, line_delta in self._segments(start, stop):
+            low, high = low - start, high - start
+            if offset_delta:
+                starts[low:high] = array("I", map(offset_delta.__add__, starts[low:high]))
+            if line_delta:
+                lines[low:high] = array("I", map(line_delta.__add__, lines[low:high]))
+        return self.types[start:stop], starts, self.lengths[start:stop], lines
+
+    def append(self, type_name, start, length, line):
+        if self._shifts:
+            self._settle()
+        self.types.append(TOKEN_TYPE_IDS[type_name])
+        self._starts.append(start)
+        self.lengths.append(length)
+        self._lines.append(line)
+        self._literals = None
+
+    def __len__(self):
+        return len(self.types)
+
+    def type_of(self, index):
+        return TOKEN_TYPES[self.types[index]]
+
+    def value_of(self, index):
+        start = self.starts[index]
+        return self.source[start:start + self.lengths[index]]
+
+    def literal_of(self, index):
+        if self._literals is not None:
+            return self._literals[index]
+        return token_literal(self.type_of(index), self.value_of(index))
+
+    @property
+    def literals(self):
+        """Columna de literales, calculada una sola vez al primer acceso."""
+        if self._literals is None:
+            self._literals = [
+                token_literal(type_name, value)
+                for type_name, value in zip(self.iter_types(), self.iter_values())
+            ]
+        return self._literals
+
+    @property
+    def line_index(self):
+        """LineIndex del código fuente, construido al primer uso."""
+        if self._line_index is None:
+            self._line_index = LineIndex(self.source)
+        return self._line_index
+
+    def column_of(self, index):
+        """Columna (desde 1) en la que empieza el token."""
+        return self.starts[index] - self.line_index.starts[self.lines[index] - 1] + 1
+
+    def indices_of(self, type_name):
+        """Índices de los tokens de un tipo dado (p. ej. "ERROR")."""
+        type_id = TOKEN_TYPE_IDS[type_name]
+        return [index for index, tid in enumerate(self.types) if tid == type_id]
+
+    def iter_types(self):
+        names = TOKEN_TYPES
+        return (names[type_id] for type_id in self.types)
+
+    def iter_values(self):
+        source = self.source
+        return (source[start:start + length] for start, length in zip(self.starts, self.lengths))
+
+    def _record(self, index):
+        start = self.starts[index]
+        return {
+            "type": TOKEN_TYPES[self.types[index]],
+            "value": self.source[start:start + self.lengths[index]],
+            "line": self.lines[index],
+            "column": self.column_of(index),
+            "offset": start,
+            "literal": self.literal_of(index),
+        }
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self._record(i) for i in range(*index.indices(len(self)))]
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError("índice de token fuera de rango")
+        return self._record(index)
+
+    def __iter__(self):
+        for index in range(len(self)):
+            yield self._record(index)
+
+    def __eq__(self, other):
+        if isinstance(other, TokenBuffer):
+            return (
+                self.types == other.types
+                and self.lines == other.lines
+                and list(self.iter_values()) == list(other.iter_values())
+                and self.starts == other.starts
+            )
+        if isinstance(other, list):
+            return len(self) == len(other) and all(a == b for a, b in zip(self, other))
+        return NotImplemented
+
+    def __repr__(self):
+        return f"TokenBuffer({len(self)} tokens)"
+
+
+def tokenize_source(source, lexer_instance=None, start=0, line=1, max_errors=0,
+                    max_error_seconds=0):
+    """
+    Tokeniza `source` y devuelve un TokenBuffer.
+    Si no se indica un lexer se usa un clon nuevo del lexer del módulo, de modo
+    que llamadas concurrentes no comparten posición ni número de línea.
+    `start` y `line` indican desde qué offset se tokeniza y qué número de
+    línea tiene ese punto. Con `max_errors` > 0 el lexeo se corta al llegar a
+    ese número de tokens ERROR (rachas de caracteres ilegales) y el buffer
+    queda con `truncated`. Con `max_error_seconds` > 0 también se corta si
+    pasaron esos segundos desde el primer token ERROR.
+    """
+    lexer_instance = lexer_instance or lexer.clone()
+    lexer_instance.input(source)
+    lexer_instance.lexpos = start
+    lexer_instance.lineno = line
+    result = TokenBuffer(source)
+    append = result.append
+    errors_left = max_errors
+    deadline = None
     while True:
-        tok = lexer.token()
+        tok = lexer_instance.token()
         if not tok:
             break
+        # El texto del token es siempre source[lexpos:lexpos + len]; los
+        # literales se reconstruyen bajo demanda a partir de él.
+        append(tok.type, tok.lexpos, len(tok.value), tok.lineno)
+        if tok.type == "ERROR":
+            errors_left -= 1
+            if errors_left == 0:
+                result.truncated = True
+                break
+            if max_error_seconds > 0:
+                if deadline is None:
+                    deadline = time.monotonic() + max_error_seconds
+                elif time.monotonic() >= deadline:
+                    result.truncated = True
+                    break
+    return result
 
-        # Para los tokens simples sin función, el literal no se asigna automáticamente.
-        # Lo asignamos aquí si no existe.
-        literal = getattr(tok, "literal", tok.value)
-
-        result.append(
-            {
-                "type": tok.type,
-                "value": tok.value,
-                "line": tok.lineno,
-                "column": tok.lexpos,
-                "literal": literal,
-            }
-        )
+
+# --- Re-tokenización incremental ---
+
+_DIVIDE_ID = TOKEN_TYPE_IDS["DIVIDE"]
+
+
+def _restart_index(buffer, offset):
+    """
+    Índice del último token que se conserva tal cual antes de `offset` (-1 si
+    ninguno). Se re-escanea desde el final de ese token: los tokens no ocupan
+    varias líneas, así que basta con retroceder al inicio de la línea; lo que
+    haya entre medio (espacios, comentarios) se vuelve a leer.
+    """
+    line_start = buffer.source.rfind("\n", 0, offset) + 1
+    return buffer._first_at(line_start) - 1
+
+
+def _first_open_comment(buffer, stop):
+    """
+    Índice del primer "/*" que no llegó a ser comentario (quedó como DIVIDE
+    seguido de "*" porque no había "*/" después) entre los tokens [0, stop).
+    """
+    source, count = buffer.source, len(buffer)
+    # Búsqueda sobre los ids de tipo como bytes (en C) en lugar de un bucle
+    raw = buffer.types.tobytes()
+    position = raw.find(_DIVIDE_ID)
+    while 0 <= position < stop:
+        start = buffer._position(position)[0]
+        if (
+            source.startswith("*", start + 1)
+            and position + 1 < count
+            and buffer._position(position + 1)[0] == start + 1
+        ):
+            return position
+        position = raw.find(_DIVIDE_ID, position + 1)
+    return -1
+
+
+def _splice_shifts(shifts, first, old_stop, new_stop, count, delta, line_delta):
+    """
+    Desplazamientos pendientes tras reemplazar los tokens [first, old_stop)
+    por [first, new_stop) (recién escaneados, sin desplazamiento) en un
+    buffer que queda con `count` tokens. Los que seguían a la edición suman
+    `delta` y `line_delta`; el costo depende de la cantidad de tramos, no de
+    la de tokens.
+    """
+    position = bisect_right(shifts, (old_stop, _INFINITY)) - 1
+    tail = shifts[position][1:] if position >= 0 else (0, 0)
+    moved = new_stop - old_stop
+    entries = [entry for entry in shifts if entry[0] < first]
+    entries.append((first, 0, 0))
+    entries.append((new_stop, tail[0] + delta, tail[1] + line_delta))
+    entries.extend(
+        (index + moved, offset_delta + delta, line_delta_ + line_delta)
+        for index, offset_delta, line_delta_ in shifts[position + 1:]
+    )
+
+    # Sin tramos vacíos ni repetidos: cada entrada cambia el desplazamiento
+    result = []
+    for index, offset_delta, line_delta_ in entries:
+        if index >= count:
+            break
+        if result and result[-1][0] == index:
+            result.pop()
+        current = result[-1][1:] if result else (0, 0)
+        if (offset_delta, line_delta_) != current:
+            result.append((index, offset_delta, line_delta_))
     return result
 
 
+def relex_edit(buffer, start, end, replacement, lexer_instance=None):
+    """
+    Aplica una edición (reemplazar source[start:end] por `replacement`) y
+    re-tokeniza solo la zona afectada.
+
+    Devuelve `(buffer, first, old_stop, new_stop)`: los tokens
+    buffer[first:old_stop] fueron reemplazados por buffer[first:new_stop];
+    los anteriores son idénticos y los posteriores solo se desplazaron.
+
+    `buffer` se modifica en el lugar: se empalman sus columnas y el
+    desplazamiento de offsets y líneas de los tokens posteriores queda
+    pendiente (ver TokenBuffer), así que no se recorren. Lo único que
+    depende del tamaño del archivo son copias en C: el texto nuevo y, si
+    cambia la cantidad de tokens, mover la cola de cada columna.
+    """
+    source = buffer.source
+    if not 0 <= start <= end <= len(source):
+        raise ValueError(f"edición fuera de rango: ({start}, {end})")
+
+    new_source = source[:start] + replacement + source[end:]
+    delta = len(replacement) - (end - start)
+    line_delta = replacement.count("\n") - source.count("\n", start, end)
+    edit_end = start + len(replacement)
+
+    keep = _restart_index(buffer, start)
+    # Si la edición forma un "*/", un "/*" anterior que no se había cerrado
+    # pasa a ser un comentario: hay que re-escanear desde él.
+    if "*/" in new_source[max(start - 1, 0):edit_end + 1]:
+        open_comment = _first_open_comment(buffer, keep + 1)
+        if open_comment >= 0:
+            keep = open_comment - 1
+
+    if keep >= 0:
+        restart, lineno = buffer._position(keep)
+        restart += buffer.lengths[keep]
+    else:
+        restart, lineno = 0, 1
+    first = keep + 1
+
+    lexer_instance = lexer_instance or lexer.clone()
+    lexer_instance.input(new_source)
+    lexer_instance.lexpos = restart
+    lexer_instance.lineno = lineno
+
+    old_count = len(buffer)
+    scanned = TokenBuffer(new_source)
+    old_stop = old_count
+    cursor = first
+    while True:
+        tok = lexer_instance.token()
+        if not tok:
+            break
+        position = tok.lexpos
+        if position >= edit_end:
+            # Resincronización: un token que empieza donde empezaba uno viejo
+            # (en el texto sin cambios) produce el mismo resto de la secuencia.
+            old_position = position - delta
+            while cursor < old_count and buffer._position(cursor)[0] < old_position:
+                cursor += 1
+            if cursor < old_count:
+                old_start, old_line = buffer._position(cursor)
+                if old_start == old_position and old_line + line_delta == tok.lineno:
+                    old_stop = cursor
+                    break
+        scanned.append(tok.type, position, len(tok.value), tok.lineno)
+
+    new_stop = first + len(scanned)
+    buffer.types[first:old_stop] = scanned.types
+    buffer.lengths[first:old_stop] = scanned.lengths
+    buffer._starts[first:old_stop] = scanned._starts
+    buffer._lines[first:old_stop] = scanned._lines
+    if delta or line_delta or buffer._shifts:
+        buffer._shifts = _splice_shifts(
+            buffer._shifts, first, old_stop, new_stop, len(buffer), delta, line_delta
+        )
+    buffer.source = new_source
+    buffer._literals = None
+    buffer._line_index = None
+    return buffer, first, old_stop, new_stop
+
+
+def relex(buffer, edits, lexer_instance=None):
+    """
+    Re-tokeniza `buffer` tras una lista de ediciones `(start, end, replacement)`
+    expresadas sobre el texto original (sin solaparse entre sí), como las que
+    produce un diff del editor. Equivale a `tokenize_source` sobre el texto
+    editado, pero el trabajo es proporcional a lo editado (ver `relex_edit`).
+    `buffer` se modifica en el lugar y se devuelve.
+    """
+    lexer_instance = lexer_instance or lexer.clone()
+    # De atrás hacia adelante, así los offsets de las ediciones pendientes
+    # siguen siendo válidos.
+    for start, end, replacement in sorted(edits, key=lambda edit: edit[0], reverse=True):
+        buffer = relex_edit(buffer, start, end, replacement, lexer_instance)[0]
+    return buffer
+
+
+# --- Tokenización en streaming ---
+
+def _iter_records(text, lexer_instance, base_offset=0, start=0):
+    """
+    Genera los diccionarios de token de `text`, desde la posición `start`,
+    a medida que se escanean.
+    """
+    lexer_instance.input(text)
+    lexer_instance.lexpos = start
+    # `text` empieza siempre al inicio de una línea
+    line_start = previous = 0
+    while True:
+        tok = lexer_instance.token()
+        if not tok:
+            return
+        position = tok.lexpos
+        newline = text.rfind("\n", previous, position)
+        if newline >= 0:
+            line_start = newline + 1
+        previous = position
+        yield {
+            "type": tok.type,
+            "value": tok.value,
+            "line": tok.lineno,
+            "column": position - line_start + 1,
+            "offset": base_offset + position,
+            "literal": getattr(tok, "literal", tok.value),
+        }
+
+
+def iter_tokens(source, lexer_instance=None):
+    """
+    Generador de tokens: entrega cada token (mismo formato que los elementos
+    de `tokenize_source`) apenas se escanea, sin construir la lista completa.
+    """
+    lexer_instance = lexer_instance or lexer.clone()
+    lexer_instance.lineno = 1
+    yield from _iter_records(source, lexer_instance)
+
+
+def iter_tokens_from_file(path, chunk_size=1 << 16, encoding="utf-8"):
+    """
+    Igual que `iter_tokens`, pero leyendo el archivo por bloques, así la
+    memoria depende del tamaño del bloque y no del archivo.
+
+    Los bloques se cortan en un salto de línea (ningún token ocupa varias
+    líneas salvo los comentarios de bloque). Si el lexer deja un "/*" sin
+    cerrar en el bloque (un DIVIDE seguido de "*", como en `relex_edit`), el
+    bloque se corta ahí y se sigue leyendo hasta que aparezca un "*/" (o
+    hasta el final del archivo, igual que haría un análisis de una sola
+    pasada). Un "/*" dentro de una cadena o de un comentario de línea no es
+    un token, así que no retiene nada.
+    """
+    lexer_instance = lexer.clone()
+    lexer_instance.lineno = 1
+    # `pending` es lo leído que falta entregar, desde el inicio de una línea:
+    # `offset` es su posición en el archivo y `resume` la posición de
+    # `pending` desde la que falta lexear
+    offset = resume = 0
+    pending = ""
+    # Con un "/*" sin cerrar, desde dónde buscar su "*/"
+    open_comment = None
+
+    with open(path, "r", encoding=encoding) as f:
+        while True:
+            data = f.read(chunk_size)
+            text = pending + data
+            if data:
+                cut = text.rfind("\n") + 1
+                if open_comment is not None:
+                    closed = text.find("*/", open_comment)
+                    if closed < 0:
+                        open_comment = len(text) - 1
+                    if closed < 0 or closed + 2 > cut:
+                        pending = text
+                        continue
+                elif cut == 0:
+                    pending = text
+                    continue
+                chunk = text[:cut]
+            else:
+                chunk = text
+
+            open_comment = None
+            # lineno continúa desde el bloque anterior
+            for record in _iter_records(chunk, lexer_instance, offset, resume):
+                position = record["offset"] - offset
+                if data and record["type"] == "DIVIDE" and chunk.startswith("*", position + 1):
+                    # Comentario sin cerrar en este bloque: se re-lexea desde
+                    # el "/*" cuando llegue su cierre
+                    line_start = chunk.rfind("\n", 0, position) + 1
+                    pending = text[line_start:]
+                    offset += line_start
+                    resume = position - line_start
+                    open_comment = resume + 2
+                    lexer_instance.lineno = record["line"]
+                    break
+                yield record
+            else:
+                if not data:
+                    return
+                pending = text[len(chunk):]
+                offset += len(chunk)
+                resume = 0
+
+
+class TokenFeeder:
+    """
+    Alimenta al parser con tokens ya obtenidos por `tokenize_source`.
+    Implementa el protocolo de lexer que usa PLY (`input()` y `token()`), así
+    el parser consume el mismo flujo de tokens sin volver a lexear el código.
+    Acepta un TokenBuffer o cualquier secuencia de diccionarios de token; de un
+    TokenBuffer se puede entregar solo el rango [start, stop).
+    """
+
+    def __init__(self, tokens, start=0, stop=None):
+        if isinstance(tokens, TokenBuffer):
+            self._tokens = self._from_buffer(tokens, start, stop)
+        else:
+            self._tokens = self._from_records(tokens)
+        self.lineno = 1
+        self.lexpos = 0
+
+    def _make_token(self, type_name, value, line, start, literal):
+        tok = lex.LexToken()
+        tok.type = type_name
+        tok.value = value
+        tok.lineno = line
+        tok.lexpos = start
+        tok.literal = literal
+        tok.lexer = self
+        return tok
+
+    def _from_buffer(self, buffer, start, stop):
+        # Recorre las columnas directamente, sin crear diccionarios intermedios
+        make = self._make_token
+        names, source = TOKEN_TYPES, buffer.source
+        for type_id, offset, length, line in zip(*buffer.columns(start, stop)):
+            type_name = names[type_id]
+            value = source[offset:offset + length]
+            yield make(type_name, value, line, offset, token_literal(type_name, value))
+
+    def _from_records(self, records):
+        make = self._make_token
+        for record in records:
+            yield make(record["type"], record["value"], record["line"],
+                       record["offset"], record["literal"])
+
+    def input(self, data):
+        # Los tokens se reciben en el constructor; no hay texto que lexear.
+        pass
+
+    def token(self):
+        tok = next(self._tokens, None)
+        if tok is not None:
+            self.lineno = tok.lineno
+            self.lexpos = tok.lexpos
+        return tok
+
+    def __iter__(self):
+        return self
+
+    def __next__(self):
+        tok = self.token()
+        if tok is None:
+            raise StopIteration
+        return tok
+
+
 if __name__ == "__main__":
     test_code = 'let message = "Hello \\"Rust\\" world!\\n";'
     tokens = tokenize_source(test_code)
@@ -10,15 +10,26 @@
 # - Asignación de variables con todos los tipos
 # - Mínimo: 1 estructura de datos, 1 estructura de control, 1 función
 
+import ply.lex as lex
 import ply.yacc as yacc
 from datetime import datetime
+import copy
+import glob
+import hashlib
 import logging # Usaremos logging para la salida de debug
+import os
+import sys
+import time
 
 # Importación flexible para tokens y lexer
 try:
-    from .ply_lexer import tokens, lexer
+    from .ply_lexer import tokens, lexer, tokenize_source, TokenBuffer, TokenFeeder, error_sample
+    from .ast_nodes import make_node
+    from .rd_parser import RDSyntaxError, parse_buffer
 except ImportError:
-    from ply_lexer import tokens, lexer
+    from ply_lexer import tokens, lexer, tokenize_source, TokenBuffer, TokenFeeder, error_sample
+    from ast_nodes import make_node
+    from rd_parser import RDSyntaxError, parse_buffer
 
 logging.basicConfig(
     level=logging.INFO,
@@ -36,7 +47,7 @@ precedence = (
     ('right', 'NOT'),
 )
 
-# Lista para almacenar errores sintácticos
+# Lista de errores sintácticos del `parser` global (ParseSession usa la suya)
 syntax_errors = []
 
 # ============================================================================
@@ -53,7 +64,15 @@ def p_program(p):
 def p_items(p):
     """items : item
              | items item"""
-    p[0] = [p[1]] if len(p) == 2 else p[1] + [p[2]]
+    if len(p) == 2:
+        p[0] = [p[1]]
+        # La lista crece en el lugar: el parser la conserva para devolver los
+        # items ya reconocidos si el análisis se corta por errores
+        p.parser.partial_items = p[0]
+    else:
+        # Se agrega en el lugar: copiar la lista en cada reducción sería O(N²)
+        p[1].append(p[2])
+        p[0] = p[1]
 
 
 # Items top-level
@@ -68,6 +87,13 @@ def p_item(p):
     p[0] = p[1]
 
 
+# Recuperación: un item que no se pudo reconocer se descarta hasta el inicio
+# del siguiente item (fn, struct, impl, ...) o el final del archivo
+def p_item_error(p):
+    """item : error"""
+    p[0] = ('error', p.lineno(1))
+
+
 # ============================================================================
 # REGLA 1: ASIGNACIÓN DE VARIABLES - Let, Const, Static
 # RESPONSABILIDAD: vicbguti29
@@ -331,7 +357,8 @@ def p_non_empty_fields(p):
     if len(p) == 2:
         p[0] = [p[1]]
     else:
-        p[0] = p[1] + [p[3]]
+        p[1].append(p[3])
+        p[0] = p[1]
 
 def p_field(p):
     """field : IDENT COLON type"""
@@ -355,7 +382,8 @@ def p_non_empty_enum_variants(p):
     if len(p) == 2:
         p[0] = [p[1]]
     else:
-        p[0] = p[1] + [p[3]]
+        p[1].append(p[3])
+        p[0] = p[1]
 
 # Trait declaration
 def p_trait_decl(p):
@@ -366,7 +394,11 @@ def p_trait_decl(p):
 def p_trait_items(p):
     """trait_items : fn_signature
                    | trait_items fn_signature"""
-    p[0] = [p[1]] if len(p) == 2 else p[1] + [p[2]]
+    if len(p) == 2:
+        p[0] = [p[1]]
+    else:
+        p[1].append(p[2])
+        p[0] = p[1]
 
 def p_fn_signature(p):
     """fn_signature : FN IDENT LPAREN params_list RPAREN SEMICOLON
@@ -377,7 +409,7 @@ def p_fn_signature(p):
         p[0] = ('fn_signature', p[2], p[4], None)
     elif len(p) == 6: # Sin parámetros, sin retorno
         p[0] = ('fn_signature', p[2], [], None)
-    elif len(p) == 10: # Con parámetros, con retorno
+    elif len(p) == 9: # Con parámetros, con retorno
         p[0] = ('fn_signature', p[2], p[4], p[7])
     else: # Sin parámetros, con retorno
         p[0] = ('fn_signature', p[2], [], p[6])
@@ -399,7 +431,11 @@ def p_impl_items_opt(p):
 def p_impl_items(p):
     """impl_items : function_decl
                   | impl_items function_decl"""
-    p[0] = [p[1]] if len(p) == 2 else p[1] + [p[2]]
+    if len(p) == 2:
+        p[0] = [p[1]]
+    else:
+        p[1].append(p[2])
+        p[0] = p[1]
 
 
 
@@ -420,7 +456,8 @@ def p_non_empty_struct_fields(p):
     if len(p) == 2:
         p[0] = [p[1]]
     else:
-        p[0] = p[1] + [p[3]]
+        p[1].append(p[3])
+        p[0] = p[1]
 
 def p_struct_field(p):
     """struct_field : IDENT COLON expr"""
@@ -505,7 +542,8 @@ def p_params_list(p):
     if len(p) == 2:
         p[0] = [p[1]]
     else:
-        p[0] = p[1] + [p[3]]
+        p[1].append(p[3])
+        p[0] = p[1]
 
 def p_param(p):
     """param : IDENT COLON type
@@ -630,13 +668,27 @@ def p_opt_stmts(p):
                  | empty"""
     p[0] = p[1] if p[1] else []
 
+
+# Recuperación al final de un bloque: lo que sigue a la última sentencia
+# válida se descarta hasta la '}' que cierra el bloque
+def p_opt_stmts_error(p):
+    """opt_stmts : stmts error
+                 | error"""
+    if len(p) == 3:
+        # El nodo queda dentro de la lista: se crea aquí con su posición
+        p[1].append(make_node(('error', p.lineno(2)), p.lexpos(2), p.lexpos(2)))
+        p[0] = p[1]
+    else:
+        p[0] = [make_node(('error', p.lineno(1)), p.lexpos(1), p.lexpos(1))]
+
 def p_stmts(p):
     """stmts : stmt
              | stmts stmt"""
     if len(p) == 2:
         p[0] = [p[1]]
     else:
-        p[0] = p[1] + [p[2]]
+        p[1].append(p[2])
+        p[0] = p[1]
 
 
 def p_stmt_with_var(p):
@@ -644,10 +696,20 @@ def p_stmt_with_var(p):
     p[0] = p[1]
 
 
+# Recuperación: una sentencia mal formada se descarta hasta su ';'
+def p_stmt_error(p):
+    """stmt : error SEMICOLON"""
+    p[0] = ('error', p.lineno(1))
+
+
 def p_exprs(p):
     """exprs : expr
              | exprs COMMA expr"""
-    p[0] = [p[1]] if len(p) == 2 else p[1] + [p[3]]
+    if len(p) == 2:
+        p[0] = [p[1]]
+    else:
+        p[1].append(p[3])
+        p[0] = p[1]
 
 
 def p_empty(p):
@@ -659,20 +721,23 @@ def p_empty(p):
 # MANEJO DE ERRORES
 # ============================================================================
 
-def p_error(p):
+def record_syntax_error(errors, p):
+    """Registra en `errors` el error sintáctico producido por el token `p`."""
     if p:
+        # De una racha de caracteres ilegales se muestra solo el comienzo
+        value = error_sample(p.value) if p.type == 'ERROR' else p.value
         msg = "Syntax error at line {}: unexpected token '{}' ({})".format(
-            p.lineno, p.value, p.type
+            p.lineno, value, p.type
         )
-        syntax_errors.append({
+        errors.append({
             'line': p.lineno,
             'message': msg,
-            'token': str(p.value),
+            'token': str(value),
             'type': p.type
         })
     else:
         msg = "Syntax error at EOF"
-        syntax_errors.append({
+        errors.append({
             'line': 'EOF',
             'message': msg,
             'token': None,
@@ -680,53 +745,333 @@ def p_error(p):
         })
 
 
+# Máximo de errores sintácticos por análisis: al alcanzarlo se deja de
+# analizar, lo que acota el trabajo sobre entradas que no son código.
+# Un valor <= 0 desactiva el límite.
+MAX_SYNTAX_ERRORS = int(os.environ.get('RUST_ANALYZER_MAX_SYNTAX_ERRORS', '50'))
+
+
+class TooManySyntaxErrors(Exception):
+    """Interrumpe el análisis al alcanzar el máximo de errores o su plazo."""
+
+
+def p_error(p):
+    # Solo lo usa el `parser` global del módulo; ParseSession registra sus
+    # errores en su propia lista.
+    record_syntax_error(syntax_errors, p)
+
+
+# ============================================================================
+# CACHÉ DE TABLAS LALR
+# ============================================================================
+# Las tablas se guardan como un artefacto pickle versionado cuyo nombre incluye
+# la versión de tablas de PLY y un hash de la gramática. Si cambia cualquier
+# producción p_*, la precedencia o la lista de tokens, el nombre del artefacto
+# cambia y las tablas se regeneran automáticamente en el siguiente import.
+# RUST_ANALYZER_TABLES_DIR="" desactiva la caché (tablas solo en memoria).
+
+PARSER_TABLES_DIR = os.environ.get(
+    'RUST_ANALYZER_TABLES_DIR',
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), '__parsetab__')
+)
+
+
+def grammar_signature():
+    """Hash estable de la gramática: tokens, precedencia y reglas p_* en orden."""
+    module = sys.modules[__name__]
+    rules = [
+        value for name, value in vars(module).items()
+        if name.startswith('p_') and callable(value) and name != 'p_error'
+    ]
+    rules.sort(key=lambda func: func.__code__.co_firstlineno)
+
+    digest = hashlib.sha256()
+    digest.update(' '.join(tokens).encode('utf-8'))
+    digest.update(repr(precedence).encode('utf-8'))
+    for func in rules:
+        digest.update(func.__name__.encode('utf-8'))
+        digest.update((func.__doc__ or '').encode('utf-8'))
+    return digest.hexdigest()
+
+
+def grammar_tables_path(tables_dir=None):
+    """Ruta del artefacto de tablas correspondiente a la gramática actual."""
+    tables_dir = PARSER_TABLES_DIR if tables_dir is None else tables_dir
+    filename = 'parsetab-{}-{}.pickle'.format(yacc.__tabversion__, grammar_signature()[:16])
+    return os.path.join(tables_dir, filename)
+
+
+def build_parser(tables_dir=None):
+    """
+    Construye el parser LALR.
+    Carga las tablas cacheadas si existen para la gramática actual; si no,
+    las genera y las guarda de forma atómica para los siguientes procesos.
+    Las acciones de las reglas se envuelven para que cada nodo lleve su rango
+    en el código fuente (ver `track_spans`).
+    """
+    return track_spans(load_parser_tables(tables_dir))
+
+
+def load_parser_tables(tables_dir=None):
+    """Parser LALR desde la caché de tablas (o generándolas si no existen)."""
+    module = sys.modules[__name__]
+    tables_dir = PARSER_TABLES_DIR if tables_dir is None else tables_dir
+    if not tables_dir:
+        return yacc.yacc(module=module, debug=False, write_tables=False)
+
+    path = grammar_tables_path(tables_dir)
+    if os.path.exists(path):
+        try:
+            return yacc.yacc(module=module, debug=False, write_tables=False, picklefile=path)
+        except Exception as e:
+            # Artefacto corrupto o incompatible: se descarta y se regenera
+            logging.warning("Tablas LALR inválidas en %s (%s), regenerando", path, e)
+
+    try:
+        os.makedirs(tables_dir, exist_ok=True)
+    except OSError:
+        return yacc.yacc(module=module, debug=False, write_tables=False)
+
+    # Se escribe a un archivo temporal y se renombra para que otros procesos
+    # nunca lean un artefacto a medio escribir.
+    tmp_path = '{}.{}.tmp'.format(path, os.getpid())
+    new_parser = yacc.yacc(module=module, debug=False, write_tables=False, picklefile=tmp_path)
+    try:
+        os.replace(tmp_path, path)
+    except OSError:
+        return new_parser
+
+    # Eliminar artefactos de gramáticas anteriores
+    for stale in glob.glob(os.path.join(tables_dir, 'parsetab-*.pickle')):
+        if stale != path:
+            try:
+                os.remove(stale)
+            except OSError:
+                pass
+    return new_parser
+
+
+# ============================================================================
+# POSICIONES EN EL CÓDIGO FUENTE
+# ============================================================================
+# Cada reducción calcula el rango [start, end) de offsets que cubren sus
+# símbolos: los tokens aportan su lexpos y su longitud, los no terminales el
+# rango que se les asignó al reducirlos. Si la regla produjo una tupla, se
+# reemplaza por el nodo de su tipo (ver ast_nodes) con ese rango.
+
+def _symbol_end(sym):
+    end = getattr(sym, 'endlexpos', None)
+    if end is None:
+        # Token del lexer: su rango termina al final de su texto
+        value = sym.value
+        end = sym.lexpos + (len(value) if isinstance(value, str) else 0)
+    return end
+
+
+def _spanned_action(action):
+    def spanned(p):
+        action(p)
+        symbols = p.slice
+        start = end = None
+        # Normalmente el primer y el último símbolo tienen posición; solo las
+        # reglas vacías (sin rango) obligan a seguir buscando.
+        last = len(symbols) - 1
+        for index in range(1, last + 1):
+            start = getattr(symbols[index], 'lexpos', None)
+            if start is not None:
+                break
+        if start is not None:
+            for index in range(last, 0, -1):
+                sym = symbols[index]
+                if getattr(sym, 'lexpos', None) is not None:
+                    end = _symbol_end(sym)
+                    break
+        result = symbols[0]
+        result.lexpos = start
+        result.endlexpos = end
+        value = result.value
+        if type(value) is tuple:
+            result.value = make_node(value, start, end)
+
+    spanned.__name__ = action.__name__
+    spanned.__doc__ = action.__doc__
+    return spanned
+
+
+def track_spans(lr_parser):
+    """Envuelve las acciones de `lr_parser` para que los nodos lleven su rango."""
+    for production in lr_parser.productions:
+        if production.callable is not None:
+            production.callable = _spanned_action(production.callable)
+    return lr_parser
+
+
 # Construir el parser
-parser = yacc.yacc(debug=False, write_tables=False)
+parser = build_parser()
+
+# Motores de análisis: 'lalr' (tablas PLY) o 'rd' (descenso recursivo +
+# Pratt, ver rd_parser). Ambos producen el mismo AST; 'rd' delega en 'lalr'
+# los programas con errores sintácticos.
+PARSER_ENGINES = ('lalr', 'rd')
+PARSER_ENGINE = os.environ.get('RUST_ANALYZER_PARSER_ENGINE', 'lalr')
+
+
+class ParseSession:
+    """
+    Contexto de análisis reentrante.
+    Cada sesión tiene su propio clon del lexer, su propia instancia del parser
+    LALR (las tablas de solo lectura se comparten) y su propia lista de errores,
+    así que varias sesiones pueden usarse a la vez desde distintos hilos.
+    Una misma sesión no debe usarse desde dos hilos simultáneamente.
+
+    Ante un error sintáctico el parser se recupera (descarta tokens hasta el
+    siguiente ';', '}' o inicio de item) y sigue, así que un análisis reporta
+    todos los errores independientes y devuelve un AST parcial con nodos
+    ('error', linea) donde estaba el código descartado. `max_errors` (por
+    defecto MAX_SYNTAX_ERRORS) corta el análisis al llegar a ese número de
+    errores, y `max_error_seconds` (> 0) al pasar esos segundos desde el
+    primer error; `truncated` indica si el último análisis se cortó.
+
+    `engine` elige el motor de análisis (por defecto PARSER_ENGINE). Con 'rd'
+    los programas válidos se analizan por descenso recursivo; si hay errores,
+    o los tokens no vienen en un TokenBuffer, se usa el parser LALR.
+    """
+
+    def __init__(self, max_errors=None, engine=None, max_error_seconds=0):
+        self.engine = PARSER_ENGINE if engine is None else engine
+        if self.engine not in PARSER_ENGINES:
+            raise ValueError("Motor de análisis desconocido: {!r}".format(self.engine))
+        self.lexer = lexer.clone()
+        self.parser = copy.copy(parser)
+        self.parser.errorfunc = self._on_syntax_error
+        self.parser.partial_items = None
+        self.max_errors = MAX_SYNTAX_ERRORS if max_errors is None else max_errors
+        self.max_error_seconds = max_error_seconds
+        self.syntax_errors = []
+        self.truncated = False
+        self._error_deadline = None
+
+    def _on_syntax_error(self, p):
+        record_syntax_error(self.syntax_errors, p)
+        if 0 < self.max_errors <= len(self.syntax_errors):
+            raise TooManySyntaxErrors()
+        if self.max_error_seconds > 0:
+            if self._error_deadline is None:
+                self._error_deadline = time.monotonic() + self.max_error_seconds
+            elif time.monotonic() >= self._error_deadline:
+                raise TooManySyntaxErrors()
+
+    def tokenize(self, source):
+        """
+        Tokeniza el código fuente con el lexer de esta sesión. El lexeo se
+        corta también al llegar a `max_errors` caracteres ilegales o a
+        `max_error_seconds` desde el primero.
+        """
+        return tokenize_source(
+            source, self.lexer, max_errors=self.max_errors,
+            max_error_seconds=self.max_error_seconds,
+        )
+
+    def parse(self, source):
+        """Analiza código fuente Rust y devuelve (ast, errores_sintacticos)."""
+        # Reiniciar el estado del lexer para cada análisis para asegurar un estado limpio
+        self.lexer.lineno = 1
+        if self.engine == 'rd':
+            return self._run_descent(tokenize_source(source, self.lexer), 0, None)
+        return self._run(source, self.lexer)
+
+    def parse_tokens(self, token_list, start=0, stop=None):
+        """
+        Analiza una secuencia de tokens ya lexeados (la salida de
+        `tokenize_source`) sin volver a lexear el código fuente.
+        Con un TokenBuffer, `start`/`stop` limitan el análisis a ese rango.
+        """
+        if self.engine == 'rd' and isinstance(token_list, TokenBuffer):
+            return self._run_descent(token_list, start, stop)
+        return self._run(None, TokenFeeder(token_list, start, stop))
+
+    def _run_descent(self, buffer, start, stop):
+        try:
+            ast = parse_buffer(buffer, start, stop)
+        except (RDSyntaxError, RecursionError):
+            # Hay errores (o un anidamiento demasiado profundo para la pila de
+            # Python): el parser LALR los reporta y se recupera
+            return self._run(None, TokenFeeder(buffer, start, stop))
+        self.syntax_errors = []
+        self.truncated = False
+        return ast, self.syntax_errors
+
+    def _run(self, source, token_source):
+        self.syntax_errors = []
+        self.truncated = False
+        self._error_deadline = None
+        try:
+            result = self.parser.parse(source, lexer=token_source, debug=False)
+            if result is None and self.syntax_errors:
+                # El parser abandonó (error al final del archivo)
+                result = self._partial_program()
+            return result, self.syntax_errors
+        except TooManySyntaxErrors:
+            self.truncated = True
+            return self._partial_program(), self.syntax_errors
+        except Exception as e:
+            self.syntax_errors.append({
+                'line': 'error',
+                'message': str(e),
+                'token': None,
+                'type': None
+            })
+            return None, self.syntax_errors
+        finally:
+            self.parser.partial_items = None
+
+    def _partial_program(self):
+        """Programa con los items reconocidos antes de cortar el análisis."""
+        items = list(self.parser.partial_items or ())
+        if not items:
+            return make_node(('program', items))
+        return make_node(('program', items), items[0].start, items[-1].end)
 
 
 def parse_source(source):
     """Analiza código fuente Rust"""
-    global syntax_errors
-    syntax_errors = []
-
-    # Reiniciar el estado del lexer para cada análisis para asegurar un estado limpio
-    lexer.lineno = 1
-    
-    try:
-        result = parser.parse(source, lexer=lexer, debug=False)
-        return result, syntax_errors
-    except Exception as e:
-        syntax_errors.append({
-            'line': 'error',
-            'message': str(e),
-            'token': None,
-            'type': None
-        })
-        return None, syntax_errors
+    return ParseSession().parse(source)
+
+
+def parse_tokens(token_list):
+    """Analiza una lista de tokens producida por `tokenize_source`"""
+    return ParseSession().parse_tokens(token_list)
+
+
+def format_syntax_report(errors, source_code):
+    """Construye el texto del reporte de análisis sintáctico"""
+    lines = []
+    lines.append("=" * 80 + "\n")
+    lines.append("REPORTE DE ANALISIS SINTACTICO\n")
+    lines.append("=" * 80 + "\n")
+    lines.append("Fecha y Hora: {}\n".format(datetime.now().strftime('%d-%m-%Y %H:%M:%S')))
+    lines.append("Desarrollador: Alvasconv\n")
+    lines.append("=" * 80 + "\n\n")
+
+    lines.append("CODIGO FUENTE ANALIZADO:\n")
+    lines.append("-" * 80 + "\n")
+    lines.append(source_code)
+    lines.append("\n" + "-" * 80 + "\n\n")
+
+    if errors:
+        lines.append("ERRORES ENCONTRADOS: {}\n".format(len(errors)))
+        lines.append("-" * 80 + "\n")
+        for i, error in enumerate(errors, 1):
+            lines.append("\n{}. Error en Linea {}\n".format(i, error.get('line', '?')))
+            lines.append("   Mensaje: {}\n".format(error.get('message', '?')))
+            if error.get('token'):
+                lines.append("   Token: {}\n".format(error['token']))
+    else:
+        lines.append("ANALISIS COMPLETADO SIN ERRORES\n")
+    return ''.join(lines)
 
 
 def log_syntax_errors(filename, errors, source_code):
     """Genera archivo de log con los errores encontrados"""
     with open(filename, 'w', encoding='utf-8') as f:
-        f.write("=" * 80 + "\n")
-        f.write("REPORTE DE ANALISIS SINTACTICO\n")
-        f.write("=" * 80 + "\n")
-        f.write("Fecha y Hora: {}\n".format(datetime.now().strftime('%d-%m-%Y %H:%M:%S')))
-        f.write("Desarrollador: Alvasconv\n")
-        f.write("=" * 80 + "\n\n")
-        
-        f.write("CODIGO FUENTE ANALIZADO:\n")
-        f.write("-" * 80 + "\n")
-        f.write(source_code)
-        f.write("\n" + "-" * 80 + "\n\n")
-        
-        if errors:
-            f.write("ERRORES ENCONTRADOS: {}\n".format(len(errors)))
-            f.write("-" * 80 + "\n")
-            for i, error in enumerate(errors, 1):
-                f.write("\n{}. Error en Linea {}\n".format(i, error.get('line', '?')))
-                f.write("   Mensaje: {}\n".format(error.get('message', '?')))
-                if error.get('token'):
-                    f.write("   Token: {}\n".format(error['token']))
-        else:
-            f.write("ANALISIS COMPLETADO SIN ERRORES\n")
\ No newline at end of file
+        f.write(format_syntax_report(errors, source_code))
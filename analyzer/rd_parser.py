@@ -0,0 +1,606 @@
+# analyzer/rd_parser.py
+# Motor de análisis alternativo: descenso recursivo + precedencia (Pratt)
+#
+# Reconoce la misma gramática que las reglas p_* de ply_parser_final y arma el
+# mismo AST (mismos nodos, líneas y rangos en el código fuente), pero sin
+# recorrer la tabla LALR ni llamar a una acción de Python por cada reducción:
+# items y sentencias se analizan por descenso recursivo y las expresiones por
+# precedencia, con los niveles de la tabla `precedence`.
+#
+# Solo analiza programas válidos: ante el primer token inesperado lanza
+# RDSyntaxError y ParseSession repite el análisis con el motor LALR, que se
+# encarga de la recuperación y del reporte de errores.
+
+try:
+    from .ply_lexer import TOKEN_TYPES, TOKEN_TYPE_IDS, token_literal
+    from .ast_nodes import NODE_CLASSES
+except ImportError:
+    from ply_lexer import TOKEN_TYPES, TOKEN_TYPE_IDS, token_literal
+    from ast_nodes import NODE_CLASSES
+
+_T = TOKEN_TYPE_IDS
+# Palabras clave
+IF, ELSE, WHILE, FOR, LOOP = _T["IF"], _T["ELSE"], _T["WHILE"], _T["FOR"], _T["LOOP"]
+BREAK, CONTINUE, RETURN, IN = _T["BREAK"], _T["CONTINUE"], _T["RETURN"], _T["IN"]
+FN, LET, MUT, CONST, STATIC = _T["FN"], _T["LET"], _T["MUT"], _T["CONST"], _T["STATIC"]
+STRUCT, ENUM, TRAIT, IMPL = _T["STRUCT"], _T["ENUM"], _T["TRAIT"], _T["IMPL"]
+SELF, SELF_TYPE, STRING_TYPE = _T["SELF"], _T["SELF_TYPE"], _T["STRING_TYPE"]
+INPUT, CONSOLE_PRINT = _T["INPUT"], _T["CONSOLE_PRINT"]
+# Literales e identificadores
+IDENT, NUMBER, FLOAT, STRING = _T["IDENT"], _T["NUMBER"], _T["FLOAT"], _T["STRING"]
+TRUE, FALSE = _T["TRUE"], _T["FALSE"]
+# Operadores y delimitadores
+PLUS, MINUS, TIMES, DIVIDE, MODULO = _T["PLUS"], _T["MINUS"], _T["TIMES"], _T["DIVIDE"], _T["MODULO"]
+EQ, NEQ, LT, LTE, GT, GTE = _T["EQ"], _T["NEQ"], _T["LT"], _T["LTE"], _T["GT"], _T["GTE"]
+AND, OR, NOT, DOTDOT = _T["AND"], _T["OR"], _T["NOT"], _T["DOTDOT"]
+EQUALS, ARROW, PIPE, AMPERSAND = _T["EQUALS"], _T["ARROW"], _T["PIPE"], _T["AMPERSAND"]
+LPAREN, RPAREN, LBRACE, RBRACE = _T["LPAREN"], _T["RPAREN"], _T["LBRACE"], _T["RBRACE"]
+LBRACKET, RBRACKET = _T["LBRACKET"], _T["RBRACKET"]
+SEMICOLON, COLON, COLONCOLON, DOT, COMMA = (
+    _T["SEMICOLON"], _T["COLON"], _T["COLONCOLON"], _T["DOT"], _T["COMMA"]
+)
+# Marca de fin de la secuencia (no es un tipo de token)
+EOF = -1
+
+BASE_TYPES = frozenset(_T[name] for name in (
+    "I32", "I64", "U32", "U64", "F32", "F64", "BOOL", "CHAR", "STR",
+    "STRING_TYPE", "SELF_TYPE", "IDENT",
+))
+PATH_SEGMENTS = frozenset((IDENT, STRING_TYPE, SELF_TYPE))
+LITERALS = frozenset((NUMBER, FLOAT, STRING, TRUE, FALSE))
+COMPOUND_ASSIGN = frozenset(_T[name] for name in (
+    "PLUS_EQUALS", "MINUS_EQUALS", "TIMES_EQUALS", "DIVIDE_EQUALS",
+))
+
+# Operadores binarios: (nivel, tipo de nodo). Los niveles son los de la tabla
+# `precedence` del parser LALR; todos asocian a izquierda.
+BINARY = {
+    OR: (1, 'or'), AND: (2, 'and'),
+    EQ: (3, 'comparison'), NEQ: (3, 'comparison'), LT: (3, 'comparison'),
+    LTE: (3, 'comparison'), GT: (3, 'comparison'), GTE: (3, 'comparison'),
+    DOTDOT: (4, 'range'),
+    PLUS: (5, 'binop'), MINUS: (5, 'binop'),
+    TIMES: (6, 'binop'), DIVIDE: (6, 'binop'), MODULO: (6, 'binop'),
+}
+# Nivel del operando de `!` (NOT es el nivel 7, asociativo a derecha)
+NOT_OPERAND = 8
+# `.campo` / `.metodo(...)` no está en la tabla de precedencia, así que en el
+# parser LALR cualquier operador binario reduce antes del punto: el acceso se
+# aplica a toda la expresión de su izquierda (`a + b.c` es `(a + b).c`). Aquí
+# el punto solo se acepta en el nivel más bajo.
+POSTFIX_LEVEL = 0
+
+_BUILD = {kind: cls.build for kind, cls in NODE_CLASSES.items()}
+
+
+class RDSyntaxError(Exception):
+    """Token inesperado en la posición `index` de la secuencia."""
+
+    def __init__(self, index):
+        super().__init__(index)
+        self.index = index
+
+
+class RecursiveDescentParser:
+    """
+    Analiza los tokens [start, stop) de un TokenBuffer. Cada método reconoce
+    un no terminal de la gramática a partir de `self.pos`; los que arman una
+    expresión devuelven (nodo, inicio, fin), donde el rango es el del símbolo
+    (incluye los paréntesis de `(expr)`, como en las reglas LALR).
+    """
+
+    def __init__(self, buffer, start=0, stop=None):
+        stop = len(buffer) if stop is None else stop
+        source = buffer.source
+        types, starts, lengths, self.lines = buffer.columns(start, stop)
+        # Dos marcas de fin: algunas decisiones miran un token más adelante
+        self.types = types.tolist() + [EOF, EOF]
+        self.starts = starts.tolist()
+        self.ends = [begin + length for begin, length in zip(self.starts, lengths)]
+        self.values = [source[begin:end] for begin, end in zip(self.starts, self.ends)]
+        self.pos = 0
+
+    # ------------------------------------------------------------------
+    # Utilidades
+    # ------------------------------------------------------------------
+
+    def _expect(self, type_id):
+        """Consume un token de tipo `type_id` y devuelve su índice."""
+        index = self.pos
+        if self.types[index] != type_id:
+            raise RDSyntaxError(index)
+        self.pos = index + 1
+        return index
+
+    def _accept(self, type_id):
+        """Consume el token si es de tipo `type_id`; devuelve si lo hizo."""
+        if self.types[self.pos] == type_id:
+            self.pos += 1
+            return True
+        return False
+
+    # ------------------------------------------------------------------
+    # Programa e items
+    # ------------------------------------------------------------------
+
+    def parse_program(self):
+        items = []
+        item_parsers = {
+            FN: self._function_decl, STRUCT: self._struct_decl,
+            CONST: self._const_stmt, STATIC: self._static_stmt,
+            ENUM: self._enum_decl, TRAIT: self._trait_decl, IMPL: self._impl_block,
+        }
+        types = self.types
+        while types[self.pos] != EOF:
+            item_parser = item_parsers.get(types[self.pos])
+            if item_parser is None:
+                raise RDSyntaxError(self.pos)
+            items.append(item_parser())
+        if not items:
+            return _BUILD['program']((items,))
+        return _BUILD['program']((items,), items[0].start, items[-1].end)
+
+    def _function_decl(self):
+        first = self._expect(FN)
+        name = self.values[self._expect(IDENT)]
+        params = self._params_header()
+        return_type = None
+        if self._accept(ARROW):
+            return_type = self._type()
+        body, last = self._braced_stmts()
+        return _BUILD['fn']((name, params, return_type, body), self.starts[first], self.ends[last])
+
+    def _params_header(self):
+        """( [params_list] ) de una función o firma."""
+        self._expect(LPAREN)
+        if self._accept(RPAREN):
+            return []
+        params = self._params_list()
+        self._expect(RPAREN)
+        return params
+
+    def _params_list(self):
+        params = [self._param()]
+        while self._accept(COMMA):
+            params.append(self._param())
+        return params
+
+    def _param(self):
+        index = self.pos
+        if self.types[index] == AMPERSAND:
+            last = self._expect_after(index, SELF)
+            return _BUILD['param'](('&' + self.values[last], None), self.starts[index], self.ends[last])
+        self._expect(IDENT)
+        if self._accept(COLON):
+            param_type, end = self._type_with_end()
+            return _BUILD['param']((self.values[index], param_type), self.starts[index], end)
+        return _BUILD['param']((self.values[index], None), self.starts[index], self.ends[index])
+
+    def _expect_after(self, index, type_id):
+        """Consume el token `index` y uno de tipo `type_id` a continuación."""
+        self.pos = index + 1
+        return self._expect(type_id)
+
+    def _type_with_end(self):
+        """type : AMPERSAND base_type | base_type — devuelve (tipo, fin)."""
+        index = self.pos
+        if self.types[index] == AMPERSAND:
+            index += 1
+            prefix = '&'
+        else:
+            prefix = ''
+        if self.types[index] not in BASE_TYPES:
+            raise RDSyntaxError(index)
+        self.pos = index + 1
+        return prefix + self.values[index], self.ends[index]
+
+    def _type(self):
+        return self._type_with_end()[0]
+
+    def _struct_decl(self):
+        first = self._expect(STRUCT)
+        name = self.values[self._expect(IDENT)]
+        self._expect(LBRACE)
+        fields = []
+        while self.types[self.pos] == IDENT:
+            index = self.pos
+            self.pos += 1
+            self._expect(COLON)
+            field_type, end = self._type_with_end()
+            fields.append(_BUILD['field']((self.values[index], field_type), self.starts[index], end))
+            if not self._accept(COMMA):
+                break
+        last = self._expect(RBRACE)
+        return _BUILD['struct']((name, fields), self.starts[first], self.ends[last])
+
+    def _const_stmt(self):
+        first = self._expect(CONST)
+        name = self.values[self._expect(IDENT)]
+        self._expect(COLON)
+        declared_type = self._type()
+        self._expect(EQUALS)
+        value = self._initializer()[0]
+        last = self._expect(SEMICOLON)
+        return _BUILD['const']((name, declared_type, value), self.starts[first], self.ends[last])
+
+    def _static_stmt(self):
+        first = self._expect(STATIC)
+        kind = 'static_mut' if self._accept(MUT) else 'static'
+        name = self.values[self._expect(IDENT)]
+        self._expect(COLON)
+        declared_type = self._type()
+        self._expect(EQUALS)
+        value = self._initializer()[0]
+        last = self._expect(SEMICOLON)
+        return _BUILD[kind]((name, declared_type, value), self.starts[first], self.ends[last])
+
+    def _enum_decl(self):
+        first = self._expect(ENUM)
+        name = self.values[self._expect(IDENT)]
+        self._expect(LBRACE)
+        variants = []
+        while self.types[self.pos] == IDENT:
+            variants.append(self.values[self.pos])
+            self.pos += 1
+            if not self._accept(COMMA):
+                break
+        last = self._expect(RBRACE)
+        return _BUILD['enum_decl']((name, variants), self.starts[first], self.ends[last])
+
+    def _trait_decl(self):
+        first = self._expect(TRAIT)
+        name = self.values[self._expect(IDENT)]
+        self._expect(LBRACE)
+        signatures = []
+        while self.types[self.pos] == FN:
+            start = self.starts[self.pos]
+            self.pos += 1
+            fn_name = self.values[self._expect(IDENT)]
+            params = self._params_header()
+            return_type = self._type() if self._accept(ARROW) else None
+            last = self._expect(SEMICOLON)
+            signatures.append(_BUILD['fn_signature'](
+                (fn_name, params, return_type), start, self.ends[last]
+            ))
+        last = self._expect(RBRACE)
+        return _BUILD['trait_decl']((name, signatures), self.starts[first], self.ends[last])
+
+    def _impl_block(self):
+        first = self._expect(IMPL)
+        name = self.values[self._expect(IDENT)]
+        target = None
+        if self._accept(FOR):
+            target = self.values[self._expect(IDENT)]
+        self._expect(LBRACE)
+        functions = []
+        while self.types[self.pos] == FN:
+            functions.append(self._function_decl())
+        last = self._expect(RBRACE)
+        return _BUILD['impl_block']((name, target, functions), self.starts[first], self.ends[last])
+
+    # ------------------------------------------------------------------
+    # Sentencias
+    # ------------------------------------------------------------------
+
+    def _braced_stmts(self):
+        """{ opt_stmts } — devuelve (sentencias, índice de la '}')."""
+        self._expect(LBRACE)
+        stmts = []
+        types = self.types
+        statement = self._statement
+        while types[self.pos] != RBRACE:
+            stmts.append(statement())
+        last = self.pos
+        self.pos += 1
+        return stmts, last
+
+    def _statement(self):
+        index = self.pos
+        kind = self.types[index]
+        if kind == LET:
+            return self._let_stmt()
+        if kind == IDENT:
+            return self._assign_stmt()
+        if kind == IF:
+            self.pos += 1
+            condition = self._expr(0)[0]
+            body, last = self._braced_stmts()
+            if self._accept(ELSE):
+                else_body, last = self._braced_stmts()
+                return _BUILD['if_else'](
+                    (condition, body, else_body), self.starts[index], self.ends[last]
+                )
+            return _BUILD['if']((condition, body), self.starts[index], self.ends[last])
+        if kind == CONSOLE_PRINT:
+            self.pos += 1
+            self._expect(LPAREN)
+            text = self.values[self._expect(STRING)]
+            args = self._exprs() if self._accept(COMMA) else []
+            self._expect(RPAREN)
+            last = self._expect(SEMICOLON)
+            return _BUILD['println']((text, args), self.starts[index], self.ends[last])
+        if kind == WHILE:
+            self.pos += 1
+            condition = self._expr(0)[0]
+            body, last = self._braced_stmts()
+            return _BUILD['while_loop']((condition, body), self.starts[index], self.ends[last])
+        if kind == FOR:
+            self.pos += 1
+            variable = self.values[self._expect(IDENT)]
+            self._expect(IN)
+            iterable = self._expr(0)[0]
+            body, last = self._braced_stmts()
+            return _BUILD['for_loop']((variable, iterable, body), self.starts[index], self.ends[last])
+        if kind == LOOP:
+            self.pos += 1
+            body, last = self._braced_stmts()
+            return _BUILD['infinite_loop']((body,), self.starts[index], self.ends[last])
+        if kind == BREAK or kind == CONTINUE:
+            last = self._expect_after(index, SEMICOLON)
+            node_kind = 'break_stmt' if kind == BREAK else 'continue_stmt'
+            return _BUILD[node_kind]((), self.starts[index], self.ends[last])
+        if kind == RETURN:
+            self.pos += 1
+            value = None
+            if self.types[self.pos] != SEMICOLON:
+                value = self._initializer()[0]
+            last = self._expect(SEMICOLON)
+            return _BUILD['return_stmt']((value,), self.starts[index], self.ends[last])
+        raise RDSyntaxError(index)
+
+    def _let_stmt(self):
+        first = self.pos
+        self.pos += 1
+        kind = 'let_mut' if self._accept(MUT) else 'let'
+        name = self.values[self._expect(IDENT)]
+        declared_type = value = None
+        if self._accept(COLON):
+            declared_type = self._type()
+            if self._accept(EQUALS):
+                value = self._initializer()[0]
+        else:
+            self._expect(EQUALS)
+            value = self._initializer()[0]
+        last = self._expect(SEMICOLON)
+        return _BUILD[kind](
+            (name, declared_type, value, self.lines[first]), self.starts[first], self.ends[last]
+        )
+
+    def _assign_stmt(self):
+        first = self.pos
+        operator = first + 1
+        kind = self.types[operator]
+        if kind == EQUALS:
+            self.pos = operator + 1
+            value, _, value_end = self._initializer()
+            last = self._expect(SEMICOLON)
+            # IDENT = expr.metodo(args); es input_stmt: en el parser LALR el
+            # conflicto con la asignación de una llamada se resuelve a favor de
+            # esta regla (solo con argumentos y sin paréntesis alrededor)
+            if type(value) is _METHOD_CALL and value.args and value_end == value.end:
+                return _BUILD['input_stmt'](
+                    (self.values[first], value.receiver, value.method, value.args),
+                    self.starts[first], self.ends[last],
+                )
+        elif kind in COMPOUND_ASSIGN:
+            self.pos = operator + 1
+            value = self._expr(0)[0]
+            last = self._expect(SEMICOLON)
+        else:
+            raise RDSyntaxError(operator)
+        return _BUILD['assign'](
+            (self.values[first], self.values[operator], value, self.lines[first]),
+            self.starts[first], self.ends[last],
+        )
+
+    # ------------------------------------------------------------------
+    # Inicializadores y expresiones
+    # ------------------------------------------------------------------
+
+    def _initializer(self):
+        """initializer : expr | struct_init | closure_expr"""
+        index = self.pos
+        kind = self.types[index]
+        if kind == IDENT and self.types[index + 1] == LBRACE:
+            return self._struct_init()
+        if kind == OR or kind == PIPE:
+            return self._closure()
+        return self._expr(0)
+
+    def _struct_init(self):
+        first = self.pos
+        self.pos += 2
+        fields = []
+        while self.types[self.pos] == IDENT:
+            index = self.pos
+            self.pos += 1
+            self._expect(COLON)
+            value, _, end = self._expr(0)
+            fields.append(_BUILD['struct_field']((self.values[index], value), self.starts[index], end))
+            if not self._accept(COMMA):
+                break
+        last = self._expect(RBRACE)
+        start, end = self.starts[first], self.ends[last]
+        return _BUILD['struct_init']((self.values[first], fields), start, end), start, end
+
+    def _closure(self):
+        first = self.pos
+        self.pos += 1
+        params = []
+        if self.types[first] == PIPE:
+            params = self._params_list()
+            self._expect(PIPE)
+        return_type = self._type() if self._accept(ARROW) else None
+        if self.types[self.pos] == LBRACE:
+            block_start = self.starts[self.pos]
+            stmts, last = self._braced_stmts()
+            end = self.ends[last]
+            body = _BUILD['block']((stmts,), block_start, end)
+        else:
+            body, _, end = self._expr(0)
+        start = self.starts[first]
+        return _BUILD['closure']((params, return_type, body), start, end), start, end
+
+    def _exprs(self):
+        exprs = [self._expr(0)[0]]
+        while self._accept(COMMA):
+            exprs.append(self._expr(0)[0])
+        return exprs
+
+    def _expr(self, min_level):
+        """
+        Expresión cuyos operadores binarios tienen nivel >= `min_level`.
+        Devuelve (nodo, inicio, fin).
+        """
+        left, start, end = self._prefix()
+        types = self.types
+        while True:
+            kind = types[self.pos]
+            operator = BINARY.get(kind)
+            if operator is not None:
+                level, node_kind = operator
+                if level < min_level:
+                    break
+                index = self.pos
+                self.pos = index + 1
+                right, _, end = self._expr(level + 1)
+                if node_kind == 'binop':
+                    values = (left, self.values[index], right, self.lines[index])
+                elif node_kind == 'comparison':
+                    values = (left, self.values[index], right)
+                else:
+                    values = (left, right)
+                left = _BUILD[node_kind](values, start, end)
+            elif kind == DOT and min_level <= POSTFIX_LEVEL:
+                self.pos += 1
+                name_index = self._expect(IDENT)
+                name = self.values[name_index]
+                if self._accept(LPAREN):
+                    args = [] if self.types[self.pos] == RPAREN else self._exprs()
+                    last = self._expect(RPAREN)
+                    end = self.ends[last]
+                    left = _BUILD['method_call']((left, name, args), start, end)
+                else:
+                    end = self.ends[name_index]
+                    left = _BUILD['property_access']((left, name), start, end)
+            else:
+                break
+        return left, start, end
+
+    def _prefix(self):
+        index = self.pos
+        kind = self.types[index]
+        start = self.starts[index] if kind != EOF else None
+        if kind == IDENT or kind == STRING_TYPE or kind == SELF_TYPE:
+            following = self.types[index + 1]
+            if following == COLONCOLON:
+                return self._path(index)
+            if following == LPAREN and kind != SELF_TYPE:
+                self.pos = index + 2
+                args = [] if self.types[self.pos] == RPAREN else self._exprs()
+                end = self.ends[self._expect(RPAREN)]
+                return _BUILD['function_call']((self.values[index], args), start, end), start, end
+            if kind != IDENT:
+                raise RDSyntaxError(index + 1)
+            self.pos = index + 1
+            return self._literal(index)
+        if kind in LITERALS:
+            self.pos = index + 1
+            return self._literal(index)
+        if kind == LPAREN:
+            return self._paren_or_tuple(index)
+        if kind == NOT:
+            self.pos = index + 1
+            operand, _, end = self._expr(NOT_OPERAND)
+            return _BUILD['not']((operand,), start, end), start, end
+        if kind == LBRACKET:
+            return self._array(index)
+        if kind == AMPERSAND:
+            mode = '&'
+            self.pos = index + 1
+            if self._accept(MUT):
+                mode = '&mut'
+            name = self._expect(IDENT)
+            end = self.ends[name]
+            return _BUILD['reference']((mode, self.values[name]), start, end), start, end
+        if kind == INPUT:
+            self.pos = index + 1
+            self._expect(LPAREN)
+            end = self.ends[self._expect(RPAREN)]
+            return _BUILD['input_expr']((), start, end), start, end
+        raise RDSyntaxError(index)
+
+    def _literal(self, index):
+        type_name = TOKEN_TYPES[self.types[index]]
+        start, end = self.starts[index], self.ends[index]
+        literal = token_literal(type_name, self.values[index])
+        return _BUILD['literal']((literal, type_name), start, end), start, end
+
+    def _path(self, index):
+        segments = [self.values[index]]
+        self.pos = index + 1
+        types = self.types
+        while types[self.pos] == COLONCOLON:
+            segment = self.pos + 1
+            if types[segment] not in PATH_SEGMENTS:
+                raise RDSyntaxError(segment)
+            segments.append(self.values[segment])
+            self.pos = segment + 1
+        path = '::'.join(segments)
+        start = self.starts[index]
+        if self._accept(LPAREN):
+            args = [] if types[self.pos] == RPAREN else self._exprs()
+            end = self.ends[self._expect(RPAREN)]
+            return _BUILD['path_call']((path, args), start, end), start, end
+        end = self.ends[self.pos - 1]
+        return _BUILD['path_expr']((path,), start, end), start, end
+
+    def _paren_or_tuple(self, index):
+        start = self.starts[index]
+        self.pos = index + 1
+        if self.types[self.pos] == RPAREN:
+            end = self.ends[self.pos]
+            self.pos += 1
+            return _BUILD['tuple_literal'](([],), start, end), start, end
+        first = self._expr(0)[0]
+        if self.types[self.pos] == RPAREN:
+            # (expr): el nodo conserva su rango y el símbolo abarca los paréntesis
+            end = self.ends[self.pos]
+            self.pos += 1
+            return first, start, end
+        elements = [first]
+        while self._accept(COMMA):
+            if self.types[self.pos] == RPAREN:
+                break
+            elements.append(self._expr(0)[0])
+        end = self.ends[self._expect(RPAREN)]
+        return _BUILD['tuple_literal']((elements,), start, end), start, end
+
+    def _array(self, index):
+        start = self.starts[index]
+        self.pos = index + 1
+        if self.types[self.pos] == RBRACKET:
+            end = self.ends[self.pos]
+            self.pos += 1
+            return _BUILD['array_literal'](([],), start, end), start, end
+        first = self._expr(0)[0]
+        if self._accept(SEMICOLON):
+            size = self._expr(0)[0]
+            end = self.ends[self._expect(RBRACKET)]
+            return _BUILD['array_repeat']((first, size), start, end), start, end
+        elements = [first]
+        while self._accept(COMMA):
+            elements.append(self._expr(0)[0])
+        end = self.ends[self._expect(RBRACKET)]
+        return _BUILD['array_literal']((elements,), start, end), start, end
+
+
+_METHOD_CALL = NODE_CLASSES['method_call']
+
+
+def parse_buffer(buffer, start=0, stop=None):
+    """
+    Analiza los tokens [start, stop) de un TokenBuffer y devuelve el nodo
+    'program'. Lanza RDSyntaxError en el primer token inesperado.
+    """
+    return RecursiveDescentParser(buffer, start, stop).parse_program()
@@ -3,43 +3,116 @@
 # Autor: Alvascon, vicbguti29
 
 from datetime import datetime
+import time
+from types import GeneratorType
+
+try:
+    from .ast_nodes import CHILD_LAYOUTS, Node, as_nodes
+    from .diagnostics import Diagnostic
+    from .semantic_types import (
+        BOOL, EMPTY_ARRAY, F64, I32, INTEGER_TYPES, NUMERIC_TYPES, STR_REF, UNDECLARED,
+        UNINITIALIZED, UNIT, UNKNOWN, TypeTable,
+    )
+except ImportError:
+    from ast_nodes import CHILD_LAYOUTS, Node, as_nodes
+    from diagnostics import Diagnostic
+    from semantic_types import (
+        BOOL, EMPTY_ARRAY, F64, I32, INTEGER_TYPES, NUMERIC_TYPES, STR_REF, UNDECLARED,
+        UNINITIALIZED, UNIT, UNKNOWN, TypeTable,
+    )
 
 # --- TABLA DE SÍMBOLOS CON GESTIÓN DE SCOPES ---
 # Autor: vicbguti29
+class Symbol:
+    """Información de un identificador declarado (ver SymbolTable.add)."""
+
+    __slots__ = ('type', 'is_mutable', 'is_initialized', 'scope_level', 'line_declared')
+
+    def __init__(self, type, is_mutable, is_initialized, scope_level, line_declared):
+        self.type = type
+        self.is_mutable = is_mutable
+        self.is_initialized = is_initialized
+        self.scope_level = scope_level
+        self.line_declared = line_declared
+
+    def __repr__(self):
+        return (f"Symbol(type={self.type}, is_mutable={self.is_mutable}, "
+                f"is_initialized={self.is_initialized}, scope_level={self.scope_level}, "
+                f"line_declared={self.line_declared})")
+
+
 class SymbolTable:
     """
     Tabla de símbolos con soporte para múltiples niveles de alcance (scopes).
     Permite registrar identificadores con sus tipos, mutabilidad y el alcance en que fueron declarados.
+
+    Cada nombre tiene su pila de declaraciones visibles (la del scope más
+    interno arriba), así que `lookup` no recorre los scopes. Cada scope
+    guarda los nombres que declaró, para quitar solo esas declaraciones al
+    salir: un scope terminado no queda en memoria.
+    Los nombres de tipo se resuelven con `types`, la TypeTable del análisis
+    (una propia si no se indica).
     """
     
-    def __init__(self):
-        # Pila de scopes: cada elemento es un diccionario de símbolos en ese scope
-        self.scopes = [{}]  # Scope global inicial
-        self.scope_stack = [0]  # Pila que rastrea índices de scope activos
+    def __init__(self, types=None):
+        self.types = types if types is not None else TypeTable()
+        # Nombre -> pila de símbolos visibles con ese nombre (el último es
+        # el del scope más interno)
+        self.bindings = {}
+        # Pila de scopes activos: cada uno es la lista de nombres que declaró
+        self.scope_stack = [[]]  # Scope global inicial
+        # Cambia con cada modificación que puede alterar el resultado de
+        # `lookup` (declarar, inicializar o salir de un scope con símbolos).
+        # Los tipos memorizados por SemanticAnalyzer valen para una versión.
+        self.version = 0
         
     def enter_scope(self):
         """Entra a un nuevo alcance (bloque de código)."""
-        self.scopes.append({})
-        self.scope_stack.append(len(self.scopes) - 1)
+        self.scope_stack.append([])
     
     def exit_scope(self):
-        """Sale del alcance actual."""
+        """Sale del alcance actual y descarta los símbolos que declaró."""
         if len(self.scope_stack) > 1:
-            self.scope_stack.pop()
+            declared = self.scope_stack.pop()
+            # Salir de un scope vacío no cambia ninguna búsqueda
+            if declared:
+                bindings = self.bindings
+                for name in declared:
+                    stack = bindings[name]
+                    stack.pop()
+                    if not stack:
+                        del bindings[name]
+                self.version += 1
     
     def add(self, name, type, is_mutable=False, is_initialized=True, line_no=None):
         """
         Añade un símbolo al alcance actual.
         El símbolo se registra con su tipo, mutabilidad, estado de inicialización y línea.
+        El tipo es un Type (ver semantic_types) o el nombre de un tipo.
         """
-        current_scope_idx = self.scope_stack[-1]
-        self.scopes[current_scope_idx][name] = {
-            'type': type,
-            'is_mutable': is_mutable,
-            'is_initialized': is_initialized,
-            'scope_level': len(self.scope_stack) - 1,
-            'line_declared': line_no
-        }
+        if isinstance(type, str):
+            type = self.types.named(type)
+        scope_level = len(self.scope_stack) - 1
+        symbol = Symbol(type, is_mutable, is_initialized, scope_level, line_no)
+        stack = self.bindings.get(name)
+        if stack is None:
+            self.bindings[name] = [symbol]
+            self.scope_stack[-1].append(name)
+        elif stack[-1].scope_level == scope_level:
+            # Redeclaración en el mismo scope: reemplaza a la anterior
+            stack[-1] = symbol
+        else:
+            stack.append(symbol)
+            self.scope_stack[-1].append(name)
+        self.version += 1
+
+    def mark_initialized(self, name, scope_level):
+        """Marca como inicializado el símbolo `name` declarado en `scope_level`."""
+        for symbol in reversed(self.bindings[name]):
+            if symbol.scope_level == scope_level:
+                symbol.is_initialized = True
+                break
+        self.version += 1
     
     def lookup(self, name):
         """
@@ -48,51 +121,195 @@ class SymbolTable:
         Retorna una tupla (symbol_info, scope_level) si lo encuentra,
         o (None, None) si no lo encuentra.
         """
-        # Recorrer scopes desde el actual hacia atrás (hacia el global)
-        for scope_idx in reversed(self.scope_stack):
-            if name in self.scopes[scope_idx]:
-                return self.scopes[scope_idx][name], scope_idx
-        return None, None
+        # La declaración visible es la última de la pila del nombre
+        stack = self.bindings.get(name)
+        if stack is None:
+            return None, None
+        symbol = stack[-1]
+        return symbol, symbol.scope_level
     
     def lookup_current_scope_only(self, name):
         """
         Busca un símbolo solo en el alcance actual.
         Retorna el símbolo si lo encuentra, None si no.
         """
-        current_scope_idx = self.scope_stack[-1]
-        return self.scopes[current_scope_idx].get(name)
+        symbol, scope_level = self.lookup(name)
+        if scope_level == len(self.scope_stack) - 1:
+            return symbol
+        return None
 
 # -------------------------------------------------
 
+# Marca de la pila de SemanticAnalyzer.visit: retomar la visita en curso
+_RESUME = object()
+
+
+class _Handlers(dict):
+    """
+    Método visit_* de cada tipo de nodo para una clase de visitante. Se
+    resuelve la primera vez que aparece cada tipo y queda en el diccionario.
+    """
+
+    def __init__(self, cls):
+        super().__init__()
+        self.cls = cls
+
+    def __missing__(self, kind):
+        handler = self[kind] = getattr(self.cls, 'visit_' + kind, self.cls.generic_visit)
+        return handler
+
+
+class TooManySemanticErrors(Exception):
+    """Interrumpe el análisis al alcanzar el máximo de errores o su plazo."""
+
+
 class SemanticAnalyzer:
     
     """
     Recorre el Árbol de Sintaxis Abstracta (AST) generado por el parser
     para realizar el análisis semántico, como la comprobación de tipos,
     alcance de variables e identificadores.
+
+    Con `max_errors` > 0, el error número `max_errors` interrumpe la visita
+    con TooManySemanticErrors y deja `truncated` en True. Con
+    `max_error_seconds` > 0 la interrumpe el primer error que llega pasados
+    esos segundos desde el primero.
     """
     
-    def __init__(self):
-        self.symbol_table = SymbolTable()
-        self.errors = []
+    def __init__(self, max_errors=0, max_error_seconds=0):
+        self.max_errors = max_errors
+        self.max_error_seconds = max_error_seconds
+        self._error_deadline = None
+        self.truncated = False
+        # Tipos con nombre y compuestos de este análisis (los tipos se
+        # comparan con `is`)
+        self.types = TypeTable()
+        self.symbol_table = SymbolTable(self.types)
+        # Errores encontrados, como Diagnostic (ver report); `errors` los da
+        # como mensajes
+        self.diagnostics = []
+        self.current_node = None
         self.in_loop = False  # Rastrear si estamos dentro de un loop
         self.in_function = False  # Rastrear si estamos dentro de una función
+        # Tipos ya calculados: id(nodo) -> (versión de la tabla de símbolos,
+        # si se calculó con línea, tipo, nodo). Ver get_expression_type; el
+        # nodo queda en la entrada para que su id no se reutilice.
+        self._type_cache = {}
+        # Tabla de despacho por tipo de nodo, compartida por las instancias
+        # de la misma clase
+        cls = type(self)
+        self._handlers = cls.__dict__.get('_handler_table')
+        if self._handlers is None:
+            self._handlers = cls._handler_table = _Handlers(cls)
 
     def visit(self, node):
+        """
+        Visita `node` y sus descendientes sin recursión en la pila de Python,
+        así que la profundidad del AST solo la limita la memoria.
+
+        Los métodos visit_* que visitan hijos son generadores: `yield hijo`
+        visita el hijo (se retoma el método al terminar, con el resultado de
+        esa visita) y el `return` del generador es el resultado de la visita.
+        Los que no visitan hijos pueden ser funciones normales. El orden de
+        las visitas, y por lo tanto de los errores, es el mismo que con
+        llamadas recursivas.
+        """
         if node is None: return
-        method_name = f'visit_{node[0]}'
-        method = getattr(self, method_name, self.generic_visit)
-        return method(node)
+        handlers = self._handlers
+        outer = self.current_node
+        # Visitas en curso: (generador del método visit_*, nodo)
+        stack = []
+        request = node
+        while True:
+            if request is not _RESUME:
+                if request is None:
+                    value = None
+                else:
+                    if type(request) is tuple:
+                        # Árbol armado con tuplas: se convierte a nodos una
+                        # vez, así las reglas leen los campos por nombre
+                        request = as_nodes(request)
+                    self.current_node = request
+                    value = handlers[request[0] if type(request) is tuple else request.kind](self, request)
+                    if type(value) is GeneratorType:
+                        stack.append((value, request))
+                        value = None
+                    else:
+                        if not stack:
+                            self.current_node = outer
+                            return value
+                        self.current_node = stack[-1][1]
+            try:
+                request = stack[-1][0].send(value)
+            except StopIteration as stop:
+                stack.pop()
+                if not stack:
+                    self.current_node = outer
+                    return stop.value
+                self.current_node = stack[-1][1]
+                value = stop.value
+                request = _RESUME
+
+    def report(self, code, line_no=None, **args):
+        """
+        Registra un error de la regla `code` (ver diagnostics.MESSAGES) con
+        los argumentos de su mensaje, que no se arma hasta que se pide. Su
+        rango es el del nodo que se está visitando (None si no tiene posición).
+        """
+        node = self.current_node
+        start = getattr(node, 'start', None)
+        span = (start, node.end) if start is not None else None
+        self.diagnostics.append(Diagnostic(code, line_no, args, span=span))
+        if 0 < self.max_errors <= len(self.diagnostics):
+            self.truncated = True
+            raise TooManySemanticErrors()
+        if self.max_error_seconds > 0:
+            if self._error_deadline is None:
+                self._error_deadline = time.monotonic() + self.max_error_seconds
+            elif time.monotonic() >= self._error_deadline:
+                self.truncated = True
+                raise TooManySemanticErrors()
+
+    @property
+    def errors(self):
+        """Mensajes de los errores encontrados, en orden."""
+        return [diagnostic.render() for diagnostic in self.diagnostics]
+
+    @property
+    def error_spans(self):
+        """Rango (start, end) del nodo de cada error (paralela a `errors`)."""
+        return [diagnostic.span for diagnostic in self.diagnostics]
 
     def generic_visit(self, node):
-        """Visita todos los sub-nodos de forma recursiva."""
+        """
+        Visita todos los sub-nodos. Devuelve el generador que los pide (ver
+        `visit`), o None si el tipo de nodo no tiene hijos.
+        """
+        layout = CHILD_LAYOUTS.get(node[0] if type(node) is tuple else node.kind)
+        if layout is None:
+            return self._scan_children(node)
+        if layout:
+            return self._visit_children(node, layout)
+
+    def _visit_children(self, node, layout):
+        if type(node) is tuple:
+            node = as_nodes(node)
+        for _, field, is_list in layout:
+            if is_list:
+                for item in getattr(node, field):
+                    yield item
+            else:
+                yield getattr(node, field)
+
+    def _scan_children(self, node):
+        """Visita los sub-nodos de un nodo de tipo desconocido."""
         for element in node[1:]:
-            if isinstance(element, tuple):
-                self.visit(element)  # Esto llamará al visit_* correcto
+            if isinstance(element, (Node, tuple)):
+                yield element  # Esto llamará al visit_* correcto
             elif isinstance(element, list):
                 for item in element:
-                    if isinstance(item, tuple):
-                        self.visit(item)
+                    if isinstance(item, (Node, tuple)):
+                        yield item
 
     def enter_scope(self):
         """Entra a un nuevo alcance (bloque de código)."""
@@ -105,158 +322,196 @@ class SemanticAnalyzer:
     # --- LÓGICA DE EVALUACIÓN DE TIPOS Y VALIDACIÓN DE IDENTIFICADORES ---
     def get_expression_type(self, expr_node, line_no=None):
         """
-        Evalúa y devuelve el tipo de un nodo de expresión.
+        Evalúa y devuelve el tipo (un Type) de un nodo de expresión.
         También valida la existencia de identificadores (REGLA 1 - vicbguti29).
+
+        Como `visit`, no usa recursión: los tipos que dependen de los de sus
+        sub-expresiones se calculan con generadores (ver `_expression_type`)
+        que se retoman desde una pila explícita.
+
+        El tipo de cada nodo se calcula una sola vez mientras la tabla de
+        símbolos no cambie (misma `version`): visit_binop tipa los operandos
+        y visit_let/visit_assign tipan después la expresión completa, que
+        reutiliza esos tipos en vez de recorrer de nuevo el subárbol y
+        repetir sus errores. Un tipo calculado sin línea (sin reportar
+        identificadores no declarados) no sirve para una consulta con línea.
+
+        Solo se guarda el tipo de la expresión consultada; el de cada
+        sub-expresión se descarta al usarlo para el de su padre. Así el memo
+        no retiene los tipos intermedios (con tuplas anidadas, cada uno
+        contiene al anterior y juntos ocuparían memoria cuadrática).
         """
-        if not expr_node or not isinstance(expr_node, tuple):
-            return 'unknown'
+        cache = self._type_cache
+        symbol_table = self.symbol_table
+        # Cálculos en curso: (generador, nodo, versión, con línea)
+        stack = []
+        while True:
+            entry = cache.get(id(expr_node)) if isinstance(expr_node, Node) else None
+            if entry is not None and entry[0] == symbol_table.version and (entry[1] or not line_no):
+                value = entry[2]
+                if stack:
+                    del cache[id(expr_node)]
+            else:
+                version = symbol_table.version
+                value = self._expression_type(expr_node, line_no)
+                if type(value) is GeneratorType:
+                    stack.append((value, expr_node, version, bool(line_no)))
+                    value = None
+                elif not stack and isinstance(expr_node, Node):
+                    cache[id(expr_node)] = (version, bool(line_no), value, expr_node)
+            while stack:
+                generator, node, version, reported = stack[-1]
+                try:
+                    expr_node, line_no = generator.send(value)
+                    break
+                except StopIteration as stop:
+                    stack.pop()
+                    value = stop.value
+                    if not stack and isinstance(node, Node):
+                        cache[id(node)] = (version, reported, value, node)
+            else:
+                return value
+
+    def _expression_type(self, expr_node, line_no):
+        """
+        Tipo de `expr_node`, o un generador si depende del tipo de sus
+        sub-expresiones: pide cada una con `yield (expr, linea)`, recibe su
+        tipo y devuelve el tipo final con `return`.
+        """
+        if type(expr_node) is tuple:
+            expr_node = as_nodes(expr_node)
+        if not expr_node or not isinstance(expr_node, Node):
+            return UNKNOWN
 
-        node_type = expr_node[0]
+        node_type = expr_node.kind
         
         if node_type == 'literal':
             # AST: ('literal', value, token_type)
-            value, token_type = expr_node[1], expr_node[2]
+            value, token_type = expr_node.value, expr_node.token_type
 
             # Si el literal es un IDENT, es una variable. Buscamos su tipo.
             if token_type == 'IDENT':
                 symbol, _ = self.symbol_table.lookup(value)
                 if symbol:
                     # Nueva Regla: Validar que la variable esté inicializada antes de ser usada.
-                    if not symbol['is_initialized']:
-                        error_msg = f"Error Semántico (Línea {line_no}): se usó la variable no inicializada '{value}'."
-                        self.errors.append(error_msg)
-                        return 'uninitialized'
-                    return symbol['type']
+                    if not symbol.is_initialized:
+                        self.report('uninitialized-variable', line_no, name=value)
+                        return UNINITIALIZED
+                    return symbol.type
                 else:
                     # REGLA 1: Validación de Existencia
                     if line_no:
-                        error_msg = f"Error Semántico (Línea {line_no}): Identificador no encontrado. La variable '{value}' no ha sido declarada en este alcance."
-                        self.errors.append(error_msg)
-                    return 'undeclared'
+                        self.report('undeclared-variable', line_no, name=value)
+                    return UNDECLARED
             
             # Para otros literales, determinamos el tipo por su valor en Python.
-            if token_type == 'NUMBER': return 'i32'
-            if token_type == 'FLOAT': return 'f64'
-            if token_type == 'TRUE' or token_type == 'FALSE': return 'bool'
-            if token_type == 'STRING': return '&str'
+            if token_type == 'NUMBER': return I32
+            if token_type == 'FLOAT': return F64
+            if token_type == 'TRUE' or token_type == 'FALSE': return BOOL
+            if token_type == 'STRING': return STR_REF
 
         elif node_type == 'struct_init':
-            return expr_node[1]
+            return self.types.named(expr_node.name)
 
         elif node_type == 'array_literal':
-            elements = expr_node[1]
+            elements = expr_node.elements
             if not elements:
-                return '[<unknown>; 0]'
-            first_elem_type = self.get_expression_type(elements[0], line_no)
-            return f'[{first_elem_type}; {len(elements)}]'
+                return EMPTY_ARRAY
+            return self._array_literal_type(elements, line_no)
 
         elif node_type == 'array_repeat':
-            value_type = self.get_expression_type(expr_node[1], line_no)
-            size_expr = expr_node[2]
-            size_type = self.get_expression_type(size_expr, line_no)
-            
-            # Allow any integer type for array size
-            if size_type not in {'i32', 'u32', 'i64', 'u64', 'i16', 'u16', 'i8', 'u8'}:
-                error_msg = f"Error Semántico (Línea {line_no}): el tamaño del array debe ser un entero, pero se encontró tipo '{size_type}'."
-                self.errors.append(error_msg)
-
-            # Try to get the literal value for the type string, otherwise use placeholder
-            size_val = '_'
-            if size_expr[0] == 'literal' and size_expr[2] == 'NUMBER':
-                size_val = size_expr[1]
+            return self._array_repeat_type(expr_node, line_no)
 
         elif node_type == 'closure':
-            # AST: ('closure', params, return_type, body)
-            _closure, params, return_type, body = expr_node
-            
-            self.symbol_table.enter_scope()
-            
-            param_types = []
-            for param in params:
-                # param is ('param', name, type)
-                param_name = param[1]
-                # HACK: Assume i32 for untyped params for now. A real implementation needs inference.
-                param_type = param[2] if param[2] else 'i32'
-                param_types.append(param_type)
-                self.symbol_table.add(param_name, param_type, is_mutable=False, is_initialized=True, line_no=line_no)
-
-            # Now, with params in scope, analyze the body to determine its return type
-            body_type = self.get_expression_type(body, line_no)
-            
-            self.symbol_table.exit_scope()
-            
-            # Construct a string representation of the closure's type
-            param_types_str = ", ".join(param_types)
-            closure_type_str = f"Fn({param_types_str}) -> {body_type}"
-            
-            return closure_type_str
-
-        elif node_type == 'closure_expr':
-            # AST: ('closure', params, return_type, body)
-            _closure, params, return_type, body = expr_node
-            
-            self.symbol_table.enter_scope()
-            
-            param_types = []
-            for param in params:
-                # param is ('param', name, type)
-                param_name = param[1]
-                # HACK: Assume i32 for untyped params for now. A real implementation needs inference.
-                param_type = param[2] if param[2] else 'i32'
-                param_types.append(param_type)
-                self.symbol_table.add(param_name, param_type, is_mutable=False, is_initialized=True, line_no=line_no)
-
-            # Now, with params in scope, analyze the body to determine its return type
-            body_type = self.get_expression_type(body, line_no)
-            
-            self.symbol_table.exit_scope()
-            
-            # Construct a string representation of the closure's type
-            param_types_str = ", ".join(param_types)
-            closure_type_str = f"Fn({param_types_str}) -> {body_type}"
-            
-            return closure_type_str
+            return self._closure_type(expr_node, line_no)
 
         elif node_type == 'tuple_literal':
-            elements = expr_node[1]
+            elements = expr_node.elements
             if not elements:
-                return '()'
-            elem_types = [self.get_expression_type(e, line_no) for e in elements]
-            return f'({", ".join(elem_types)})'
+                return UNIT
+            return self._tuple_literal_type(elements, line_no)
 
         elif node_type == 'binop':
-            # AST: ('binop', left, op, right)
-            left_type = self.get_expression_type(expr_node[1], line_no)
-            right_type = self.get_expression_type(expr_node[3], line_no)
-            # Simple rule: if both are numeric and same, return that type.
-            numeric_types = {'i32', 'i64', 'u32', 'u64', 'f32', 'f64'}
-            if left_type in numeric_types and right_type in numeric_types:
-                # For simplicity, we can assume the result type is the same as the operands' type
-                # A more complex implementation would handle type promotion (e.g., i32 + f64 -> f64)
-                return left_type 
-            return 'unknown'
+            return self._binop_type(expr_node, line_no)
         
         elif node_type in ('comparison', 'and', 'or', 'not'):
-            return 'bool'
+            return BOOL
+
+        return UNKNOWN
+
+    def _array_literal_type(self, elements, line_no):
+        first_elem_type = yield elements[0], line_no
+        return self.types.array(first_elem_type, len(elements))
 
-        return 'unknown'
+    def _array_repeat_type(self, expr_node, line_no):
+        value_type = yield expr_node.value, line_no
+        size_expr = expr_node.size
+        size_type = yield size_expr, line_no
+        
+        # Allow any integer type for array size
+        if size_type not in INTEGER_TYPES:
+            self.report('array-size', line_no, found=size_type)
+
+        # Try to get the literal value for the type string, otherwise use placeholder
+        size_val = '_'
+        if size_expr.kind == 'literal' and size_expr.token_type == 'NUMBER':
+            size_val = size_expr.value
+        return UNKNOWN
+
+    def _closure_type(self, expr_node, line_no):
+        # AST: ('closure', params, return_type, body)
+        params, body = expr_node.params, expr_node.body
+        
+        self.symbol_table.enter_scope()
+        
+        param_types = []
+        for param in params:
+            # param is ('param', name, type)
+            param_name = param.name
+            # HACK: Assume i32 for untyped params for now. A real implementation needs inference.
+            param_type = self.types.named(param.param_type) if param.param_type else I32
+            param_types.append(param_type)
+            self.symbol_table.add(param_name, param_type, is_mutable=False, is_initialized=True, line_no=line_no)
+
+        # Now, with params in scope, analyze the body to determine its return type
+        body_type = yield body, line_no
+        
+        self.symbol_table.exit_scope()
+        
+        # The closure's type, e.g. Fn(i32) -> i32
+        return self.types.fn(param_types, body_type)
+
+    def _tuple_literal_type(self, elements, line_no):
+        elem_types = []
+        for e in elements:
+            elem_types.append((yield e, line_no))
+        return self.types.tuple(elem_types)
+
+    def _binop_type(self, expr_node, line_no):
+        # AST: ('binop', left, op, right)
+        left_type = yield expr_node.left, line_no
+        right_type = yield expr_node.right, line_no
+        # Simple rule: if both are numeric and same, return that type.
+        if left_type in NUMERIC_TYPES and right_type in NUMERIC_TYPES:
+            # For simplicity, we can assume the result type is the same as the operands' type
+            # A more complex implementation would handle type promotion (e.g., i32 + f64 -> f64)
+            return left_type 
+        return UNKNOWN
 
     # --- LÓGICA PARA REGLAS SEMÁNTICAS ---
 
     def visit_program(self, node):
-        _program, statements = node
-        for stmt in statements:
-            self.visit(stmt)
+        for stmt in node.items:
+            yield stmt
 
     def visit_array_repeat(self, node):
         # AST: ('array_repeat', value_expr, size_expr)
-        _array_repeat, value_expr, size_expr = node
-        self.visit(value_expr)
-        self.visit(size_expr)
+        yield node.value
+        yield node.size
 
     # Manejo de scope de función y verificación de return
     def visit_fn(self, node):
-        _fn, _name, _params, _ret_type, body = node
+        body = node.body
         
         # Entrar en contexto de función
         old_in_function = self.in_function
@@ -264,7 +519,7 @@ class SemanticAnalyzer:
         
         self.enter_scope()
         for stmt in body:
-            self.visit(stmt)
+            yield stmt
         self.exit_scope()
         
         # Salir del contexto de función
@@ -276,16 +531,16 @@ class SemanticAnalyzer:
     # ============================================================================
     def visit_let(self, node):
         # AST: ('let', var_name, declared_type, expr_node, line_no)
-        _let, var_name, declared_type, expr_node, line_no = node
+        var_name, declared_type, expr_node, line_no = node.name, node.declared_type, node.value, node.line
+        declared_type = self.types.named(declared_type) if declared_type else None
         
         if expr_node:
             # Variable con inicialización
-            self.visit(expr_node)
+            yield expr_node
             evaluated_type = self.get_expression_type(expr_node, line_no)
 
-            if declared_type and evaluated_type != 'unknown' and declared_type != evaluated_type:
-                error_msg = f"Error Semántico (Línea {line_no}): Discrepancia de tipos. Se esperaba tipo '{declared_type}' pero se encontró tipo '{evaluated_type}' en la asignación de '{var_name}'."
-                self.errors.append(error_msg)
+            if declared_type and evaluated_type is not UNKNOWN and declared_type is not evaluated_type:
+                self.report('let-type-mismatch', line_no, expected=declared_type, found=evaluated_type, name=var_name)
                 return
 
             final_type = declared_type or evaluated_type
@@ -294,24 +549,23 @@ class SemanticAnalyzer:
             # Variable sin inicialización (debe tener tipo explícito)
             if not declared_type:
                 # Esto debería ser un error sintáctico, pero lo validamos por si acaso.
-                error_msg = f"Error Semántico (Línea {line_no}): las declaraciones sin valor deben tener un tipo explícito."
-                self.errors.append(error_msg)
+                self.report('missing-type', line_no)
                 return
             self.symbol_table.add(var_name, declared_type, is_mutable=False, is_initialized=False, line_no=line_no)
 
 
     def visit_let_mut(self, node):
         # AST: ('let_mut', var_name, declared_type, expr_node, line_no)
-        _let, var_name, declared_type, expr_node, line_no = node
+        var_name, declared_type, expr_node, line_no = node.name, node.declared_type, node.value, node.line
+        declared_type = self.types.named(declared_type) if declared_type else None
         
         if expr_node:
             # Variable con inicialización
-            self.visit(expr_node)
+            yield expr_node
             evaluated_type = self.get_expression_type(expr_node, line_no)
 
-            if declared_type and evaluated_type != 'unknown' and declared_type != evaluated_type:
-                error_msg = f"Error Semántico (Línea {line_no}): Discrepancia de tipos. Se esperaba tipo '{declared_type}' pero se encontró tipo '{evaluated_type}' en la asignación de '{var_name}'."
-                self.errors.append(error_msg)
+            if declared_type and evaluated_type is not UNKNOWN and declared_type is not evaluated_type:
+                self.report('let-type-mismatch', line_no, expected=declared_type, found=evaluated_type, name=var_name)
                 return
 
             final_type = declared_type or evaluated_type
@@ -319,15 +573,15 @@ class SemanticAnalyzer:
         else:
             # Variable sin inicialización (debe tener tipo explícito)
             if not declared_type:
-                error_msg = f"Error Semántico (Línea {line_no}): las declaraciones sin valor deben tener un tipo explícito."
-                self.errors.append(error_msg)
+                self.report('missing-type', line_no)
                 return
             self.symbol_table.add(var_name, declared_type, is_mutable=True, is_initialized=False, line_no=line_no)
 
     def visit_const(self, node):
         # AST: ('const', name, type, expr)
-        _const, name, declared_type, expr_node = node
-        self.visit(expr_node)
+        name, declared_type, expr_node = node.name, node.declared_type, node.value
+        declared_type = self.types.named(declared_type) if declared_type else None
+        yield expr_node
         evaluated_type = self.get_expression_type(expr_node)
         # NOTE: We could add type discrepancy check here too if needed
         final_type = declared_type or evaluated_type
@@ -335,16 +589,18 @@ class SemanticAnalyzer:
 
     def visit_static(self, node):
         # AST: ('static', name, type, expr)
-        _static, name, declared_type, expr_node = node
-        self.visit(expr_node)
+        name, declared_type, expr_node = node.name, node.declared_type, node.value
+        declared_type = self.types.named(declared_type) if declared_type else None
+        yield expr_node
         evaluated_type = self.get_expression_type(expr_node)
         final_type = declared_type or evaluated_type
         self.symbol_table.add(name, final_type, is_mutable=False)
 
     def visit_static_mut(self, node):
         # AST: ('static_mut', name, type, expr)
-        _static_mut, name, declared_type, expr_node = node
-        self.visit(expr_node)
+        name, declared_type, expr_node = node.name, node.declared_type, node.value
+        declared_type = self.types.named(declared_type) if declared_type else None
+        yield expr_node
         evaluated_type = self.get_expression_type(expr_node)
         final_type = declared_type or evaluated_type
         self.symbol_table.add(name, final_type, is_mutable=True)
@@ -364,48 +620,44 @@ class SemanticAnalyzer:
     # ============================================================================
     def visit_assign(self, node):
         # AST: ('assign', var_name, operator, expr_node, line_no)
-        _assign, var_name, _op, expr_node, line_no = node
+        var_name, expr_node, line_no = node.target, node.value, node.line
         
         # Visitar la expresión para análisis de operaciones
-        self.visit(expr_node)
+        yield expr_node
 
-        symbol, scope_idx = self.symbol_table.lookup(var_name)
+        symbol, scope_level = self.symbol_table.lookup(var_name)
         
         # REGLA 1 (Validación de Existencia - vicbguti29)
         if not symbol:
-            error_msg = f"Error Semántico (Línea {line_no}): Identificador no encontrado. La variable '{var_name}' no ha sido declarada en este alcance."
-            self.errors.append(error_msg)
+            self.report('undeclared-variable', line_no, name=var_name)
             return
 
         # REGLA 2 (Alcance Local - vicbguti29)
         # Validar que la variable fue declarada en el scope actual o en un scope superior
         current_scope_level = len(self.symbol_table.scope_stack) - 1
-        var_scope_level = symbol['scope_level']
+        var_scope_level = symbol.scope_level
         
         # Si la variable se declaró en un scope más interno que el actual, no es accesible
         if var_scope_level > current_scope_level:
-            error_msg = f"Error Semántico (Línea {line_no}): El identificador '{var_name}' no es accesible. Fue definido en un alcance interno que ya finalizó."
-            self.errors.append(error_msg)
+            self.report('out-of-scope', line_no, name=var_name)
             return
 
         # REGLA 5 (Validación de Mutabilidad - Alvascon)
-        if not symbol['is_mutable']:
-            error_msg = f"Error Semántico (Línea {line_no}): No se puede asignar a la variable inmutable '{var_name}'. Las variables deben ser declaradas con 'mut' para poder ser reasignadas."
-            self.errors.append(error_msg)
+        if not symbol.is_mutable:
+            self.report('immutable-assign', line_no, name=var_name)
             # No retornamos aquí para poder detectar también el error de tipo si existe.
         
         # REGLA 4 (Discrepancia de Tipos en Reasignación - Alvascon)
         new_type = self.get_expression_type(expr_node, line_no)
         
-        if new_type != 'unknown' and symbol['type'] != new_type:
-            error_msg = f"Error Semántico (Línea {line_no}): Discrepancia de tipos en la reasignación. La variable '{var_name}' tiene el tipo '{symbol['type']}', pero se intentó asignar un valor de tipo '{new_type}'."
-            self.errors.append(error_msg)
+        if new_type is not UNKNOWN and symbol.type is not new_type:
+            self.report('assign-type-mismatch', line_no, name=var_name, expected=symbol.type, found=new_type)
 
         # Si la asignación es válida (sin errores hasta ahora), marcamos la variable como inicializada.
         # Esta es una simplificación; una implementación más robusta comprobaría si se añadieron errores
         # *en esta función específica* antes de actualizar el estado.
         if symbol: # Asegurarse de que el símbolo existe antes de intentar actualizarlo
-            self.symbol_table.scopes[scope_idx][var_name]['is_initialized'] = True
+            self.symbol_table.mark_initialized(var_name, scope_level)
 
     # ============================================================================
     # REGLA 6: COMPATIBILIDAD DE TIPOS EN OPERACIONES ARITMÉTICAS
@@ -413,28 +665,23 @@ class SemanticAnalyzer:
     # ============================================================================
     def visit_binop(self, node):
         # AST: ('binop', left_expr, operator, right_expr, line_no)
-        _binop, left_expr, operator, right_expr, line_no = node
+        left_expr, operator, right_expr, line_no = node.left, node.op, node.right, node.line
         
         left_type = self.get_expression_type(left_expr, line_no)
         right_type = self.get_expression_type(right_expr, line_no)
         
         # Ambos deben ser numéricos
-        numeric_types = {'i32', 'i64', 'u32', 'u64', 'f32', 'f64'}
-        
-        if left_type not in numeric_types and left_type != 'unknown':
-            error_msg = f"Error Semántico (Línea {line_no}): Operador aritmético '{operator}' no puede aplicarse a tipo '{left_type}'. Se esperaba un tipo numérico."
-            self.errors.append(error_msg)
+        if left_type not in NUMERIC_TYPES and left_type is not UNKNOWN:
+            self.report('arithmetic-operand', line_no, op=operator, found=left_type)
             return
         
-        if right_type not in numeric_types and right_type != 'unknown':
-            error_msg = f"Error Semántico (Línea {line_no}): Operador aritmético '{operator}' no puede aplicarse a tipo '{right_type}'. Se esperaba un tipo numérico."
-            self.errors.append(error_msg)
+        if right_type not in NUMERIC_TYPES and right_type is not UNKNOWN:
+            self.report('arithmetic-operand', line_no, op=operator, found=right_type)
             return
         
         # Los tipos deben coincidir
-        if left_type != 'unknown' and right_type != 'unknown' and left_type != right_type:
-            error_msg = f"Error Semántico (Línea {line_no}): Operador aritmético '{operator}' no puede aplicarse a tipos '{left_type}' y '{right_type}'. No existe una implementación para esta operación."
-            self.errors.append(error_msg)
+        if left_type is not UNKNOWN and right_type is not UNKNOWN and left_type is not right_type:
+            self.report('arithmetic-mismatch', line_no, op=operator, left=left_type, right=right_type)
 
     # ============================================================================
     # REGLA 7: RESTRICCIÓN DE TIPO EN OPERADORES LÓGICOS
@@ -442,43 +689,36 @@ class SemanticAnalyzer:
     # ============================================================================
     def visit_and(self, node):
         # AST: ('and', left_expr, right_expr)
-        _and, left_expr, right_expr = node
+        left_expr, right_expr = node.left, node.right
         
         left_type = self.get_expression_type(left_expr)
         right_type = self.get_expression_type(right_expr)
         
-        if left_type != 'bool' and left_type != 'unknown':
-            error_msg = f"Error Semántico: Operador lógico '&&' no puede aplicarse al tipo '{left_type}'. Se esperaba 'bool'."
-            self.errors.append(error_msg)
+        if left_type is not BOOL and left_type is not UNKNOWN:
+            self.report('logical-operand', op='&&', found=left_type)
         
-        if right_type != 'bool' and right_type != 'unknown':
-            error_msg = f"Error Semántico: Operador lógico '&&' no puede aplicarse al tipo '{right_type}'. Se esperaba 'bool'."
-            self.errors.append(error_msg)
+        if right_type is not BOOL and right_type is not UNKNOWN:
+            self.report('logical-operand', op='&&', found=right_type)
 
     def visit_or(self, node):
         # AST: ('or', left_expr, right_expr)
-        _or, left_expr, right_expr = node
+        left_expr, right_expr = node.left, node.right
         
         left_type = self.get_expression_type(left_expr)
         right_type = self.get_expression_type(right_expr)
         
-        if left_type != 'bool' and left_type != 'unknown':
-            error_msg = f"Error Semántico: Operador lógico '||' no puede aplicarse al tipo '{left_type}'. Se esperaba 'bool'."
-            self.errors.append(error_msg)
+        if left_type is not BOOL and left_type is not UNKNOWN:
+            self.report('logical-operand', op='||', found=left_type)
         
-        if right_type != 'bool' and right_type != 'unknown':
-            error_msg = f"Error Semántico: Operador lógico '||' no puede aplicarse al tipo '{right_type}'. Se esperaba 'bool'."
-            self.errors.append(error_msg)
+        if right_type is not BOOL and right_type is not UNKNOWN:
+            self.report('logical-operand', op='||', found=right_type)
 
     def visit_not(self, node):
         # AST: ('not', expr)
-        _not, expr = node
-        
-        expr_type = self.get_expression_type(expr)
+        expr_type = self.get_expression_type(node.operand)
         
-        if expr_type != 'bool' and expr_type != 'unknown':
-            error_msg = f"Error Semántico: Operador lógico '!' no puede aplicarse al tipo '{expr_type}'. Se esperaba 'bool'."
-            self.errors.append(error_msg)
+        if expr_type is not BOOL and expr_type is not UNKNOWN:
+            self.report('logical-operand', op='!', found=expr_type)
 
     # ============================================================================
     # VERIFICACIÓN DE FLUJO DE CONTROL
@@ -487,119 +727,109 @@ class SemanticAnalyzer:
     # ============================================================================
     def visit_while_loop(self, node):
         # AST: ('while_loop', condition, body)
-        _while, _condition, body = node
+        body = node.body
         
         old_in_loop = self.in_loop
         self.in_loop = True
         
         for stmt in body:
-            self.visit(stmt)
+            yield stmt
         
         self.in_loop = old_in_loop
 
     def visit_for_loop(self, node):
         # AST: ('for_loop', var, range_expr, body)
-        _for, _var, _range_expr, body = node
+        body = node.body
         
         old_in_loop = self.in_loop
         self.in_loop = True
         
         for stmt in body:
-            self.visit(stmt)
+            yield stmt
         
         self.in_loop = old_in_loop
 
     def visit_infinite_loop(self, node):
         # AST: ('infinite_loop', body)
-        _loop, body = node
+        body = node.body
         
         old_in_loop = self.in_loop
         self.in_loop = True
         
         for stmt in body:
-            self.visit(stmt)
+            yield stmt
         
         self.in_loop = old_in_loop
 
     def visit_break_stmt(self, node):
         # AST: ('break_stmt',)
         if not self.in_loop:
-            error_msg = "Error Semántico: 'break' solo puede usarse dentro de un bucle (while, for, loop)."
-            self.errors.append(error_msg)
+            self.report('break-outside-loop')
 
     def visit_continue_stmt(self, node):
         # AST: ('continue_stmt',)
         if not self.in_loop:
-            error_msg = "Error Semántico: 'continue' solo puede usarse dentro de un bucle (while, for, loop)."
-            self.errors.append(error_msg)
+            self.report('continue-outside-loop')
 
     def visit_return_stmt(self, node):
         # AST: ('return_stmt', expr_or_none)
         if not self.in_function:
-            error_msg = "Error Semántico: 'return' solo puede usarse dentro de una función."
-            self.errors.append(error_msg)
+            self.report('return-outside-function')
 
     def visit_if(self, node):
         # AST: ('if', condition, body)
-        _if, _condition, body = node
+        body = node.body
         
         self.enter_scope()
         for stmt in body:
-            self.visit(stmt)
+            yield stmt
         self.exit_scope()
 
     def visit_if_else(self, node):
         # AST: ('if_else', condition, if_body, else_body)
-        _if_else, _condition, if_body, else_body = node
+        if_body, else_body = node.then_body, node.else_body
         
         self.enter_scope()
         for stmt in if_body:
-            self.visit(stmt)
+            yield stmt
         self.exit_scope()
         
         self.enter_scope()
         for stmt in else_body:
-            self.visit(stmt)
+            yield stmt
         self.exit_scope()
 
     def visit_closure(self, node):
         # AST: ('closure', params, return_type, body)
-        _closure, params, return_type, body = node
-        
         self.symbol_table.enter_scope()
         
-        for param in params:
-            param_name = param[1]
+        for param in node.params:
+            param_name = param.name
             # HACK: Assume i32 for untyped params
-            param_type = param[2] if param[2] else 'i32'
+            param_type = self.types.named(param.param_type) if param.param_type else I32
             self.symbol_table.add(param_name, param_type, is_mutable=False, is_initialized=True)
 
         # Now, with params in scope, visit the body
-        self.visit(body)
+        yield node.body
         
         self.symbol_table.exit_scope()
 
     def visit_comparison(self, node):
         # AST: ('comparison', left_expr, operator, right_expr)
         # Procesar normalmente, comparaciones pueden ser de cualquier tipo que soporte el operador
-        _comparison, left_expr, _operator, right_expr = node
-        self.visit(left_expr)
-        self.visit(right_expr)
+        yield node.left
+        yield node.right
 
     def visit_range(self, node):
         # AST: ('range', start, end)
         # Verificar que inicio y fin sean numéricos
-        _range, start, end = node
-        start_type = self.get_expression_type(start)
-        end_type = self.get_expression_type(end)
+        start_type = self.get_expression_type(node.low)
+        end_type = self.get_expression_type(node.high)
         
-        numeric_types = {'i32', 'i64', 'u32', 'u64', 'f32', 'f64'}
-        if start_type not in numeric_types and start_type != 'unknown':
-            error_msg = f"Error Semántico: Rango debe tener inicio numérico, se encontró '{start_type}'."
-            self.errors.append(error_msg)
-        if end_type not in numeric_types and end_type != 'unknown':
-            error_msg = f"Error Semántico: Rango debe tener fin numérico, se encontró '{end_type}'."
-            self.errors.append(error_msg)
+        if start_type not in NUMERIC_TYPES and start_type is not UNKNOWN:
+            self.report('range-start', found=start_type)
+        if end_type not in NUMERIC_TYPES and end_type is not UNKNOWN:
+            self.report('range-end', found=end_type)
 
 
 # Punto de entrada para el análisis semántico (FUNCION PRINCIPAL).
@@ -609,6 +839,49 @@ def semantic(ast):
     analyzer.visit(ast)
     return analyzer.errors
 
+# Construye el texto del reporte de análisis semántico
+def format_semantic_report(errors, source_code, developer="vicbguti29"):
+    """
+    Construye el contenido del log con los resultados del análisis semántico.
+
+    Args:
+        errors: Lista de errores semánticos encontrados
+        source_code: Código fuente analizado
+        developer: Nombre del desarrollador (default: vicbguti29)
+    """
+    lines = []
+    lines.append("=" * 80 + "\n")
+    lines.append("REPORTE DE ANÁLISIS SEMÁNTICO\n")
+    lines.append("=" * 80 + "\n")
+    lines.append("Fecha y Hora: {}".format(datetime.now().strftime('%d-%m-%Y %H:%M:%S')) + "\n")
+    lines.append(f"Desarrollador: {developer}" + "\n")
+    lines.append("=" * 80 + "\n\n")
+
+    lines.append("REGLAS SEMÁNTICAS IMPLEMENTADAS:\n")
+    lines.append("-" * 80 + "\n")
+    lines.append("1. Validación de Existencia de Identificadores (REGLA 1)\n")
+    lines.append("   - Verifica que toda variable/función sea declarada antes de usarse\n")
+    lines.append("   - Busca el identificador desde el alcance actual hasta el global\n")
+    lines.append("\n2. Alcance Local (REGLA 2)\n")
+    lines.append("   - Verifica que variables no sean accedidas fuera de su alcance\n")
+    lines.append("   - No se puede acceder a variables de alcances internos finalizados\n")
+    lines.append("-" * 80 + "\n\n")
+
+    lines.append("CÓDIGO FUENTE ANALIZADO:\n")
+    lines.append("-" * 80 + "\n")
+    lines.append(source_code)
+    lines.append("\n" + "-" * 80 + "\n\n")
+
+    if errors:
+        lines.append(f"ERRORES SEMÁNTICOS ENCONTRADOS: {len(errors)}" + "\n")
+        lines.append("-" * 80 + "\n")
+        for i, error in enumerate(errors, 1):
+            lines.append(f"\n{i}. {error}" + "\n")
+    else:
+        lines.append("ANÁLISIS SEMÁNTICO COMPLETADO SIN ERRORES" + "\n")
+    return ''.join(lines)
+
+
 # Genera archivo de log con los errores semánticos encontrados
 def log_semantic_errors(filename, errors, source_code, developer="vicbguti29"):
     """
@@ -621,32 +894,4 @@ def log_semantic_errors(filename, errors, source_code, developer="vicbguti29"):
         developer: Nombre del desarrollador (default: vicbguti29)
     """
     with open(filename, 'w', encoding='utf-8') as f:
-        f.write("=" * 80 + "\n")
-        f.write("REPORTE DE ANÁLISIS SEMÁNTICO\n")
-        f.write("=" * 80 + "\n")
-        f.write("Fecha y Hora: {}".format(datetime.now().strftime('%d-%m-%Y %H:%M:%S')) + "\n")
-        f.write(f"Desarrollador: {developer}" + "\n")
-        f.write("=" * 80 + "\n\n")
-        
-        f.write("REGLAS SEMÁNTICAS IMPLEMENTADAS:\n")
-        f.write("-" * 80 + "\n")
-        f.write("1. Validación de Existencia de Identificadores (REGLA 1)\n")
-        f.write("   - Verifica que toda variable/función sea declarada antes de usarse\n")
-        f.write("   - Busca el identificador desde el alcance actual hasta el global\n")
-        f.write("\n2. Alcance Local (REGLA 2)\n")
-        f.write("   - Verifica que variables no sean accedidas fuera de su alcance\n")
-        f.write("   - No se puede acceder a variables de alcances internos finalizados\n")
-        f.write("-" * 80 + "\n\n")
-        
-        f.write("CÓDIGO FUENTE ANALIZADO:\n")
-        f.write("-" * 80 + "\n")
-        f.write(source_code)
-        f.write("\n" + "-" * 80 + "\n\n")
-        
-        if errors:
-            f.write(f"ERRORES SEMÁNTICOS ENCONTRADOS: {len(errors)}" + "\n")
-            f.write("-" * 80 + "\n")
-            for i, error in enumerate(errors, 1):
-                f.write(f"\n{i}. {error}" + "\n")
-        else:
-            f.write("ANÁLISIS SEMÁNTICO COMPLETADO SIN ERRORES" + "\n")
\ No newline at end of file
+        f.write(format_semantic_report(errors, source_code, developer))
@@ -0,0 +1,157 @@
+# analyzer/semantic_types.py
+# Tipos del analizador semántico, internados
+#
+# Cada tipo existe una sola vez: dos tipos son iguales si y solo si son el
+# mismo objeto, así que el analizador los compara con `is` y los usa como
+# claves por identidad. El texto de un tipo ('[i32; 3]', '(i32, f64)',
+# 'Fn(i32) -> i32') es el mismo que se armaba antes con f-strings, pero se
+# arma solo cuando hace falta (al mostrar un error) y sin recursión.
+
+
+class Type:
+    """
+    Tipo del lenguaje. `kind` es 'named' (i32, bool, &str, un struct...),
+    'array', 'tuple' o 'fn', y `args` sus componentes: el nombre, (elemento,
+    tamaño), los tipos de los elementos o (parámetros, retorno).
+
+    No se crean directamente: las constantes del módulo y los métodos de
+    `TypeTable` devuelven siempre el mismo objeto para el mismo tipo.
+    """
+
+    __slots__ = ('kind', 'args', '_name')
+
+    def __init__(self, kind, args, name=None):
+        self.kind = kind
+        self.args = args
+        self._name = name
+
+    def __str__(self):
+        if self._name is None:
+            self._name = _type_name(self)
+        return self._name
+
+    def __format__(self, spec):
+        return format(str(self), spec)
+
+    def __repr__(self):
+        return f'Type({str(self)!r})'
+
+
+def _type_name(root):
+    """
+    Texto de `root`, armado con una pila explícita: el tipo de una tupla muy
+    anidada no agota la recursión.
+    """
+    parts = []
+    stack = [root]
+    while stack:
+        item = stack.pop()
+        if type(item) is str:
+            parts.append(item)
+        elif item._name is not None:
+            parts.append(item._name)
+        elif item.kind == 'array':
+            element, size = item.args
+            stack.extend((f'; {size}]', element, '['))
+        elif item.kind == 'tuple':
+            stack.append(')')
+            _push_list(stack, item.args)
+            stack.append('(')
+        else:
+            params, result = item.args
+            stack.extend((result, ') -> '))
+            _push_list(stack, params)
+            stack.append('Fn(')
+    return ''.join(parts)
+
+
+def _push_list(stack, types):
+    """Apila `types` separados por ', ' para que salgan en orden."""
+    for position in range(len(types) - 1, -1, -1):
+        stack.append(types[position])
+        if position:
+            stack.append(', ')
+
+
+# Tipos predefinidos, compartidos por todos los análisis. Los demás nombres
+# (structs, enums...) se internan en la TypeTable de cada análisis, así que
+# el código analizado no deja tipos en memoria
+BUILTIN_TYPES = {}
+
+
+def _builtin(name):
+    named = BUILTIN_TYPES[name] = Type('named', name, name)
+    return named
+
+
+def named_type(name):
+    """Tipo predefinido (i32, &str, unknown...). KeyError si no lo es."""
+    return BUILTIN_TYPES[name]
+
+
+I8, I16, I32, I64 = (_builtin(name) for name in ('i8', 'i16', 'i32', 'i64'))
+U8, U16, U32, U64 = (_builtin(name) for name in ('u8', 'u16', 'u32', 'u64'))
+F32, F64 = _builtin('f32'), _builtin('f64')
+BOOL = _builtin('bool')
+STR_REF = _builtin('&str')
+# Tipo de la tupla vacía y del array vacío
+UNIT = _builtin('()')
+EMPTY_ARRAY = _builtin('[<unknown>; 0]')
+# Resultados que no son tipos del lenguaje
+UNKNOWN = _builtin('unknown')
+UNDECLARED = _builtin('undeclared')
+UNINITIALIZED = _builtin('uninitialized')
+
+NUMERIC_TYPES = frozenset((I32, I64, U32, U64, F32, F64))
+INTEGER_TYPES = frozenset((I8, I16, I32, I64, U8, U16, U32, U64))
+
+
+class TypeTable:
+    """
+    Tipos de un análisis que no son predefinidos: los nombres del programa
+    (structs, enums...) y los compuestos (arrays, tuplas, closures). Los
+    compuestos se buscan por sus componentes, que ya están internados, así
+    que obtener un tipo ya visto no arma ningún texto. Cada análisis tiene
+    su tabla: los tipos de un programa no quedan en memoria después de
+    analizarlo.
+    """
+
+    def __init__(self):
+        # Un diccionario por clase de tipo, con el nombre o los componentes
+        # como clave
+        self._named = {}
+        self._arrays = {}
+        self._tuples = {}
+        self._fns = {}
+
+    def named(self, name):
+        """Tipo con nombre: predefinido (i32, &str...) o del programa (Punto)."""
+        interned = BUILTIN_TYPES.get(name)
+        if interned is None:
+            interned = self._named.get(name)
+            if interned is None:
+                interned = self._named[name] = Type('named', name, name)
+        return interned
+
+    def array(self, element, size):
+        key = (element, size)
+        interned = self._arrays.get(key)
+        if interned is None:
+            interned = self._arrays[key] = Type('array', key)
+        return interned
+
+    def tuple(self, elements):
+        if not elements:
+            return UNIT
+        key = tuple(elements)
+        interned = self._tuples.get(key)
+        if interned is None:
+            interned = self._tuples[key] = Type('tuple', key)
+        return interned
+
+    def fn(self, params, result):
+        key = (tuple(params), result)
+        interned = self._fns.get(key)
+        if interned is None:
+            interned = self._fns[key] = Type('fn', key)
+        return interned
@@ -0,0 +1,144 @@
+#!/usr/bin/env python
+# analyzer/tests/bench_ast_memory.py
+# Benchmark de memoria del AST sobre un programa sintético grande: nodos con
+# __slots__ frente a tuplas anidadas sin posición y a tuplas con su rango en
+# un __dict__ por instancia (la representación anterior).
+
+import os
+import sys
+import time
+import tracemalloc
+
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..'))
+sys.path.insert(0, project_root)
+
+from analyzer.ast_nodes import Node, make_node
+from analyzer.ply_parser_final import parse_source
+
+FUNCTIONS = 1_000
+ACCESSES = 1_000_000
+
+
+def generate_source(functions):
+    """N funciones con aritmética, condiciones y bucles."""
+    parts = []
+    for i in range(functions):
+        parts.append(
+            f"fn calculo{i}(n: i32) -> i32 {{\n"
+            f"    let mut total = 0;\n"
+            f"    let limite = n * {i} + 1;\n"
+            f"    while total < limite && total >= 0 {{\n"
+            f"        total = total + (n - {i}) * 2;\n"
+            f"    }}\n"
+            f"    if total > 10 || n == 0 {{ return total; }}\n"
+            f"    return limite;\n"
+            f"}}\n"
+        )
+    return "".join(parts)
+
+
+class SpannedTuple(tuple):
+    """Tupla con start/end como atributos (en un __dict__ por instancia)."""
+
+
+def to_tuples(node, spanned=False):
+    """Copia del AST como tuplas anidadas (con o sin rango)."""
+    if isinstance(node, Node):
+        fields = tuple(to_tuples(child, spanned) for child in node)
+        if not spanned:
+            return fields
+        copy = SpannedTuple(fields)
+        copy.start, copy.end = node.start, node.end
+        return copy
+    if isinstance(node, list):
+        return [to_tuples(child, spanned) for child in node]
+    return node
+
+
+def to_nodes(node):
+    """Copia del AST como nodos con __slots__."""
+    if isinstance(node, Node):
+        return make_node(tuple(to_nodes(child) for child in node), node.start, node.end)
+    if isinstance(node, list):
+        return [to_nodes(child) for child in node]
+    return node
+
+
+def count_nodes(node):
+    if isinstance(node, (Node, tuple)):
+        return 1 + sum(count_nodes(child) for child in node[1:])
+    if isinstance(node, list):
+        return sum(count_nodes(child) for child in node)
+    return 0
+
+
+def walk(node):
+    if isinstance(node, (Node, tuple)):
+        yield node
+        for child in node[1:]:
+            yield from walk(child)
+    elif isinstance(node, list):
+        for child in node:
+            yield from walk(child)
+
+
+def measure(build):
+    """Bytes retenidos por el resultado de `build()`."""
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    result = build()
+    retained = tracemalloc.get_traced_memory()[0] - before
+    tracemalloc.stop()
+    return result, retained
+
+
+def main():
+    source = generate_source(FUNCTIONS)
+    ast, errors = parse_source(source)
+    assert not errors, errors[:3]
+    nodes = count_nodes(ast)
+
+    print("=" * 80)
+    print("BENCHMARK DE MEMORIA DEL AST")
+    print(f"{source.count(chr(10))} líneas, {nodes} nodos")
+    print("=" * 80)
+
+    # Las tres representaciones se miden copiando el mismo AST, así todas
+    # incluyen solo la estructura (los strings y enteros se comparten)
+    print(f"{'representación':<26} | {'bytes':>12} | {'bytes/nodo':>10}")
+    print("-" * 80)
+    for name, build in (
+        ("tuplas (sin posición)", lambda: to_tuples(ast)),
+        ("tuplas + rango (__dict__)", lambda: to_tuples(ast, spanned=True)),
+        ("nodos con __slots__", lambda: to_nodes(ast)),
+    ):
+        copy, retained = measure(build)
+        assert copy == ast
+        print(f"{name:<26} | {retained:>12} | {retained / nodes:>10.1f}")
+
+    binop = next(node for node in walk(ast) if node[0] == 'binop')
+    as_tuple = tuple(binop)
+    start = time.perf_counter()
+    for _ in range(ACCESSES):
+        binop[3]
+    index_time = time.perf_counter() - start
+    start = time.perf_counter()
+    for _ in range(ACCESSES):
+        binop.right
+    field_time = time.perf_counter() - start
+    start = time.perf_counter()
+    for _ in range(ACCESSES):
+        as_tuple[3]
+    tuple_time = time.perf_counter() - start
+
+    print()
+    print(f"{'acceso':<26} | {'ns/acceso':>10}")
+    print("-" * 80)
+    print(f"{'tupla[3]':<26} | {tuple_time / ACCESSES * 1e9:>10.1f}")
+    print(f"{'nodo.right':<26} | {field_time / ACCESSES * 1e9:>10.1f}")
+    print(f"{'nodo[3] (compat.)':<26} | {index_time / ACCESSES * 1e9:>10.1f}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
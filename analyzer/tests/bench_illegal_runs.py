@@ -0,0 +1,64 @@
+#!/usr/bin/env python
+# analyzer/tests/bench_illegal_runs.py
+# Benchmark del lexeo de texto que no es Rust: tokens y tiempo con las rachas
+# de caracteres ilegales agrupadas en un token ERROR, comparado con el
+# manejo anterior de un token ERROR por carácter.
+
+import os
+import sys
+import time
+
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..'))
+sys.path.insert(0, project_root)
+
+from analyzer.ply_lexer import lexer, token_literal, tokenize_source
+
+
+def per_char_error(t):
+    """Manejo anterior: un token ERROR por carácter ilegal."""
+    t.type = "ERROR"
+    t.value = t.value[0]
+    t.literal = f"Illegal character '{t.value[0]}'"
+    t.lexer.skip(1)
+    return t
+
+
+def per_char_lexer():
+    per_char = lexer.clone()
+    per_char.lexerrorf = per_char_error
+    return per_char
+
+
+def generate_junk(size):
+    """Texto pegado que no es Rust: rachas ilegales entre palabras."""
+    chunk = "@@@@$$$$####~~~~ abc ¿¿¿¿¿¿ \x00\x01\x02\x03\n"
+    return (chunk * (size // len(chunk) + 1))[:size]
+
+
+def measure(label, lexer_instance, source):
+    start = time.perf_counter()
+    tokens = tokenize_source(source, lexer_instance)
+    # Lo que hace después la API con cada token: su literal (el mensaje)
+    errors = [token_literal(type_name, value) for type_name, value in
+              zip(tokens.iter_types(), tokens.iter_values()) if type_name == "ERROR"]
+    elapsed = time.perf_counter() - start
+    print(f"{label:28} | {len(tokens):>9} tokens | {len(errors):>9} errores | {elapsed:>8.3f} s")
+    return elapsed
+
+
+def main():
+    size = int(sys.argv[1]) if len(sys.argv) > 1 else 1 << 20
+    source = generate_junk(size)
+
+    print("=" * 80)
+    print(f"BENCHMARK DE CARACTERES ILEGALES ({size} caracteres)")
+    print("=" * 80)
+
+    before = measure("un token por carácter", per_char_lexer(), source)
+    after = measure("un token por racha", lexer.clone(), source)
+    print(f"Mejora: {before / after:.1f}x")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,70 @@
+#!/usr/bin/env python
+# analyzer/tests/bench_incremental.py
+# Benchmark del re-análisis incremental: latencia por edición sobre un archivo
+# de ~20k líneas, comparada con volver a analizar todo el archivo.
+
+import os
+import sys
+import time
+
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..'))
+sys.path.insert(0, project_root)
+
+from analyzer.incremental import IncrementalParser
+from analyzer.ply_parser_final import parse_source
+from analyzer.tests.helpers import generate_source
+
+FUNCTIONS = 2_000
+EDITS = 200
+
+
+def measure(parser, make_edit, read_ast):
+    """Aplica EDITS ediciones y devuelve la latencia media en ms."""
+    start = time.perf_counter()
+    for n in range(EDITS):
+        parser.edit(*make_edit(parser.source, n))
+        if read_ast:
+            parser.ast
+    return (time.perf_counter() - start) / EDITS * 1000
+
+
+def main():
+    source = generate_source(FUNCTIONS)
+    print("=" * 80)
+    print("BENCHMARK DE RE-ANALISIS INCREMENTAL")
+    print(f"{source.count(chr(10))} líneas, {FUNCTIONS} funciones, {EDITS} ediciones por caso")
+    print("=" * 80)
+
+    start = time.perf_counter()
+    ast, errors = parse_source(source)
+    full = (time.perf_counter() - start) * 1000
+    assert not errors, errors[:3]
+
+    parser = IncrementalParser(source)
+    middle = len(source) // 2
+
+    def change_number(text, n):
+        # Cambia un dígito en mitad del archivo (mismas líneas)
+        position = text.index("* ", middle) + 2
+        return position, position + 1, str(n % 10)
+
+    def insert_line(text, n):
+        # Agrega una sentencia (desplaza las líneas de lo que sigue)
+        position = text.index("\n", middle) + 1
+        return position, position, f"    let extra{n} = {n};\n"
+
+    print(f"{'caso':<28} | {'ms/edición':>10} | {'ms/edición + AST':>16}")
+    print("-" * 80)
+    print(f"{'análisis completo':<28} | {full:>10.2f} | {full:>16.2f}")
+    for name, make_edit in (("cambiar un número", change_number), ("insertar una línea", insert_line)):
+        latency = measure(parser, make_edit, read_ast=False)
+        with_ast = measure(parser, make_edit, read_ast=True)
+        assert parser.spans is not None and parser.reparsed == 1
+        print(f"{name:<28} | {latency:>10.2f} | {with_ast:>16.2f}")
+
+    assert parser.ast == parse_source(parser.source)[0]
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,59 @@
+#!/usr/bin/env python
+# analyzer/tests/bench_parallel_parse.py
+# Benchmark del análisis en paralelo: tiempo de análisis de un archivo de
+# varios MB en serie y repartido entre distintas cantidades de procesos.
+
+import os
+import sys
+import time
+
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..'))
+sys.path.insert(0, project_root)
+
+from analyzer.parallel import ParallelParser, split_chunks, CHUNKS_PER_WORKER
+from analyzer.ply_parser_final import ParseSession
+from analyzer.tests.helpers import generate_source
+
+FUNCTIONS = 10_000
+
+
+def timed(parse, source):
+    start = time.perf_counter()
+    ast, errors = parse(source)
+    assert not errors, errors[:3]
+    return ast, (time.perf_counter() - start) * 1000
+
+
+def main():
+    source = generate_source(FUNCTIONS)
+    cpus = os.cpu_count() or 1
+    print("=" * 80)
+    print("BENCHMARK DEL ANÁLISIS EN PARALELO")
+    print(f"{len(source) / 1e6:.1f} MB, {source.count(chr(10))} líneas, "
+          f"{FUNCTIONS} funciones, {cpus} núcleos")
+    print("=" * 80)
+
+    start = time.perf_counter()
+    split_chunks(source, cpus * CHUNKS_PER_WORKER)
+    print(f"Pre-escaneo: {(time.perf_counter() - start) * 1000:.1f} ms")
+
+    serial_ast, serial = timed(ParseSession().parse, source)
+    print(f"{'procesos':>8} | {'trozos':>6} | {'tiempo (ms)':>12} | {'aceleración':>11}")
+    print("-" * 80)
+    print(f"{'serie':>8} | {1:>6} | {serial:>12.1f} | {1:>10.2f}x")
+
+    for workers in sorted({2, 4, cpus}):
+        with ParallelParser(workers=workers, min_bytes=0) as parser:
+            # El arranque del pool no se mide: se reutiliza entre análisis
+            parser.start()
+            ast, elapsed = timed(parser.parse, source)
+            assert ast == serial_ast
+            print(f"{workers:>8} | {parser.chunks:>6} | {elapsed:>12.1f} | {serial / elapsed:>10.2f}x")
+    print("-" * 80)
+    if cpus < 2:
+        print("Solo hay un núcleo: el paralelismo no puede acelerar el análisis aquí.")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,70 @@
+#!/usr/bin/env python
+# analyzer/tests/bench_parse_cache.py
+# Benchmark de la caché de análisis por item: tiempo de análisis de versiones
+# sucesivas de un archivo grande en las que cambian pocos items.
+
+import os
+import sys
+import time
+
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..'))
+sys.path.insert(0, project_root)
+
+from analyzer.parse_cache import ItemParseCache
+from analyzer.ply_parser_final import ParseSession
+from analyzer.tests.helpers import generate_source
+
+FUNCTIONS = 2_000
+VERSIONS = 5
+
+
+def versions(source):
+    """Versiones sucesivas: cambia una función y se agregan líneas al inicio."""
+    for n in range(VERSIONS):
+        position = source.index(f"fn calculo{n * 300}(")
+        source = source[:position] + source[position:].replace(" + 1;", " + 2;", 1)
+        yield f"// versión {n}\n" + source
+
+
+def timed_parse(parse, tokens):
+    start = time.perf_counter()
+    ast, errors = parse(tokens)
+    assert not errors, errors[:3]
+    return ast, (time.perf_counter() - start) * 1000
+
+
+def main():
+    source = generate_source(FUNCTIONS)
+    print("=" * 80)
+    print("BENCHMARK DE LA CACHÉ DE ANÁLISIS POR ITEM")
+    print(f"{source.count(chr(10))} líneas, {FUNCTIONS} funciones, {VERSIONS} versiones")
+    print("=" * 80)
+    print(f"{'versión':>8} | {'sin caché (ms)':>14} | {'con caché (ms)':>14} | {'aciertos':>8} | {'tasa':>6}")
+    print("-" * 80)
+
+    session = ParseSession()
+    cache = ItemParseCache()
+    tokens = session.tokenize(source)
+    full_ast, full = timed_parse(session.parse_tokens, tokens)
+    cached_ast, cached = timed_parse(lambda t: cache.parse_tokens(t, session), tokens)
+    assert cached_ast == full_ast
+    print(f"{'inicial':>8} | {full:>14.1f} | {cached:>14.1f} | {cache.hits:>8} | {cache.stats()['hit_rate']:>6.1%}")
+
+    for n, text in enumerate(versions(source), 1):
+        tokens = session.tokenize(text)
+        hits = cache.hits
+        full_ast, full = timed_parse(session.parse_tokens, tokens)
+        cached_ast, cached = timed_parse(lambda t: cache.parse_tokens(t, session), tokens)
+        assert cached_ast == full_ast
+        print(f"{n:>8} | {full:>14.1f} | {cached:>14.1f} | {cache.hits - hits:>8} | "
+              f"{cache.stats()['hit_rate']:>6.1%}")
+
+    stats = cache.stats()
+    print("-" * 80)
+    print(f"Entradas: {stats['entries']}, memoria estimada: {stats['bytes'] / 1e6:.1f} MB "
+          f"de {stats['max_bytes'] / 1e6:.1f} MB, expulsiones: {stats['evictions']}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
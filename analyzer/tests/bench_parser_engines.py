@@ -0,0 +1,71 @@
+#!/usr/bin/env python
+# analyzer/tests/bench_parser_engines.py
+# Compara el rendimiento de los motores de análisis 'lalr' (tablas PLY) y
+# 'rd' (descenso recursivo + Pratt) sobre los mismos tokens.
+
+import os
+import sys
+import time
+
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..'))
+sys.path.insert(0, project_root)
+
+from analyzer.ply_lexer import tokenize_source
+from analyzer.ply_parser_final import ParseSession
+
+REPEATS = 3
+
+
+def generate_source(functions):
+    """Funciones con expresiones aritméticas, lógicas y llamadas anidadas."""
+    chunks = []
+    for i in range(functions):
+        chunks.append(
+            f"fn calculo{i}(a: i32, b: i32) -> i32 {{\n"
+            f"    let mut x = (a + b) * 2 - a % 3 / (b + 1);\n"
+            f"    let ok = x >= 10 && !(a == b) || b < 3;\n"
+            f"    while x > 0 && ok {{\n"
+            f"        x -= a * b + 1;\n"
+            f"    }}\n"
+            f"    let v = [a, b, a + b];\n"
+            f"    let s = String::from(\"{i}\");\n"
+            f"    println!(\"{{}} {{}}\", x, s.len());\n"
+            f"    return suma(x, a * (b - 1), v.len());\n"
+            f"}}\n"
+        )
+    return "".join(chunks)
+
+
+def best_time(session, tokens):
+    best = None
+    for _ in range(REPEATS):
+        start = time.perf_counter()
+        ast, errors = session.parse_tokens(tokens)
+        elapsed = time.perf_counter() - start
+        assert not errors, errors[:3]
+        best = elapsed if best is None else min(best, elapsed)
+    return best, ast
+
+
+def main():
+    print("=" * 80)
+    print("BENCHMARK DE MOTORES DE ANÁLISIS (LALR vs DESCENSO RECURSIVO)")
+    print("=" * 80)
+    print(f"{'funciones':>10} | {'tokens':>8} | {'lalr (s)':>9} | {'rd (s)':>9} | "
+          f"{'lalr tok/s':>11} | {'rd tok/s':>11} | {'aceleración':>11}")
+    print("-" * 80)
+
+    sessions = {engine: ParseSession(engine=engine) for engine in ('lalr', 'rd')}
+    for functions in (100, 1_000, 5_000):
+        tokens = tokenize_source(generate_source(functions))
+        lalr_time, lalr_ast = best_time(sessions['lalr'], tokens)
+        rd_time, rd_ast = best_time(sessions['rd'], tokens)
+        assert rd_ast == lalr_ast
+        print(f"{functions:>10} | {len(tokens):>8} | {lalr_time:>9.3f} | {rd_time:>9.3f} | "
+              f"{len(tokens) / lalr_time:>11,.0f} | {len(tokens) / rd_time:>11,.0f} | "
+              f"{lalr_time / rd_time:>10.1f}x")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,45 @@
+#!/usr/bin/env python
+# analyzer/tests/bench_parser_scaling.py
+# Benchmark de escalado del parser: el tiempo por sentencia debe mantenerse
+# constante (crecimiento lineal) al pasar de 1k a 100k sentencias.
+
+import os
+import sys
+import time
+
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..'))
+sys.path.insert(0, project_root)
+
+from analyzer.ply_parser_final import parse_source
+
+SIZES = (1_000, 10_000, 100_000)
+
+
+def generate_source(statements):
+    """Una función con N sentencias y una llamada con N argumentos."""
+    body = "\n".join(f"    let x{i} = {i} + 1;" for i in range(statements))
+    args = ", ".join(str(i) for i in range(statements))
+    return f"fn main() {{\n{body}\n    let r = imprimir({args});\n}}\n"
+
+
+def main():
+    print("=" * 80)
+    print("BENCHMARK DE ESCALADO DEL PARSER")
+    print("=" * 80)
+    print(f"{'sentencias':>12} | {'tiempo (s)':>10} | {'µs/sentencia':>12}")
+    print("-" * 80)
+
+    for size in SIZES:
+        source = generate_source(size)
+        start = time.perf_counter()
+        ast, errors = parse_source(source)
+        elapsed = time.perf_counter() - start
+
+        assert not errors, errors[:3]
+        assert len(ast[1][0][4]) == size + 1
+        print(f"{size:>12} | {elapsed:>10.3f} | {elapsed / size * 1e6:>12.2f}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
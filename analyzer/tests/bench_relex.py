@@ -0,0 +1,100 @@
+#!/usr/bin/env python
+# analyzer/tests/bench_relex.py
+# Benchmark de la re-tokenización incremental: costo por edición de
+# relex_edit en archivos de distinto tamaño. Si el costo no depende del
+# archivo, las columnas de cada caso quedan parejas al crecer el tamaño; lo
+# único que crece es la copia del texto (un str no se edita en el lugar),
+# que se muestra aparte como referencia.
+
+import os
+import random
+import sys
+import time
+
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..'))
+sys.path.insert(0, project_root)
+
+from analyzer.ply_lexer import relex_edit, tokenize_source
+from analyzer.tests.helpers import generate_source
+
+SIZES = (200, 2_000, 20_000)  # funciones de 10 líneas
+EDITS = 300
+
+
+def measure(buffer, make_edit):
+    """Aplica EDITS ediciones sobre `buffer` y devuelve la latencia media en ms."""
+    start = time.perf_counter()
+    for n in range(EDITS):
+        relex_edit(buffer, *make_edit(buffer.source, n))
+    return (time.perf_counter() - start) / EDITS * 1000
+
+
+def change_digit(text, n):
+    # Escribir sobre un dígito a la mitad del archivo (mismo largo)
+    position = text.index("* ", len(text) // 2) + 2
+    return position, position + 1, str(n % 10)
+
+
+def type_at_middle(text, n):
+    # Teclear una sentencia carácter por carácter a la mitad del archivo
+    position = text.index("\n", len(text) // 2) + 1 + n % 12
+    return position, position, "let y = 2;\n"[n % 11]
+
+
+def insert_at_start(text, n):
+    # Agregar una línea al principio (desplaza todo el resto)
+    return 0, 0, f"const C{n}: i32 = {n};\n"
+
+
+def random_positions(text, n, rng=random.Random(0)):
+    # Una línea nueva en un lugar distinto cada vez
+    position = text.index("\n", rng.randrange(len(text) - 1)) + 1
+    return position, position, f"    let r{n} = {n};\n"
+
+
+CASES = (
+    ("mismo largo", change_digit),
+    ("teclear a la mitad", type_at_middle),
+    ("línea al principio", insert_at_start),
+    ("línea en lugar al azar", random_positions),
+)
+
+
+def main():
+    print("=" * 80)
+    print("BENCHMARK DE RE-TOKENIZACION INCREMENTAL (relex_edit)")
+    print(f"{EDITS} ediciones por caso, sin leer el buffer entre ediciones")
+    print("=" * 80)
+    header = f"{'caso':<24}" + "".join(f" | {f'{size * 10} líneas':>14}" for size in SIZES)
+    print(header)
+    print("-" * len(header))
+
+    sources = [generate_source(size) for size in SIZES]
+    row = []
+    for source in sources:
+        start = time.perf_counter()
+        tokenize_source(source)
+        row.append((time.perf_counter() - start) * 1000)
+    print(f"{'tokenize_source completo':<24}" + "".join(f" | {ms:>11.2f} ms" for ms in row))
+
+    row = []
+    for source in sources:
+        middle = len(source) // 2
+        start = time.perf_counter()
+        for _ in range(EDITS):
+            source[:middle] + "x" + source[middle + 1:]
+        row.append((time.perf_counter() - start) / EDITS * 1000)
+    print(f"{'(copia del texto)':<24}" + "".join(f" | {ms:>11.3f} ms" for ms in row))
+
+    for name, make_edit in CASES:
+        row = []
+        for source in sources:
+            buffer = tokenize_source(source)
+            row.append(measure(buffer, make_edit))
+            assert buffer == tokenize_source(buffer.source)
+        print(f"{name:<24}" + "".join(f" | {ms:>11.3f} ms" for ms in row))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
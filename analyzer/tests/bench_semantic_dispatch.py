@@ -0,0 +1,108 @@
+#!/usr/bin/env python
+# analyzer/tests/bench_semantic_dispatch.py
+# Micro-benchmark del despacho del analizador semántico: costo por nodo
+# visitado con la tabla de despacho frente al getattr por nodo anterior.
+
+import os
+import sys
+import time
+
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..'))
+sys.path.insert(0, project_root)
+
+from analyzer.ply_parser_final import parse_source
+from analyzer.semantic_analyzer import SemanticAnalyzer
+
+FUNCTIONS = 2_000
+REPEAT = 5
+
+
+def generate_source(functions):
+    """
+    Funciones con llamadas, arrays y tuplas anidadas: casi todos sus nodos
+    no tienen regla y pasan por generic_visit, así que domina el despacho.
+    """
+    parts = []
+    for i in range(functions):
+        parts.append(
+            f"fn funcion{i}() {{\n"
+            f"    println!(\"{{}}\", g({i}, h(2, 3), [4, 5, 6]), (7, k(8)));\n"
+            f"    while 1 < 2 {{\n"
+            f"        println!(\"{{}}\", m(n(1), [2, 3]), o(p(q(4))));\n"
+            f"    }}\n"
+            f"}}\n"
+        )
+    return "".join(parts)
+
+
+class GetattrLookup:
+    """Despacho anterior: arma 'visit_<tipo>' y llama a getattr en cada nodo."""
+
+    def __init__(self, analyzer):
+        self.analyzer = analyzer
+
+    def __getitem__(self, kind):
+        return getattr(self.analyzer, f'visit_{kind}', self.analyzer.generic_visit).__func__
+
+
+class GetattrAnalyzer(SemanticAnalyzer):
+    """Despacho con getattr por nodo y recorrido de hijos con isinstance."""
+
+    def __init__(self):
+        super().__init__()
+        self._handlers = GetattrLookup(self)
+
+    def generic_visit(self, node):
+        return self._scan_children(node)
+
+
+def count_visits(cls, ast):
+    analyzer = cls()
+    handlers = analyzer._handlers
+    counter = [0]
+
+    class Counting:
+        def __getitem__(self, kind):
+            counter[0] += 1
+            return handlers[kind]
+
+    analyzer._handlers = Counting()
+    analyzer.visit(ast)
+    return counter[0]
+
+
+def best_time(cls, ast):
+    times = []
+    for _ in range(REPEAT):
+        analyzer = cls()
+        start = time.perf_counter()
+        analyzer.visit(ast)
+        times.append(time.perf_counter() - start)
+    return min(times), analyzer.errors
+
+
+def main():
+    ast, errors = parse_source(generate_source(FUNCTIONS))
+    assert not errors
+    visits = count_visits(SemanticAnalyzer, ast)
+    assert visits == count_visits(GetattrAnalyzer, ast)
+    print("=" * 80)
+    print("MICRO-BENCHMARK DEL DESPACHO DEL ANALIZADOR SEMÁNTICO")
+    print(f"{FUNCTIONS} funciones, {visits} nodos visitados, mejor de {REPEAT}")
+    print("=" * 80)
+    print(f"{'despacho':>22} | {'total (ms)':>10} | {'ns/nodo':>8}")
+    print("-" * 80)
+    results = {}
+    for name, cls in (("getattr por nodo", GetattrAnalyzer), ("tabla por clase", SemanticAnalyzer)):
+        elapsed, analyzer_errors = best_time(cls, ast)
+        results[name] = (elapsed, analyzer_errors)
+        print(f"{name:>22} | {elapsed * 1000:>10.1f} | {elapsed / visits * 1e9:>8.0f}")
+    print("-" * 80)
+    (old, old_errors), (new, new_errors) = results.values()
+    assert old_errors == new_errors
+    print(f"Aceleración: {old / new:.2f}x")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,90 @@
+#!/usr/bin/env python
+# analyzer/tests/bench_semantic_types.py
+# Micro-benchmark de los tipos internados del analizador semántico: tipar
+# tuplas y arrays anidados armando el texto del tipo en cada nivel (como
+# antes) frente a buscar el tipo ya internado por sus componentes.
+
+import os
+import sys
+import time
+
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..'))
+sys.path.insert(0, project_root)
+
+from analyzer.ply_parser_final import parse_source
+from analyzer.semantic_analyzer import SemanticAnalyzer
+
+STATEMENTS = 200
+REPEAT = 5
+
+
+def nested_value(depth):
+    """Tupla y array anidados `depth` niveles: ([(1, 2.5)...; 2], true)."""
+    value = "(1, 2.5)"
+    for _ in range(depth):
+        value = f"([{value}, {value}], true)"
+    return value
+
+
+def generate_source(statements, depth):
+    """Declaraciones y reasignaciones de valores anidados `depth` niveles."""
+    value = nested_value(depth)
+    parts = [f"fn main() {{\n    let mut t = {value};\n"]
+    for i in range(statements):
+        if i % 2:
+            parts.append(f"    t = {value};\n")
+        else:
+            parts.append(f"    let v{i}: i32 = {value};\n")
+    parts.append("}\n")
+    return "".join(parts)
+
+
+class FormattedAnalyzer(SemanticAnalyzer):
+    """Tipos compuestos como texto armado en cada consulta, sin internar."""
+
+    def _array_literal_type(self, elements, line_no):
+        first_elem_type = yield elements[0], line_no
+        return self.types.named(f'[{first_elem_type}; {len(elements)}]')
+
+    def _tuple_literal_type(self, elements, line_no):
+        elem_types = []
+        for e in elements:
+            elem_types.append(str((yield e, line_no)))
+        return self.types.named(f'({", ".join(elem_types)})')
+
+
+def best_times(classes, ast):
+    """Mejor tiempo y errores de cada clase, alternando las corridas."""
+    times = {cls: [] for cls in classes}
+    errors = {}
+    for _ in range(REPEAT):
+        for cls in classes:
+            analyzer = cls()
+            start = time.perf_counter()
+            analyzer.visit(ast)
+            times[cls].append(time.perf_counter() - start)
+            errors[cls] = analyzer.errors
+    return [(min(times[cls]), errors[cls]) for cls in classes]
+
+
+def main():
+    print("=" * 80)
+    print("MICRO-BENCHMARK DE LOS TIPOS INTERNADOS")
+    print(f"{STATEMENTS} sentencias con tuplas y arrays anidados, mejor de {REPEAT}")
+    print("=" * 80)
+    print(f"{'niveles':>7} | {'largo del tipo':>14} | {'texto en cada consulta (ms)':>27} | "
+          f"{'internados (ms)':>15} | {'acel.':>6}")
+    print("-" * 80)
+    for depth in (1, 4, 8):
+        ast, errors = parse_source(generate_source(STATEMENTS, depth))
+        assert not errors
+        (old, old_errors), (new, new_errors) = best_times((FormattedAnalyzer, SemanticAnalyzer), ast)
+        assert old_errors == new_errors
+        length = len(str(SemanticAnalyzer().get_expression_type(ast.items[0].body[0].value)))
+        print(f"{depth:>7} | {length:>14} | {old * 1000:>27.1f} | {new * 1000:>15.1f} | {old / new:>5.2f}x")
+    print("-" * 80)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
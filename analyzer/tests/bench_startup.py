@@ -0,0 +1,55 @@
+#!/usr/bin/env python
+# analyzer/tests/bench_startup.py
+# Benchmark del tiempo de import del parser: tablas LALR en frío vs. en caché
+
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..'))
+
+IMPORT_CMD = [sys.executable, '-c', 'import analyzer.ply_parser_final']
+
+
+def time_import(tables_dir, runs):
+    """Devuelve los tiempos de import (s) con el directorio de tablas indicado."""
+    env = dict(os.environ, RUST_ANALYZER_TABLES_DIR=tables_dir)
+    timings = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        subprocess.run(IMPORT_CMD, cwd=project_root, env=env, check=True)
+        timings.append(time.perf_counter() - start)
+    return timings
+
+
+def report(label, timings):
+    timings = sorted(timings)
+    mean = sum(timings) / len(timings)
+    print(f"{label:32} media={mean * 1000:8.1f} ms  min={timings[0] * 1000:8.1f} ms")
+    return mean
+
+
+def main():
+    runs = int(sys.argv[1]) if len(sys.argv) > 1 else 10
+
+    print("=" * 80)
+    print("BENCHMARK DE ARRANQUE DEL PARSER")
+    print("=" * 80)
+
+    # Frío: sin caché, las tablas LALR se generan en cada import
+    cold = report("frío (sin caché)", time_import('', runs))
+
+    with tempfile.TemporaryDirectory() as tables_dir:
+        # Primer import con caché vacía: genera y escribe el artefacto
+        report("primer import (escribe caché)", time_import(tables_dir, 1))
+        warm = report("caliente (tablas en caché)", time_import(tables_dir, runs))
+
+    print("-" * 80)
+    print(f"Aceleración del import: {cold / warm:.2f}x")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
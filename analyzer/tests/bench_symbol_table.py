@@ -0,0 +1,140 @@
+#!/usr/bin/env python
+# analyzer/tests/bench_symbol_table.py
+# Micro-benchmark de la tabla de símbolos: búsquedas a distintas
+# profundidades de anidamiento y memoria retenida tras muchos bloques, con
+# pilas por nombre frente a la lista de scopes anterior.
+
+import os
+import sys
+import time
+import tracemalloc
+
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..'))
+sys.path.insert(0, project_root)
+
+from analyzer.ply_parser_final import parse_source
+from analyzer.semantic_analyzer import SemanticAnalyzer, Symbol, SymbolTable
+
+LOOKUPS = 200_000
+BLOCKS = 5_000
+REPEAT = 5
+
+
+class ScopeListTable(SymbolTable):
+    """Tabla anterior: un diccionario por scope, nunca liberado."""
+
+    def __init__(self, types=None):
+        super().__init__(types)
+        self.scopes = [{}]
+        self.scope_stack = [0]
+        self.version = 0
+
+    def enter_scope(self):
+        self.scopes.append({})
+        self.scope_stack.append(len(self.scopes) - 1)
+
+    def exit_scope(self):
+        if len(self.scope_stack) > 1:
+            if self.scopes[self.scope_stack.pop()]:
+                self.version += 1
+
+    def add(self, name, type, is_mutable=False, is_initialized=True, line_no=None):
+        if isinstance(type, str):
+            type = self.types.named(type)
+        self.scopes[self.scope_stack[-1]][name] = Symbol(
+            type, is_mutable, is_initialized, len(self.scope_stack) - 1, line_no
+        )
+        self.version += 1
+
+    def mark_initialized(self, name, scope_idx):
+        self.scopes[scope_idx][name].is_initialized = True
+        self.version += 1
+
+    def lookup(self, name):
+        for scope_idx in reversed(self.scope_stack):
+            if name in self.scopes[scope_idx]:
+                return self.scopes[scope_idx][name], scope_idx
+        return None, None
+
+
+class ScopeListAnalyzer(SemanticAnalyzer):
+    def __init__(self):
+        super().__init__()
+        self.symbol_table = ScopeListTable(self.types)
+
+
+def lookup_time(cls, depth):
+    """Busca una variable global desde `depth` scopes anidados."""
+    table = cls()
+    table.add('global', 'i32')
+    for level in range(depth):
+        table.enter_scope()
+        table.add(f'local{level}', 'i32')
+    lookup = table.lookup
+    times = []
+    for _ in range(REPEAT):
+        start = time.perf_counter()
+        for _ in range(LOOKUPS):
+            lookup('global')
+        times.append(time.perf_counter() - start)
+    return min(times)
+
+
+def generate_blocks(blocks):
+    """Una función con `blocks` bloques consecutivos, cada uno con sus variables."""
+    parts = ["fn main() {\n    let mut total = 0;\n"]
+    for i in range(blocks):
+        parts.append(f"    if total > {i} {{\n        let a = {i};\n        let b = a + total;\n        total = b;\n    }}\n")
+    parts.append("}\n")
+    return "".join(parts)
+
+
+def analysis_cost(cls, ast):
+    """(tiempo, bytes retenidos al terminar, errores) de analizar `ast`."""
+    times = []
+    for _ in range(REPEAT):
+        analyzer = cls()
+        start = time.perf_counter()
+        analyzer.visit(ast)
+        times.append(time.perf_counter() - start)
+    tracemalloc.start()
+    analyzer = cls()
+    before = tracemalloc.get_traced_memory()[0]
+    analyzer.visit(ast)
+    # El memo de tipos no es parte de la tabla de símbolos
+    analyzer._type_cache.clear()
+    retained = tracemalloc.get_traced_memory()[0] - before
+    tracemalloc.stop()
+    return min(times), retained, analyzer.errors
+
+
+def main():
+    print("=" * 80)
+    print("MICRO-BENCHMARK DE LA TABLA DE SÍMBOLOS")
+    print(f"{LOOKUPS} búsquedas de una variable global, mejor de {REPEAT}")
+    print("=" * 80)
+    print(f"{'profundidad':>11} | {'lista de scopes (ns)':>20} | {'pilas por nombre (ns)':>21} | {'acel.':>6}")
+    print("-" * 80)
+    for depth in (1, 10, 100):
+        old = lookup_time(ScopeListTable, depth)
+        new = lookup_time(SymbolTable, depth)
+        print(f"{depth:>11} | {old / LOOKUPS * 1e9:>20.0f} | {new / LOOKUPS * 1e9:>21.0f} | {old / new:>5.2f}x")
+    print("-" * 80)
+
+    ast, errors = parse_source(generate_blocks(BLOCKS))
+    assert not errors
+    print(f"\nAnálisis de una función con {BLOCKS} bloques")
+    print(f"{'tabla':>20} | {'total (ms)':>10} | {'KB retenidos':>12}")
+    print("-" * 80)
+    results = []
+    for name, cls in (("lista de scopes", ScopeListAnalyzer), ("pilas por nombre", SemanticAnalyzer)):
+        elapsed, retained, analyzer_errors = analysis_cost(cls, ast)
+        results.append(analyzer_errors)
+        print(f"{name:>20} | {elapsed * 1000:>10.1f} | {retained / 1024:>12.1f}")
+    print("-" * 80)
+    assert results[0] == results[1]
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,53 @@
+#!/usr/bin/env python
+# analyzer/tests/bench_token_buffer.py
+# Benchmark del TokenBuffer: bytes por token y tokens por segundo, comparado
+# con la representación anterior de un diccionario por token.
+
+import os
+import sys
+import time
+import tracemalloc
+
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..'))
+sys.path.insert(0, project_root)
+
+from analyzer.ply_lexer import tokenize_source
+
+
+def generate_source(lines):
+    body = "\n".join(
+        f'    let v{i}: i32 = {i} * 2 + x; let s{i} = "texto {i}";' for i in range(lines)
+    )
+    return f"fn main() {{\n    let x = 1;\n{body}\n}}\n"
+
+
+def measure(label, build, source):
+    tracemalloc.start()
+    start = time.perf_counter()
+    tokens = build(source)
+    elapsed = time.perf_counter() - start
+    current, _peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    count = len(tokens)
+    print(f"{label:28} | {count:>9} tokens | {current / count:>8.1f} bytes/token | "
+          f"{count / elapsed:>10.0f} tokens/s")
+    return tokens
+
+
+def main():
+    lines = int(sys.argv[1]) if len(sys.argv) > 1 else 10_000
+    source = generate_source(lines)
+
+    print("=" * 80)
+    print("BENCHMARK DEL TOKEN BUFFER")
+    print("=" * 80)
+
+    measure("TokenBuffer", tokenize_source, source)
+    # Representación anterior: materializar un diccionario por token
+    measure("lista de diccionarios", lambda src: list(tokenize_source(src)), source)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,95 @@
+#!/usr/bin/env python
+# analyzer/tests/bench_type_memo.py
+# Micro-benchmark del memo de tipos del analizador semántico: cadenas
+# aritméticas largas, tipadas por visit_binop y de nuevo por visit_let /
+# visit_assign, con y sin reutilizar los tipos ya calculados.
+
+import os
+import sys
+import time
+
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..'))
+sys.path.insert(0, project_root)
+
+from analyzer.ply_parser_final import parse_source
+from analyzer.semantic_analyzer import SemanticAnalyzer
+
+STATEMENTS = 200
+REPEAT = 5
+
+
+def generate_source(statements, terms):
+    """Declaraciones y reasignaciones con cadenas de `terms` operandos."""
+    chain = " + ".join(f"a * {k}" if k % 3 else "b" for k in range(terms))
+    parts = ["fn main() {\n    let a = 1;\n    let mut b = 2;\n"]
+    for i in range(statements):
+        if i % 2:
+            parts.append(f"    b = {chain};\n")
+        else:
+            parts.append(f"    let v{i} = ({chain}) * (a + c);\n")
+    parts.append("}\n")
+    return "".join(parts)
+
+
+class NoMemo(dict):
+    """Memo que no guarda nada: cada consulta recorre el subárbol."""
+
+    def __setitem__(self, key, value):
+        pass
+
+
+class NoMemoAnalyzer(SemanticAnalyzer):
+    def __init__(self):
+        super().__init__()
+        self._type_cache = NoMemo()
+
+
+def count_typed(cls, ast):
+    analyzer = cls()
+    typed = [0]
+    expression_type = analyzer._expression_type
+
+    def counting(expr_node, line_no):
+        typed[0] += 1
+        return expression_type(expr_node, line_no)
+
+    analyzer._expression_type = counting
+    analyzer.visit(ast)
+    return typed[0]
+
+
+def best_time(cls, ast):
+    times = []
+    for _ in range(REPEAT):
+        analyzer = cls()
+        start = time.perf_counter()
+        analyzer.visit(ast)
+        times.append(time.perf_counter() - start)
+    return min(times), analyzer.errors
+
+
+def main():
+    print("=" * 80)
+    print("MICRO-BENCHMARK DEL MEMO DE TIPOS")
+    print(f"{STATEMENTS} sentencias por archivo, mejor de {REPEAT}")
+    print("=" * 80)
+    print(f"{'operandos':>9} | {'tipados sin memo':>16} | {'con memo':>8} | "
+          f"{'sin memo (ms)':>13} | {'con memo (ms)':>13} | {'acel.':>6} | {'errores':>11}")
+    print("-" * 80)
+    for terms in (10, 100, 1000):
+        ast, errors = parse_source(generate_source(STATEMENTS, terms))
+        assert not errors
+        old_typed = count_typed(NoMemoAnalyzer, ast)
+        new_typed = count_typed(SemanticAnalyzer, ast)
+        old, old_errors = best_time(NoMemoAnalyzer, ast)
+        new, new_errors = best_time(SemanticAnalyzer, ast)
+        # El memo solo quita errores repetidos
+        assert set(new_errors) == set(old_errors)
+        print(f"{terms:>9} | {old_typed:>16} | {new_typed:>8} | {old * 1000:>13.1f} | "
+              f"{new * 1000:>13.1f} | {old / new:>5.2f}x | {len(old_errors):>4} -> {len(new_errors):<4}")
+    print("-" * 80)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
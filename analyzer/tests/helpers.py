@@ -0,0 +1,36 @@
+# analyzer/tests/helpers.py
+# Utilidades compartidas por las pruebas y los benchmarks del parser
+
+from analyzer.ast_nodes import Node
+from analyzer.ply_parser_final import parse_source
+
+
+def generate_source(functions):
+    """N funciones de 10 líneas cada una (~20k líneas)."""
+    parts = []
+    for i in range(functions):
+        body = "\n".join(f"    let v{j} = {j} * {i} + 1;" for j in range(8))
+        parts.append(f"fn calculo{i}() {{\n{body}\n}}\n")
+    return "".join(parts)
+
+
+def spans(node, out=None):
+    """Tipo y rango de cada nodo, en preorden."""
+    out = [] if out is None else out
+    if isinstance(node, list):
+        for child in node:
+            spans(child, out)
+    elif isinstance(node, Node):
+        out.append((node.kind, node.start, node.end))
+        for child in node.as_tuple()[1:]:
+            spans(child, out)
+    return out
+
+
+def assert_matches_parse_source(result, source):
+    """`result` es el (ast, errores) que da `parse_source` para `source`."""
+    ast, errors = result
+    expected_ast, expected_errors = parse_source(source)
+    assert ast == expected_ast
+    assert spans(ast) == spans(expected_ast)
+    assert errors == expected_errors
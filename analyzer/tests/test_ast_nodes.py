@@ -0,0 +1,89 @@
+# analyzer/tests/test_ast_nodes.py
+# Pruebas de los nodos del AST con __slots__ y su compatibilidad con tuplas
+
+import pickle
+
+import pytest
+
+from analyzer.ast_nodes import NODE_CLASSES, NODE_FIELDS, Node, make_node
+from analyzer.ply_parser_final import parse_source
+
+BINOP = ('binop', ('literal', 1, 'NUMBER'), '+', ('literal', 2, 'NUMBER'), 3)
+
+
+def build(fields):
+    """Convierte una tupla anidada en nodos, como hace el parser."""
+    if isinstance(fields, tuple):
+        return make_node(tuple(build(child) for child in fields), 0, 1)
+    if isinstance(fields, list):
+        return [build(child) for child in fields]
+    return fields
+
+
+def test_named_fields():
+    node = build(BINOP)
+    assert type(node).__name__ == 'BinopNode'
+    assert node.kind == 'binop'
+    assert node.left == ('literal', 1, 'NUMBER')
+    assert (node.op, node.line) == ('+', 3)
+    assert node.span == (0, 1)
+    assert not hasattr(node, '__dict__')
+
+
+def test_tuple_compatibility():
+    node = build(BINOP)
+    assert node == BINOP and BINOP == node
+    assert node != ('binop', 1, '+', 2, 4)
+    assert node[0] == 'binop' and node[-1] == 3
+    assert node[1:3] == BINOP[1:3]
+    assert len(node) == len(BINOP)
+    kind, left, op, right, line = node
+    assert (kind, op, line) == ('binop', '+', 3)
+    assert tuple(node) == BINOP
+    assert repr(node) == repr(BINOP)
+    with pytest.raises(IndexError):
+        node[5]
+
+
+def test_equal_nodes_are_not_hashable():
+    # La igualdad es estructural, como la de las tuplas equivalentes: un hash
+    # por identidad daría hashes distintos a nodos iguales
+    first, second = build(BINOP), build(BINOP)
+    assert first == second
+    with pytest.raises(TypeError):
+        hash(first)
+
+
+def test_unknown_kind_stays_tuple():
+    assert make_node(('desconocido', 1)) == ('desconocido', 1)
+    assert not isinstance(make_node(('desconocido', 1)), Node)
+
+
+def test_every_kind_has_a_class():
+    assert set(NODE_CLASSES) == set(NODE_FIELDS)
+    for kind, cls in NODE_CLASSES.items():
+        assert cls.kind == kind and cls.__slots__ == NODE_FIELDS[kind]
+
+
+def test_parser_builds_typed_nodes_that_pickle():
+    ast, errors = parse_source("fn main() {\n    let x = 1 + 2;\n    while x < 3 { x = x + 1; }\n}")
+    assert not errors
+    assert type(ast).__name__ == 'ProgramNode'
+    function = ast.items[0]
+    assert function.name == 'main'
+    assert function.body[1].condition.op == '<'
+
+    copy = pickle.loads(pickle.dumps(ast))
+    assert copy == ast
+    assert copy.items[0].body[0].span == function.body[0].span
+
+
+def test_deep_tree_pickles_and_prints_without_recursion():
+    expr = make_node(('literal', 1, 'NUMBER'), 0, 1)
+    for position in range(100_000):
+        expr = make_node(('binop', expr, '+', make_node(('literal', 1, 'NUMBER')), 2), 0, position)
+    copy = pickle.loads(pickle.dumps(expr))
+    assert copy.end == expr.end and copy.left.end == expr.left.end
+    text = repr(copy)
+    assert text.startswith("('binop', ('binop', ") and text.endswith("'+', ('literal', 1, 'NUMBER'), 2)")
+    assert repr(build(BINOP)) == repr(BINOP)
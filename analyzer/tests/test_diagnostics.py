@@ -0,0 +1,102 @@
+# analyzer/tests/test_diagnostics.py
+# Pruebas de los diagnósticos semánticos: mensajes por idioma, selección
+# sin armar mensajes y posición real en el código
+
+import pickle
+
+from analyzer.diagnostics import (
+    ERROR, MESSAGES, WARNING, Diagnostic, select_diagnostics,
+)
+from analyzer.pipeline import run_pipeline
+from analyzer.semantic_types import BOOL, I32, TypeTable
+
+
+def test_render_by_locale_with_fallback():
+    diagnostic = Diagnostic('let-type-mismatch', 2, {'expected': I32, 'found': BOOL, 'name': 'a'})
+    assert diagnostic.render() == (
+        "Error Semántico (Línea 2): Discrepancia de tipos. Se esperaba tipo 'i32' "
+        "pero se encontró tipo 'bool' en la asignación de 'a'."
+    )
+    assert diagnostic.render('en') == (
+        "Semantic error (line 2): Mismatched types. Expected type 'i32' "
+        "but found type 'bool' in the assignment of 'a'."
+    )
+    # Un idioma desconocido usa el español
+    assert diagnostic.render('xx') == diagnostic.render() == str(diagnostic)
+
+
+def test_header_depends_on_line_and_code():
+    assert str(Diagnostic('break-outside-loop')) == (
+        "Error Semántico: 'break' solo puede usarse dentro de un bucle (while, for, loop)."
+    )
+    internal = Diagnostic('internal-error', args={'message': 'boom'})
+    assert str(internal) == 'Error en análisis semántico: boom'
+
+
+def test_every_code_has_every_locale():
+    codes = set(MESSAGES['es'])
+    for messages in MESSAGES.values():
+        assert set(messages) == codes
+
+
+class CountingType:
+    """Tipo de prueba que cuenta cuántas veces se pidió su texto."""
+
+    def __init__(self, name):
+        self.name = name
+        self.calls = 0
+
+    def __str__(self):
+        self.calls += 1
+        return self.name
+
+
+def test_select_does_not_render_messages():
+    found = CountingType('bool')
+    diagnostics = [
+        Diagnostic('logical-operand', 3, {'op': '&&', 'found': found}, span=(30, 34)),
+        Diagnostic('undeclared-variable', 1, {'name': 'x'}, span=(5, 6)),
+        Diagnostic('undeclared-variable', 1, {'name': 'x'}, span=(8, 9)),
+        Diagnostic('undeclared-variable', 2, {'name': 'y'}, severity=WARNING, span=(12, 13)),
+        Diagnostic('missing-type'),
+    ]
+    selected = select_diagnostics(diagnostics, severities={ERROR}, unique=True, ordered=True)
+    assert [d.code for d in selected] == ['undeclared-variable', 'logical-operand', 'missing-type']
+    assert selected[0].span == (5, 6)
+    assert select_diagnostics(diagnostics, limit=2) == diagnostics[:2]
+    assert found.calls == 0
+
+
+def test_duplicates_with_equal_types_are_merged():
+    types = TypeTable()
+    first = Diagnostic('range-end', 4, {'found': types.tuple([I32, BOOL])})
+    second = Diagnostic('range-end', 4, {'found': types.tuple([I32, BOOL])})
+    assert first.key == second.key
+    assert select_diagnostics([first, second], unique=True) == [first]
+
+
+def test_pickled_diagnostic_carries_types_as_text():
+    types = TypeTable()
+    nested = I32
+    for _ in range(5000):
+        nested = types.tuple([nested])
+    diagnostic = Diagnostic('range-start', 1, {'found': nested}, span=(0, 3), position=(1, 1))
+    copy = pickle.loads(pickle.dumps(diagnostic))
+    assert copy == diagnostic
+    assert copy.args['found'] == str(nested)
+    assert copy.render('en') == diagnostic.render('en')
+
+
+def test_pipeline_locates_diagnostics():
+    source = "fn main() {\n    let a: i32 = true;\n    let b = c + 1;\n}\n"
+    result = run_pipeline(source)
+    errors = result['semantic_errors']
+    assert [error.code for error in errors] == [
+        'let-type-mismatch', 'undeclared-variable', 'arithmetic-operand',
+    ]
+    assert [error.position for error in errors] == [(2, 5), (3, 13), (3, 13)]
+    assert result['semantic_error_lines'] == [2, 3, 3]
+    assert errors[1].render('en') == (
+        "Semantic error (line 3): Identifier not found. "
+        "The variable 'c' has not been declared in this scope."
+    )
@@ -0,0 +1,96 @@
+# analyzer/tests/test_error_recovery.py
+# Pruebas de la recuperación de errores sintácticos (modo pánico)
+
+from analyzer.ast_nodes import Node
+from analyzer.incremental import IncrementalParser
+from analyzer.ply_parser_final import ParseSession, parse_source
+
+MULTIPLE_ERRORS = """fn a() {
+    let x = ;
+    let y = 2;
+}
+fn b() {
+    z = ;
+}
+fn c() {
+    let w = 1;
+}
+"""
+
+
+def lines(errors):
+    return [error['line'] for error in errors]
+
+
+def test_reports_every_independent_error():
+    ast, errors = parse_source(MULTIPLE_ERRORS)
+    assert lines(errors) == [2, 6]
+    assert [item[1] for item in ast[1]] == ['a', 'b', 'c']
+
+
+def test_statement_error_resyncs_at_semicolon():
+    ast, errors = parse_source("fn main() { let x = ; let y = 2; }")
+    assert len(errors) == 1
+    body = ast[1][0][4]
+    assert body[0] == ('error', 1)
+    assert body[1] == ('let', 'y', None, ('literal', 2, 'NUMBER'), 1)
+
+
+def test_block_error_resyncs_at_closing_brace():
+    ast, errors = parse_source("fn main() { let x = 1 }\nfn g() {}")
+    assert len(errors) == 1
+    assert ast[1][0][4] == [('error', 1)]
+    assert ast[1][1][1] == 'g'
+
+
+def test_item_error_resyncs_at_next_item():
+    ast, errors = parse_source("fn main( { }\nstruct S { a: i32 }\nimpl S {}")
+    assert len(errors) == 1
+    assert [item[0] for item in ast[1]] == ['error', 'struct', 'impl_block']
+
+
+def test_error_nodes_have_spans():
+    source = "fn main() { let x = ; }"
+    ast, _ = parse_source(source)
+    error = ast[1][0][4][0]
+    assert isinstance(error, Node)
+    assert error.line == 1
+    assert source[error.start:error.end] == ";"
+
+
+def test_unterminated_item_keeps_previous_items():
+    ast, errors = parse_source("fn a() {}\nfn b() { let x = 1;")
+    assert errors[-1]['line'] == 'EOF'
+    assert ast == ('program', [('fn', 'a', [], None, [])])
+
+
+def test_max_errors_truncates():
+    session = ParseSession(max_errors=2)
+    ast, errors = session.parse(MULTIPLE_ERRORS + "fn d() { q = ; }\n")
+    assert len(errors) == 2
+    assert session.truncated
+    assert [item[1] for item in ast[1]] == ['a']
+
+    ast, errors = session.parse(MULTIPLE_ERRORS)
+    assert len(errors) == 2
+    assert session.truncated
+
+    _, errors = ParseSession(max_errors=0).parse(MULTIPLE_ERRORS + "fn d() { q = ; }\n")
+    assert len(errors) == 3
+
+
+def test_valid_code_is_not_truncated():
+    session = ParseSession(max_errors=1)
+    ast, errors = session.parse("fn main() { let x = 1; }")
+    assert not errors and not session.truncated
+
+
+def test_incremental_matches_full_parse_with_errors():
+    parser = IncrementalParser(MULTIPLE_ERRORS)
+    assert parser.syntax_errors == parse_source(MULTIPLE_ERRORS)[1]
+
+    start = MULTIPLE_ERRORS.index("let x = ;") + len("let x = ")
+    parser.edit(start, start, "1")
+    fixed = MULTIPLE_ERRORS[:start] + "1" + MULTIPLE_ERRORS[start:]
+    assert parser.ast == parse_source(fixed)[0]
+    assert lines(parser.syntax_errors) == [6]
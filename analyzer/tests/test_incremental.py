@@ -0,0 +1,120 @@
+# analyzer/tests/test_incremental.py
+# Pruebas del re-análisis incremental por items (IncrementalParser)
+
+import pytest
+
+from analyzer.incremental import IncrementalParser, split_items
+from analyzer.ply_lexer import tokenize_source
+from analyzer.ply_parser_final import parse_source
+
+SOURCE = """const LIMITE: i32 = 10;
+
+struct Punto {
+    x: i32,
+    y: i32
+}
+
+fn doble(n: i32) -> i32 {
+    let r = n * 2;
+    return r;
+}
+
+fn main() {
+    let a = 1;
+    let b = doble(a);
+}
+"""
+
+
+def assert_matches_full_parse(parser):
+    ast, errors = parse_source(parser.source)
+    assert parser.ast == ast
+    assert parser.syntax_errors == errors
+
+
+def test_split_items():
+    tokens = tokenize_source(SOURCE)
+    spans = split_items(tokens)
+    assert [tokens.type_of(start) for start, _ in spans] == ["CONST", "STRUCT", "FN", "FN"]
+    assert spans[-1][1] == len(tokens)
+    assert split_items(tokenize_source("fn main() {")) is None
+    assert split_items(tokenize_source("let x = 1;")) is None
+
+
+def test_edit_inside_function_reparses_only_that_item():
+    parser = IncrementalParser(SOURCE)
+    before = parser.ast[1]
+    position = SOURCE.index("n * 2") + 4
+    parser.edit(position, position + 1, "3")
+
+    after = parser.ast[1]
+    assert parser.reparsed == 1
+    assert after[2] is not before[2]
+    assert all(after[i] is before[i] for i in (0, 1, 3))
+    assert_matches_full_parse(parser)
+
+
+def test_line_shift_rebases_following_items():
+    parser = IncrementalParser(SOURCE)
+    before = parser.ast[1]
+    position = SOURCE.index("    return r;")
+    parser.edit(position, position, "    let extra = 5;\n")
+
+    after = parser.ast[1]
+    assert parser.reparsed == 1
+    assert after[0] is before[0] and after[1] is before[1]
+    assert after[3] != before[3]
+    assert_matches_full_parse(parser)
+
+
+def test_whitespace_edit_between_items_reparses_nothing():
+    parser = IncrementalParser(SOURCE)
+    position = SOURCE.index("fn main")
+    parser.edit(position, position, "\n\n")
+    assert parser.reparsed == 0
+    assert_matches_full_parse(parser)
+
+
+@pytest.mark.parametrize("text", [
+    "fn nueva() {}\n",
+    "static mut CONTADOR: i32 = 0;\n",
+    "enum Color { Rojo, Verde }\n",
+])
+def test_insert_new_item(text):
+    parser = IncrementalParser(SOURCE)
+    position = SOURCE.index("fn main")
+    parser.edit(position, position, text)
+    assert parser.reparsed == 1
+    assert len(parser.ast[1]) == 5
+    assert_matches_full_parse(parser)
+
+
+def test_unbalanced_edit_falls_back_and_recovers():
+    parser = IncrementalParser(SOURCE)
+    position = SOURCE.index("    return r;\n}") + len("    return r;\n")
+    parser.edit(position, position + 1, "")
+    assert parser.spans is None
+    assert_matches_full_parse(parser)
+
+    parser.edit(position, position, "}")
+    assert parser.spans is not None
+    assert parser.ast == parse_source(SOURCE)[0]
+
+
+def test_syntax_error_matches_full_parse():
+    parser = IncrementalParser(SOURCE)
+    position = SOURCE.index("let a = 1;") + len("let a = 1")
+    parser.edit(position, position + 1, "")
+    assert parser.syntax_errors
+    assert_matches_full_parse(parser)
+
+
+def test_apply_edits():
+    parser = IncrementalParser(SOURCE)
+    edits = [
+        (SOURCE.index("10;"), SOURCE.index("10;") + 2, "20"),
+        (SOURCE.index("let a = 1;") + 8, SOURCE.index("let a = 1;") + 9, "7"),
+    ]
+    parser.apply_edits(edits)
+    assert parser.reparsed == 2
+    assert_matches_full_parse(parser)
@@ -0,0 +1,100 @@
+# analyzer/tests/test_iter_tokens.py
+# Pruebas de la tokenización en streaming (iter_tokens / iter_tokens_from_file)
+
+import glob
+import io
+import os
+import types
+
+import pytest
+
+from analyzer import ply_lexer
+from analyzer.ply_lexer import iter_tokens, iter_tokens_from_file, tokenize_source
+from analyzer.ply_parser_final import parse_source, parse_tokens
+
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..'))
+SAMPLE_FILES = sorted(glob.glob(os.path.join(project_root, 'docs', 'algoritmos_de_prueba', '*.rs')))
+
+BLOCK_COMMENT_CODE = """fn main() {
+    /* comentario
+       de varias
+       líneas */
+    let x = 1;
+}
+/* comentario sin cerrar
+fn otra() {}
+"""
+
+# "/*" que no abren un comentario, y comentarios que se ven como cerrados
+TRICKY_COMMENT_CODE = """fn main() {
+    let s = "/* no es comentario";
+    // tampoco /* esto
+    let a = 1; /*/ sigue abierto
+    let b = 2;
+    */ let c = 3; /* uno */ /* dos
+    */
+    let d = a /*/**/ / 2;
+}
+"""
+
+
+def write(tmp_path, text):
+    path = tmp_path / "entrada.rs"
+    path.write_text(text, encoding="utf-8")
+    return str(path)
+
+
+def test_iter_tokens_is_a_generator():
+    stream = iter_tokens("let x = 5;")
+    assert isinstance(stream, types.GeneratorType)
+    assert next(stream)["type"] == "LET"
+
+
+@pytest.mark.parametrize("path", SAMPLE_FILES, ids=os.path.basename)
+def test_iter_tokens_matches_tokenize_source(path):
+    with open(path, "r", encoding="utf-8") as f:
+        source = f.read()
+    assert list(iter_tokens(source)) == list(tokenize_source(source))
+
+
+@pytest.mark.parametrize("path", SAMPLE_FILES, ids=os.path.basename)
+@pytest.mark.parametrize("chunk_size", [1, 7, 64, 1 << 16])
+def test_file_stream_matches_tokenize_source(path, chunk_size):
+    with open(path, "r", encoding="utf-8") as f:
+        source = f.read()
+    assert list(iter_tokens_from_file(path, chunk_size)) == list(tokenize_source(source))
+
+
+@pytest.mark.parametrize("chunk_size", [1, 5, 16, 1024])
+def test_file_stream_handles_block_comments(tmp_path, chunk_size):
+    path = write(tmp_path, BLOCK_COMMENT_CODE)
+    assert list(iter_tokens_from_file(path, chunk_size)) == list(tokenize_source(BLOCK_COMMENT_CODE))
+
+
+@pytest.mark.parametrize("chunk_size", [1, 3, 16, 1024])
+def test_file_stream_uses_lexer_comment_state(tmp_path, chunk_size):
+    path = write(tmp_path, TRICKY_COMMENT_CODE)
+    assert list(iter_tokens_from_file(path, chunk_size)) == list(tokenize_source(TRICKY_COMMENT_CODE))
+
+
+def test_comment_markers_in_strings_do_not_buffer_the_file(tmp_path, monkeypatch):
+    source = 'let s = "/*";\n// /* comentario\n' + "let x = 1;\n" * 10_000
+    path = write(tmp_path, source)
+    read = []
+
+    def counting_open(*args, **kwargs):
+        f = io.StringIO(source)
+        original = f.read
+        f.read = lambda size: read.append(size) or original(size)
+        return f
+
+    monkeypatch.setattr(ply_lexer, "open", counting_open, raising=False)
+    stream = iter_tokens_from_file(path, chunk_size=64)
+    assert [next(stream)["type"] for _ in range(5)] == ["LET", "IDENT", "EQUALS", "STRING", "SEMICOLON"]
+    # Los primeros tokens salen sin leer todo el archivo
+    assert len(read) < 5
+
+
+def test_parser_consumes_stream():
+    source = "fn main() {\n    let x = 1 + 2;\n}"
+    assert parse_tokens(iter_tokens(source)) == parse_source(source)
@@ -0,0 +1,91 @@
+# analyzer/tests/test_parallel_parse.py
+# Pruebas del análisis sintáctico en paralelo (ParallelParser)
+
+import glob
+import os
+import pickle
+
+import pytest
+
+from analyzer.parallel import ParallelParser, split_chunks
+from analyzer.ply_parser_final import parse_source
+from analyzer.tests.helpers import assert_matches_parse_source, generate_source, spans
+
+
+@pytest.fixture(scope="module")
+def parallel():
+    # Umbral 0 para que hasta los programas de prueba se repartan
+    with ParallelParser(workers=2, min_bytes=0) as parser:
+        yield parser
+
+
+def test_chunks_start_at_items():
+    source = generate_source(40)
+    offsets = split_chunks(source, 8)
+    assert 4 <= len(offsets) <= 8 and offsets[0] == 0
+    for offset in offsets[1:]:
+        assert source[offset:].lstrip().startswith(("fn ", "struct ", "impl "))
+
+
+def test_braces_in_strings_and_comments_are_ignored():
+    source = (
+        'fn a() { println!("{{ }"); let c = \'{\'; }\n'
+        "// }\n"
+        "/* { */\n"
+        "static S: P = P { x: 1 };\n"
+        "fn b() {}\n"
+    )
+    offsets = split_chunks(source, len(source))
+    cuts = [source[offset:].lstrip() for offset in offsets[1:]]
+    assert cuts == [source[source.index("// }"):], "fn b() {}\n"]
+
+
+def test_matches_parse_source(parallel):
+    source = generate_source(60)
+    result = parallel.parse(source)
+    assert parallel.chunks > 1
+    assert_matches_parse_source(result, source)
+
+
+def test_errors_keep_file_lines(parallel):
+    source = generate_source(60)
+    position = source.index("fn calculo50(")
+    broken = source[:position] + source[position:].replace(" + 1;", " + ;", 1)
+    result = parallel.parse(broken)
+    assert_matches_parse_source(result, broken)
+    line = broken.count("\n", 0, broken.index(" + ;")) + 1
+    assert result[1][0]['line'] == line
+
+
+def test_test_programs_match_parse_source(parallel):
+    pattern = os.path.join(os.path.dirname(__file__), '..', '..', 'docs', 'algoritmos_de_prueba', '*.rs')
+    sources = []
+    for path in sorted(glob.glob(pattern)):
+        with open(path, encoding='utf-8') as f:
+            sources.append(f.read())
+    source = "\n".join(sources)
+    assert_matches_parse_source(parallel.parse(source), source)
+
+
+def test_max_errors_applies_to_whole_file():
+    source = generate_source(60).replace(" + 1;", " + ;")
+    with ParallelParser(workers=2, min_bytes=0, max_errors=5) as parser:
+        ast, errors = parser.parse(source)
+    assert parser.truncated
+    assert errors == parse_source(source)[1][:5]
+    assert ast[1]
+
+
+def test_small_inputs_are_parsed_serially():
+    parser = ParallelParser(workers=2)
+    source = generate_source(5)
+    assert_matches_parse_source(parser.parse(source), source)
+    assert parser.chunks == 1
+    assert parser._executor is None
+
+
+def test_nodes_pickle_with_spans():
+    ast, _ = parse_source(generate_source(3))
+    copy = pickle.loads(pickle.dumps(ast))
+    assert copy == ast
+    assert spans(copy) == spans(ast)
@@ -0,0 +1,100 @@
+# analyzer/tests/test_parse_cache.py
+# Pruebas de la caché de análisis por item (ItemParseCache)
+
+import glob
+import os
+
+from analyzer.parse_cache import ItemParseCache
+from analyzer.tests.helpers import assert_matches_parse_source
+
+SOURCE = """fn suma(a: i32, b: i32) -> i32 {
+    let r = a + b;
+    return r;
+}
+
+struct Punto { x: i32, y: i32 }
+
+fn main() {
+    let mut x = 1;
+    x += 2 * 3;
+}
+"""
+
+
+def test_unchanged_items_are_reused():
+    cache = ItemParseCache()
+    first, _ = cache.parse(SOURCE)
+    assert cache.stats()['misses'] == 3
+
+    edited = SOURCE.replace("x += 2 * 3;", "x += 4;")
+    second, _ = cache.parse(edited)
+    assert second[1][0] is first[1][0]
+    assert second[1][1] is first[1][1]
+    assert second[1][2] is not first[1][2]
+    assert cache.hits == 2 and cache.misses == 4
+    assert_matches_parse_source((second, []), edited)
+
+
+def test_hits_are_rebased():
+    cache = ItemParseCache()
+    cache.parse(SOURCE)
+    shifted = "// encabezado\n\n" + SOURCE
+    result = cache.parse(shifted)
+    assert cache.hits == 3
+    assert_matches_parse_source(result, shifted)
+    let = result[0][1][0][4][0]
+    assert let[4] == 4
+    assert shifted[let.start:let.end] == "let r = a + b;"
+
+
+def test_items_with_errors_fall_back_to_full_parse():
+    cache = ItemParseCache()
+    cache.parse(SOURCE)
+    broken = SOURCE.replace("let r = a + b;", "let r = ;")
+    result = cache.parse(broken)
+    assert result[1]
+    assert_matches_parse_source(result, broken)
+    assert_matches_parse_source(cache.parse("fn main() {"), "fn main() {")
+    assert_matches_parse_source(cache.parse(""), "")
+
+
+def test_eviction_under_memory_budget():
+    cache = ItemParseCache(max_bytes=1)
+    cache.parse(SOURCE)
+    assert cache.stats()['entries'] == 0
+
+    cache = ItemParseCache()
+    cache.parse(SOURCE)
+    sizes = cache.current_bytes
+    small = ItemParseCache(max_bytes=sizes - 1)
+    small.parse(SOURCE)
+    stats = small.stats()
+    assert stats['evictions'] == 1
+    assert stats['entries'] == 2
+    assert stats['bytes'] <= stats['max_bytes']
+
+    # Se expulsó el item usado hace más tiempo
+    small.parse(SOURCE[SOURCE.index("struct"):])
+    assert small.hits == 2 and small.misses == 3
+
+
+def test_stats():
+    cache = ItemParseCache()
+    assert cache.stats()['hit_rate'] == 0.0
+    cache.parse(SOURCE)
+    cache.parse(SOURCE)
+    stats = cache.stats()
+    assert stats['hits'] == 3 and stats['misses'] == 3
+    assert stats['hit_rate'] == 0.5
+    cache.clear()
+    assert cache.stats()['entries'] == 0 and cache.current_bytes == 0
+
+
+def test_test_programs_match_parse_source():
+    cache = ItemParseCache()
+    pattern = os.path.join(os.path.dirname(__file__), '..', '..', 'docs', 'algoritmos_de_prueba', '*.rs')
+    for path in sorted(glob.glob(pattern)):
+        with open(path, encoding='utf-8') as f:
+            source = f.read()
+        for _ in range(2):
+            assert_matches_parse_source(cache.parse(source), source)
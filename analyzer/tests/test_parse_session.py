@@ -0,0 +1,84 @@
+# analyzer/tests/test_parse_session.py
+# Pruebas de ParseSession: análisis reentrante y seguro entre hilos
+
+from concurrent.futures import ThreadPoolExecutor
+
+from analyzer.ply_lexer import tokenize_source
+from analyzer.ply_parser_final import ParseSession, parse_source
+
+VALID_CODE = """
+fn suma(a: i32, b: i32) -> i32 {
+    let resultado = a + b * 2;
+    return resultado;
+}
+
+fn main() {
+    let mut x = 5;
+    while x > 0 {
+        x -= 1;
+    }
+}
+"""
+
+ERROR_CODE = """
+fn main() {
+    let x = ;
+}
+"""
+
+LEXER_ERROR_CODE = "fn main() {\n\n    let y = 3 $ 4;\n}"
+
+
+def test_session_is_reusable():
+    """Una sesión limpia sus errores entre análisis consecutivos."""
+    session = ParseSession()
+
+    _, errors = session.parse(ERROR_CODE)
+    assert errors
+
+    ast, errors = session.parse(VALID_CODE)
+    assert not errors
+    assert ast[0] == 'program'
+
+
+def test_sessions_do_not_share_errors():
+    """Los errores de una sesión no aparecen en otra."""
+    first, second = ParseSession(), ParseSession()
+
+    first.parse(ERROR_CODE)
+    second.parse(VALID_CODE)
+
+    assert first.syntax_errors
+    assert not second.syntax_errors
+
+
+def test_session_tokenize_resets_line_numbers():
+    """El lexer de la sesión empieza en la línea 1 en cada tokenización."""
+    session = ParseSession()
+    session.tokenize(VALID_CODE)
+    tokens = session.tokenize("let x = 1;")
+    assert tokens[0]['line'] == 1
+
+
+def test_concurrent_parsing_matches_serial_results():
+    """Muchos hilos analizando a la vez obtienen los mismos resultados que en serie."""
+    sources = [VALID_CODE * 10, ERROR_CODE, LEXER_ERROR_CODE] * 60
+    expected = {source: parse_source(source) for source in set(sources)}
+
+    with ThreadPoolExecutor(max_workers=16) as pool:
+        results = list(pool.map(parse_source, sources))
+
+    for source, result in zip(sources, results):
+        assert result == expected[source]
+
+
+def test_concurrent_tokenizing_matches_serial_results():
+    """tokenize_source no comparte estado del lexer entre hilos."""
+    sources = [VALID_CODE * 10, LEXER_ERROR_CODE] * 100
+    expected = {source: tokenize_source(source) for source in set(sources)}
+
+    with ThreadPoolExecutor(max_workers=16) as pool:
+        results = list(pool.map(tokenize_source, sources))
+
+    for source, result in zip(sources, results):
+        assert result == expected[source]
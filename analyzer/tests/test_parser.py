@@ -646,3 +646,25 @@ fn main() {
     ast, errors = parse_source(code)
     assert not errors, f"Este test falla debido a un bug conocido y complejo del parser."
 
+
+
+def test_long_lists_keep_source_order():
+    """
+    Las listas acumuladas (sentencias, argumentos, campos, items) se construyen
+    agregando en el lugar; deben conservar el orden del código fuente.
+    """
+    count = 300
+    body = "\n".join(f"    let x{i} = {i};" for i in range(count))
+    args = ", ".join(str(i) for i in range(count))
+    fields = ", ".join(f"c{i}: i32" for i in range(count))
+    code = f"struct S {{ {fields} }}\nfn main() {{\n{body}\n    let r = f({args});\n}}\nfn otra() {{}}"
+
+    ast, errors = parse_source(code)
+    assert not errors
+
+    struct, main_fn, other_fn = ast[1]
+    assert [field[1] for field in struct[2]] == [f"c{i}" for i in range(count)]
+    assert [stmt[1] for stmt in main_fn[4][:count]] == [f"x{i}" for i in range(count)]
+    call = main_fn[4][count][3]
+    assert [arg[1] for arg in call[2]] == list(range(count))
+    assert other_fn[1] == 'otra'
@@ -0,0 +1,64 @@
+# analyzer/tests/test_parser_tables.py
+# Pruebas de la caché de tablas LALR del parser
+
+import os
+
+from analyzer import ply_parser_final
+from analyzer.ply_parser_final import build_parser, grammar_tables_path, parse_source
+
+
+def test_tables_are_written_and_reused(tmp_path):
+    """La primera construcción guarda el artefacto y la segunda lo reutiliza."""
+    tables_dir = str(tmp_path)
+    build_parser(tables_dir)
+
+    path = grammar_tables_path(tables_dir)
+    assert os.path.exists(path)
+    first_mtime = os.path.getmtime(path)
+
+    reused = build_parser(tables_dir)
+    assert os.path.getmtime(path) == first_mtime
+    assert reused.productions, "El parser cargado desde caché no tiene producciones"
+
+
+def test_stale_tables_are_replaced(tmp_path):
+    """Un artefacto de otra gramática se elimina al regenerar las tablas."""
+    tables_dir = str(tmp_path)
+    stale = os.path.join(tables_dir, 'parsetab-3.10-0000000000000000.pickle')
+    with open(stale, 'wb') as f:
+        f.write(b'obsoleto')
+
+    build_parser(tables_dir)
+
+    assert os.path.exists(grammar_tables_path(tables_dir))
+    assert not os.path.exists(stale)
+
+
+def test_corrupt_tables_are_rebuilt(tmp_path):
+    """Un artefacto corrupto no rompe el import: se regenera."""
+    tables_dir = str(tmp_path)
+    path = grammar_tables_path(tables_dir)
+    with open(path, 'wb') as f:
+        f.write(b'no es un pickle')
+
+    rebuilt = build_parser(tables_dir)
+
+    assert rebuilt.productions
+    assert os.path.getsize(path) > len(b'no es un pickle')
+
+
+def test_signature_changes_with_grammar(monkeypatch):
+    """Cambiar una producción cambia la firma y, por tanto, el artefacto."""
+    original = ply_parser_final.grammar_signature()
+
+    monkeypatch.setattr(ply_parser_final.p_stmt_break,
+                        '__doc__', """stmt : BREAK SEMICOLON SEMICOLON""")
+
+    assert ply_parser_final.grammar_signature() != original
+
+
+def test_parser_from_cached_tables_parses():
+    """El parser del módulo (posiblemente cargado de caché) sigue funcionando."""
+    ast, errors = parse_source("fn main() { let x = 1 + 2; }")
+    assert not errors
+    assert ast[0] == 'program'
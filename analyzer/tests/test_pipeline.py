@@ -0,0 +1,117 @@
+# analyzer/tests/test_pipeline.py
+# Pruebas del pipeline que comparte un único flujo de tokens con el parser
+
+import glob
+import itertools
+import os
+import time
+
+import pytest
+
+from analyzer.ply_lexer import TokenFeeder, tokenize_source
+from analyzer.ply_parser_final import parse_source, parse_tokens
+from analyzer.pipeline import run_pipeline, run_stage
+
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..'))
+SAMPLE_FILES = sorted(glob.glob(os.path.join(project_root, 'docs', 'algoritmos_de_prueba', '*.rs')))
+
+
+def read_sample(path):
+    with open(path, 'r', encoding='utf-8') as f:
+        return f.read()
+
+
+@pytest.mark.parametrize("path", SAMPLE_FILES, ids=os.path.basename)
+def test_parse_tokens_matches_parse_source(path):
+    """Parsear desde la lista de tokens da el mismo resultado que parsear el texto."""
+    source = read_sample(path)
+    assert parse_tokens(tokenize_source(source)) == parse_source(source)
+
+
+def test_token_feeder_follows_ply_protocol():
+    """TokenFeeder entrega tokens con los atributos que usa el parser y luego None."""
+    feeder = TokenFeeder(tokenize_source("let x = 5;"))
+
+    first = feeder.token()
+    assert (first.type, first.value, first.lineno, first.literal) == ('LET', 'let', 1, 'let')
+    assert [tok.type for tok in feeder] == ['IDENT', 'EQUALS', 'NUMBER', 'SEMICOLON']
+    assert feeder.token() is None
+
+
+def test_run_pipeline_returns_all_stages():
+    source = "fn main() { let x: i32 = true; }"
+    result = run_pipeline(source)
+
+    assert result['tokens'] == tokenize_source(source)
+    assert result['ast'][0] == 'program'
+    assert not result['syntax_errors']
+    assert len(result['semantic_errors']) == 1
+
+
+def test_run_pipeline_skips_semantic_on_syntax_errors():
+    result = run_pipeline("fn main() { let x = ; }")
+
+    assert result['syntax_errors']
+    assert result['semantic_errors'] == []
+
+
+def test_run_stage_matches_endpoints():
+    source = "fn main() { let x = 1; }"
+
+    assert run_stage('lexico', source) == {'tokens': tokenize_source(source), 'truncated': False}
+    assert run_stage('sintactico', source)['semantic_errors'] == []
+    assert run_stage('semantico', source)['tokens'] == []
+    assert run_stage('completo', source) == run_pipeline(source)
+
+    with pytest.raises(ValueError):
+        run_stage('desconocida', source)
+
+
+def test_lexer_stops_at_max_errors():
+    source = "let a = 1;" + "# " * 1000 + "let b = 2;"
+    tokens = tokenize_source(source, max_errors=3)
+    assert list(tokens.iter_types()) == ['LET', 'IDENT', 'EQUALS', 'NUMBER', 'SEMICOLON'] + ['ERROR'] * 3
+    assert tokens.truncated
+
+    assert not tokenize_source("let a = #;", max_errors=2).truncated
+    assert len(tokenize_source(source).indices_of('ERROR')) == 1000
+
+
+def test_max_errors_truncates_every_phase():
+    junk = run_pipeline("@ " * 10000, max_errors=5)
+    assert len(junk['tokens']) == 5
+    assert 0 < len(junk['syntax_errors']) <= 5
+    assert junk['truncated']
+
+    lines = "".join(f"    let v{i}: bool = {i};\n" for i in range(20))
+    source = "fn main() {\n" + lines + "}\n"
+    result = run_pipeline(source, max_errors=4)
+    assert not result['syntax_errors']
+    assert [error.position[0] for error in result['semantic_errors']] == [2, 3, 4, 5]
+    assert result['truncated']
+
+    assert len(run_pipeline(source, max_errors=0)['semantic_errors']) == 20
+    assert not run_pipeline(source, max_errors=21)['truncated']
+    assert run_stage('lexico', "# " * 10, max_errors=2)['truncated']
+
+
+def test_max_error_seconds_truncates_every_phase(monkeypatch):
+    # Reloj que avanza un segundo por consulta: con un plazo de 2.5 s cada
+    # fase se corta en su cuarto error (el primero fija el plazo)
+    clock = itertools.count(1)
+    monkeypatch.setattr(time, 'monotonic', lambda: next(clock))
+
+    tokens = tokenize_source("# " * 10, max_error_seconds=2.5)
+    assert len(tokens) == 4 and tokens.truncated
+
+    broken = "".join(f"fn f{i}() {{ let = ; }}\n" for i in range(10))
+    result = run_pipeline(broken, max_errors=0, max_error_seconds=2.5)
+    assert len(result['syntax_errors']) == 4 and result['truncated']
+
+    lines = "".join(f"    let v{i}: bool = {i};\n" for i in range(20))
+    result = run_pipeline("fn main() {\n" + lines + "}\n", max_errors=0, max_error_seconds=2.5)
+    assert len(result['semantic_errors']) == 4 and result['truncated']
+
+    # Sin plazo solo cuenta el máximo de errores
+    result = run_pipeline(broken, max_errors=0, max_error_seconds=0)
+    assert len(result['syntax_errors']) == 10 and not result['truncated']
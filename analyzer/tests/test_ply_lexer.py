@@ -201,6 +201,18 @@ def test_unrecognized_character():
     assert_token_sequence(tokens, expected)
 
 
+def test_illegal_characters_are_coalesced():
+    """Consecutive illegal characters form a single ERROR token."""
+    code = "let a = @@$ #;" + "@" * 5000
+    tokens = tokenize_source(code)
+    errors = [tok for tok in tokens if tok['type'] == 'ERROR']
+    assert [(tok['value'], tok['column']) for tok in errors] == [('@@$', 9), ('#', 13), ('@' * 5000, 15)]
+    assert errors[0]['literal'] == "Illegal characters '@@$' (3 characters)"
+    assert errors[1]['literal'] == "Illegal character '#'"
+    assert errors[2]['literal'] == "Illegal characters '" + "@" * 20 + "...' (5000 characters)"
+    assert tokens[-2]['type'] == 'SEMICOLON'
+
+
 def test_dotdot_operator():
     """Tests that the range operator '..' is tokenized correctly."""
     code = "0..10"
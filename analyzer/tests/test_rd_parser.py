@@ -0,0 +1,123 @@
+# analyzer/tests/test_rd_parser.py
+# Pruebas diferenciales del motor de descenso recursivo + Pratt contra el
+# parser LALR: mismo AST, mismos rangos y mismo primer error
+
+import glob
+import os
+import random
+
+import pytest
+
+from analyzer.ply_lexer import tokenize_source
+from analyzer.ply_parser_final import ParseSession
+from analyzer.rd_parser import RDSyntaxError, parse_buffer
+from analyzer.tests.helpers import spans
+
+PROGRAMS_DIR = os.path.join(os.path.dirname(__file__), '..', '..', 'docs', 'algoritmos_de_prueba')
+PROGRAMS = sorted(glob.glob(os.path.join(PROGRAMS_DIR, '*.rs')))
+
+# Construcciones donde la precedencia o los conflictos de la gramática LALR
+# deciden la forma del AST
+SNIPPETS = [
+    "x = a.b(c);",
+    "x = (a.b(c));",
+    "x = a.b();",
+    "x = a + b.c(d);",
+    "x = !a.b + c;",
+    "x = a.b(c).d(e);",
+    "let u = a.b.c(d).e;",
+    "let w = a .. b .. c;",
+    "let f = |a: i32, b| a.b(c);",
+    "let c = || -> i32 { return 1; };",
+    "let p = P { x: 1, y: (2, 3), };",
+    "let z = [1; 3];",
+    "let t = (1,);",
+    "let k = ((a + b) * c, d);",
+    "let r = a::b::c(1, 2).d;",
+    "let q = String::new();",
+    "let s = &mut x;",
+    "let a: &str;",
+    "let mut b: Self = Self::x;",
+    "if a < b && !c || d == e { } else { loop { break; } }",
+    "for i in 0..n + 1 { continue; }",
+    "x += 1 * (2 - 3) % 4;",
+    "return P {};",
+    "println!(\"{}\", a.b, c);",
+]
+
+
+def assert_same_parse(source):
+    ast, errors = ParseSession(engine='lalr').parse(source)
+    tokens = tokenize_source(source)
+    if not errors:
+        result = parse_buffer(tokens)
+        assert result == ast
+        assert spans(result) == spans(ast)
+        return True
+
+    with pytest.raises(RDSyntaxError) as excinfo:
+        parse_buffer(tokens)
+    index = excinfo.value.index
+    if index == len(tokens):
+        assert errors[0]['line'] == 'EOF'
+    else:
+        assert tokens.value_of(index) == errors[0]['token']
+        assert tokens.lines[index] == errors[0]['line']
+    return False
+
+
+@pytest.mark.parametrize('path', PROGRAMS, ids=os.path.basename)
+def test_programs_match_lalr(path):
+    with open(path, encoding='utf-8') as f:
+        assert_same_parse(f.read())
+
+
+@pytest.mark.parametrize('snippet', SNIPPETS)
+def test_snippets_match_lalr(snippet):
+    assert assert_same_parse("fn main() { " + snippet + " }")
+
+
+def test_method_call_binds_looser_than_operators():
+    ast, _ = ParseSession(engine='rd').parse("fn main() { let x = a + b.c; }")
+    value = ast[1][0][4][0][3]
+    assert value[0] == 'property_access'
+    assert value[1][0] == 'binop'
+
+
+def test_mutated_programs_match_lalr():
+    """Mutaciones aleatorias (con semilla) de los programas de prueba."""
+    rnd = random.Random(15)
+    sources = []
+    for path in PROGRAMS:
+        with open(path, encoding='utf-8') as f:
+            sources.append(f.read())
+    sources += ["fn main() { " + snippet + " }" for snippet in SNIPPETS]
+    pieces = ["(", ")", "{", "}", ";", ",", ".", "::", "|", "||", "&", "mut",
+              "let", "x", "1", "+", "*", "==", "!", "=", "fn", "[", "]", "..", "->"]
+
+    for _ in range(300):
+        source = rnd.choice(sources)
+        tokens = tokenize_source(source)
+        index = rnd.randrange(len(tokens))
+        start = tokens.starts[index]
+        end = start + tokens.lengths[index]
+        if rnd.random() < 0.5:
+            source = source[:start] + source[end:]
+        else:
+            source = source[:start] + " " + rnd.choice(pieces) + " " + source[start:]
+        assert_same_parse(source)
+
+
+def test_session_engines_agree():
+    source = "fn main() { let x = ; let y = 2; }\nfn g() { let a = (1 + 2) * 3; }"
+    lalr = ParseSession(engine='lalr').parse(source)
+    rd = ParseSession(engine='rd').parse(source)
+    assert rd == lalr
+
+    tokens = tokenize_source("fn a() {}\nfn b() { let z = [1, 2]; }")
+    assert ParseSession(engine='rd').parse_tokens(tokens, 6) == ParseSession().parse_tokens(tokens, 6)
+
+
+def test_unknown_engine():
+    with pytest.raises(ValueError):
+        ParseSession(engine='earley')
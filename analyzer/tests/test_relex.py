@@ -0,0 +1,125 @@
+# analyzer/tests/test_relex.py
+# Pruebas de la re-tokenización incremental (relex / relex_edit)
+
+import glob
+import os
+import random
+
+import pytest
+
+from analyzer.ply_lexer import relex, relex_edit, tokenize_source
+
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..'))
+SAMPLE_FILES = sorted(glob.glob(os.path.join(project_root, 'docs', 'algoritmos_de_prueba', '*.rs')))
+
+BASE = """fn main() {
+    let a = 1;
+    let texto = "no /* es comentario";
+    let b = a / 2;
+    let c = 'x';
+}
+"""
+
+
+def apply_edits(source, edits):
+    for start, end, replacement in sorted(edits, reverse=True):
+        source = source[:start] + replacement + source[end:]
+    return source
+
+
+def assert_relex_matches(source, edits):
+    result = relex(tokenize_source(source), edits)
+    expected = tokenize_source(apply_edits(source, edits))
+    assert result.source == expected.source
+    assert result == expected
+    assert result.lengths == expected.lengths
+
+
+@pytest.mark.parametrize("edits", [
+    [(BASE.index("1;"), BASE.index("1;") + 1, "42")],           # cambia un número
+    [(BASE.index("a ="), BASE.index("a =") + 1, "abc")],        # extiende un identificador
+    [(BASE.index("1;") + 1, BASE.index("1;") + 1, ".5")],       # NUMBER -> FLOAT
+    [(BASE.index("let b"), BASE.index("let b"), "/* abre\n")],  # comentario sin cerrar
+    [(BASE.index("let c"), BASE.index("let c"), "*/ ")],        # cierra un "/*" previo
+    [(BASE.index("no /*"), BASE.index("no /*"), "\"; ")],       # el "/*" sale del string
+    [(BASE.index("'x'"), BASE.index("'x'") + 3, "'\\n'")],      # literal de carácter
+    [(0, 0, "\n\n")],                                           # desplaza las líneas
+    [(0, len(BASE), "")],                                       # borra todo
+    [(BASE.index("1;"), BASE.index("1;") + 1, "7"),
+     (BASE.index("2;"), BASE.index("2;") + 1, "8\n")],          # varias ediciones
+])
+def test_relex_matches_full_tokenize(edits):
+    assert_relex_matches(BASE, edits)
+
+
+def test_relex_closes_unterminated_comment():
+    source = "let a = 1; /* sin cerrar\nlet b = 2;\nlet c = 3;\n"
+    edits = [(source.index("let c"), source.index("let c"), "*/")]
+    assert_relex_matches(source, edits)
+
+
+def test_relex_edit_rescans_only_the_edited_region():
+    source = "fn main() {\n" + "    let x = 1 + 2;\n" * 500 + "}\n"
+    buffer = tokenize_source(source)
+    position = source.index("1 +", len(source) // 2)
+    result, first, old_stop, new_stop = relex_edit(buffer, position, position + 1, "42")
+    assert result == tokenize_source(result.source)
+    assert old_stop - first <= 8
+    assert new_stop - first <= 8
+
+
+def test_relex_edit_rejects_out_of_range():
+    with pytest.raises(ValueError):
+        relex_edit(tokenize_source("let a = 1;"), 5, 100, "")
+
+
+@pytest.mark.parametrize("seed", range(5))
+def test_relex_random_edits(seed):
+    rng = random.Random(seed)
+    fragments = ["/*", "*/", "\n", "\"", "'", "a", "1", ".5", "/", "*", "//", " ", "{", "}"]
+    with open(rng.choice(SAMPLE_FILES), "r", encoding="utf-8") as f:
+        source = f.read()
+    for _ in range(100):
+        points = sorted(rng.sample(range(len(source) + 1), 4))
+        edits = [
+            (points[0], min(points[1], points[0] + 4), "".join(rng.choices(fragments, k=2))),
+            (points[2], min(points[3], points[2] + 4), rng.choice(fragments)),
+        ]
+        assert_relex_matches(source, edits)
+
+
+@pytest.mark.parametrize("seed", range(3))
+def test_relex_edit_accumulates_pending_shifts(seed):
+    rng = random.Random(seed)
+    fragments = ["/*", "*/", "\n", "\"", "a", "1", " ", "{", "}", "let x = 2;\n"]
+    with open(rng.choice(SAMPLE_FILES), "r", encoding="utf-8") as f:
+        source = f.read()
+    buffer = tokenize_source(source)
+    for step in range(200):
+        start = rng.randrange(len(source) + 1)
+        end = min(len(source), start + rng.randrange(3))
+        replacement = "".join(rng.choices(fragments, k=rng.randrange(3)))
+        source = source[:start] + replacement + source[end:]
+        result, first, _, new_stop = relex_edit(buffer, start, end, replacement)
+        assert result is buffer
+        expected = tokenize_source(source)
+        # Un rango se lee desplazado sin aplicar lo pendiente al resto
+        low = rng.randrange(len(expected) + 1)
+        columns = buffer.columns(low, low + 20)
+        assert columns == expected.columns(low, low + 20)
+        if step % 50 == 49:
+            assert buffer == expected
+            assert not buffer._shifts
+    assert buffer == tokenize_source(source)
+
+
+def test_relex_edit_leaves_the_tail_shift_pending():
+    source = "fn main() {\n" + "    let x = 1 + 2;\n" * 500 + "}\n"
+    buffer = tokenize_source(source)
+    tail = buffer.starts.tolist()[10:]
+    relex_edit(buffer, 0, 0, "\n\n")
+    # La cola no se reescribió; el desplazamiento se aplica al leerla
+    assert buffer._starts.tolist()[10:] == tail
+    assert buffer._shifts == [(0, 2, 2)]
+    assert buffer.starts.tolist()[10:] == [start + 2 for start in tail]
+    assert buffer == tokenize_source("\n\n" + source)
@@ -0,0 +1,369 @@
+# analyzer/tests/test_semantic_analyzer.py
+# Pruebas del recorrido del analizador semántico
+
+import pytest
+
+from analyzer.ast_nodes import NODE_CHILDREN, NODE_FIELDS, Node, make_node
+from analyzer.pipeline import run_pipeline
+from analyzer.ply_parser_final import parse_source
+from analyzer.semantic_analyzer import SemanticAnalyzer, Symbol, SymbolTable
+from analyzer.semantic_types import I32, UNDECLARED, UNKNOWN, TypeTable, named_type
+
+SOURCE = """struct Punto { x: i32, y: i32 }
+
+fn main() {
+    let mut total = 0;
+    for i in 0..10 {
+        total += i * 2;
+    }
+    let p = Punto { x: 1, y: 2 };
+    let f = |a: i32| a + 1;
+    println!("{}", f(total), p.x);
+    while total > 0 && true {
+        total = total - 1;
+    }
+}
+"""
+
+
+class RecordingHandlers:
+    """Tabla de despacho que registra el tipo de cada nodo visitado."""
+
+    def __init__(self, handlers):
+        self.handlers = handlers
+        self.visited = []
+
+    def __getitem__(self, kind):
+        self.visited.append(kind)
+        return self.handlers[kind]
+
+
+class RecordingAnalyzer(SemanticAnalyzer):
+    def __init__(self, handlers=None):
+        super().__init__()
+        self._handlers = RecordingHandlers(handlers or self._handlers)
+        self.visited = self._handlers.visited
+
+
+def preorder(node, out):
+    """Tipos de todos los nodos en preorden."""
+    if isinstance(node, list):
+        for child in node:
+            preorder(child, out)
+    elif isinstance(node, Node):
+        out.append(node.kind)
+        for child in node.as_tuple()[1:]:
+            preorder(child, out)
+    return out
+
+
+def test_child_layouts_name_real_fields():
+    for kind, children in NODE_CHILDREN.items():
+        assert set(children) <= set(NODE_FIELDS[kind]), kind
+
+
+def test_generic_visit_reaches_every_node_in_order():
+    ast, errors = parse_source(SOURCE)
+    assert not errors
+    # Sin reglas: todos los nodos pasan por generic_visit
+    analyzer = RecordingAnalyzer({kind: SemanticAnalyzer.generic_visit for kind in NODE_FIELDS})
+    analyzer.visit(ast)
+    assert analyzer.visited == preorder(ast, [])
+
+
+def test_handlers_are_resolved_once_per_class():
+    first = SemanticAnalyzer()
+    second = SemanticAnalyzer()
+    assert first._handlers is second._handlers
+    recording = RecordingAnalyzer()
+    assert recording._handlers.handlers is not first._handlers
+
+    recording.visit(parse_source(SOURCE)[0])
+    assert recording._handlers['let'] is SemanticAnalyzer.visit_let
+    assert recording._handlers['literal'] is SemanticAnalyzer.generic_visit
+
+
+def test_subclass_handlers_override():
+    class NoLets(SemanticAnalyzer):
+        def visit_let(self, node):
+            pass
+
+    analyzer = NoLets()
+    analyzer.visit(parse_source("fn main() { let x: i32 = true; }")[0])
+    assert analyzer.errors == []
+    assert SemanticAnalyzer()._handlers['let'] is SemanticAnalyzer.visit_let
+
+
+def test_tuple_nodes_of_unknown_kind_are_scanned():
+    analyzer = RecordingAnalyzer()
+    analyzer.visit(('custom', 'nombre', [('break_stmt',)], ('literal', 1, 'NUMBER')))
+    assert analyzer.visited == ['custom', 'break_stmt', 'literal']
+    assert len(analyzer.errors) == 1
+
+
+# --- Recorrido sin recursión ---
+
+DEPTH = 100_000
+
+
+def literal(value, token_type='NUMBER'):
+    return make_node(('literal', value, token_type))
+
+
+def in_main(*statements):
+    return make_node(('program', [make_node(('fn', 'main', [], None, list(statements)))]))
+
+
+def test_deep_binop_chain():
+    # y + 1 + 1 + ... con 100k operadores (árbol recursivo por la izquierda)
+    expr = literal('y', 'IDENT')
+    for _ in range(DEPTH):
+        expr = make_node(('binop', expr, '+', literal(1), 2))
+    analyzer = SemanticAnalyzer()
+    analyzer.visit(in_main(make_node(('let', 'x', None, expr, 2))))
+    undeclared = ("Error Semántico (Línea 2): Identificador no encontrado. "
+                  "La variable 'y' no ha sido declarada en este alcance.")
+    assert analyzer.errors == [undeclared]
+    assert analyzer.get_expression_type(expr, 2) is UNKNOWN
+
+
+def test_deep_nested_blocks():
+    body = [make_node(('assign', 'z', '=', literal(1), 7))]
+    for _ in range(DEPTH):
+        body = [make_node(('if', make_node(('literal', True, 'TRUE')), body))]
+    analyzer = SemanticAnalyzer()
+    analyzer.visit(in_main(*body))
+    assert analyzer.errors == [
+        "Error Semántico (Línea 7): Identificador no encontrado. "
+        "La variable 'z' no ha sido declarada en este alcance."
+    ]
+    assert analyzer.current_node is None
+    assert len(analyzer.symbol_table.scope_stack) == 1
+
+
+def test_deep_generic_nesting():
+    expr = make_node(('break_stmt',))
+    for _ in range(DEPTH):
+        expr = make_node(('function_call', 'f', [literal(1), expr]))
+    tuple_type = literal(1)
+    for _ in range(DEPTH):
+        tuple_type = make_node(('tuple_literal', [tuple_type]))
+    analyzer = SemanticAnalyzer()
+    analyzer.visit(in_main(make_node(('println', '"{}"', [expr]))))
+    assert analyzer.errors == [
+        "Error Semántico: 'break' solo puede usarse dentro de un bucle (while, for, loop)."
+    ]
+    assert str(analyzer.get_expression_type(tuple_type)) == '(' * DEPTH + 'i32' + ')' * DEPTH
+
+
+def test_error_order_matches_source_order():
+    source = """fn main() {
+    let a: i32 = true;
+    while true {
+        let b = a + 1.5;
+        if a > 0 {
+            c = 1;
+            break;
+        }
+    }
+    continue;
+}
+"""
+    analyzer = SemanticAnalyzer()
+    analyzer.visit(parse_source(source)[0])
+    assert [error.split(':')[0] for error in analyzer.errors] == [
+        "Error Semántico (Línea 2)",
+        "Error Semántico (Línea 4)",
+        "Error Semántico (Línea 4)",
+        "Error Semántico (Línea 6)",
+        "Error Semántico",
+    ]
+    assert all(span is not None for span in analyzer.error_spans)
+
+
+def test_deep_expression_through_pipeline():
+    source = "fn main() {\n    let x = " + " + ".join(["1"] * DEPTH) + " + y;\n}\n"
+    result = run_pipeline(source)
+    assert result["syntax_errors"] == []
+    assert "La variable 'y' no ha sido declarada" in str(result["semantic_errors"][0])
+    assert set(result["semantic_error_lines"]) == {2}
+
+
+# --- Memo de tipos ---
+
+class CountingAnalyzer(SemanticAnalyzer):
+    """Cuenta los nodos cuyo tipo se calcula (sin contar los memorizados)."""
+
+    def __init__(self):
+        super().__init__()
+        self.typed = []
+
+    def _expression_type(self, expr_node, line_no):
+        self.typed.append(expr_node)
+        return super()._expression_type(expr_node, line_no)
+
+
+def test_each_expression_is_typed_once():
+    source = "fn main() {\n    let a = 1;\n    let x = a + 2 + 3 * a;\n    let t = (x + 1, [x, 2]);\n}\n"
+    ast = parse_source(source)[0]
+    analyzer = CountingAnalyzer()
+    analyzer.visit(ast)
+    assert analyzer.errors == []
+    assert len(analyzer.typed) == len(set(map(id, analyzer.typed)))
+
+
+def test_duplicate_diagnostics_are_not_repeated():
+    analyzer = SemanticAnalyzer()
+    analyzer.visit(parse_source("fn main() {\n    let x = y + y * 2;\n}\n")[0])
+    undeclared = ("Error Semántico (Línea 2): Identificador no encontrado. "
+                  "La variable 'y' no ha sido declarada en este alcance.")
+    # Una vez por cada uso de 'y', no una vez por cada vez que se tipa
+    assert analyzer.errors[:2] == [undeclared, undeclared]
+    assert len(analyzer.errors) == 3 and 'Operador aritmético' in analyzer.errors[2]
+
+
+def test_memo_is_invalidated_when_symbols_change():
+    source = """fn main() {
+    let mut x: i32;
+    let a = x + 1;
+    x = 2;
+    let b = x + 1;
+}
+"""
+    analyzer = SemanticAnalyzer()
+    analyzer.visit(parse_source(source)[0])
+    # Solo la línea 3: en la 5 'x' ya está inicializada
+    assert [error.split(':')[0] for error in analyzer.errors] == ["Error Semántico (Línea 3)"] * 2
+    assert "no inicializada 'x'" in analyzer.errors[0]
+
+    # El mismo nodo se vuelve a tipar si cambia lo que está declarado
+    expr = make_node(('binop', literal('z', 'IDENT'), '+', literal(1), 1))
+    analyzer = SemanticAnalyzer()
+    assert analyzer.get_expression_type(expr, 1) is UNKNOWN
+    analyzer.symbol_table.add('z', 'i32')
+    assert analyzer.get_expression_type(expr, 1) is I32
+
+
+def test_memo_without_line_still_reports_with_line():
+    analyzer = SemanticAnalyzer()
+    expr = literal('w', 'IDENT')
+    assert analyzer.get_expression_type(expr) is UNDECLARED
+    assert analyzer.errors == []
+    assert analyzer.get_expression_type(expr, 5) is UNDECLARED
+    assert len(analyzer.errors) == 1
+
+
+# --- Tabla de símbolos ---
+
+def test_symbol_table_shadowing_and_exit():
+    table = SymbolTable()
+    table.add('x', 'i32')
+    table.enter_scope()
+    assert table.lookup_current_scope_only('x') is None
+    table.add('x', 'bool', is_mutable=True)
+    assert str(table.lookup('x')[0].type) == 'bool'
+    assert table.lookup('x')[1] == 1
+    table.add('x', 'f64')  # Redeclaración en el mismo scope
+    assert table.lookup_current_scope_only('x').type is named_type('f64')
+    table.add('y', 'i32')
+    table.exit_scope()
+    symbol, scope_level = table.lookup('x')
+    assert (symbol.type, symbol.is_mutable, symbol.is_initialized, symbol.line_declared) == (I32, False, True, None)
+    assert symbol.scope_level == scope_level == 0
+    assert table.lookup('y') == (None, None)
+    # El scope global no se cierra
+    table.exit_scope()
+    assert table.lookup('x')[1] == 0
+
+
+def test_symbol_table_releases_exited_scopes():
+    table = SymbolTable()
+    table.add('total', 'i32')
+    for _ in range(1000):
+        table.enter_scope()
+        table.add('i', 'i32')
+        table.add('total', 'f64')
+        table.exit_scope()
+    assert table.scope_stack == [['total']]
+    assert table.bindings == {'total': [table.lookup('total')[0]]}
+
+
+def test_mark_initialized_targets_declaring_scope():
+    table = SymbolTable()
+    table.add('x', 'i32', is_mutable=True, is_initialized=False)
+    table.enter_scope()
+    symbol, scope_level = table.lookup('x')
+    table.mark_initialized('x', scope_level)
+    table.exit_scope()
+    assert table.lookup('x')[0].is_initialized and symbol is table.lookup('x')[0]
+
+
+def test_inner_scope_variables_are_not_visible_outside():
+    source = """fn main() {
+    let mut x = 1;
+    if true {
+        let mut x = true;
+        let mut y = 2;
+        x = false;
+    }
+    x = 3;
+    y = 4;
+}
+"""
+    analyzer = SemanticAnalyzer()
+    analyzer.visit(parse_source(source)[0])
+    assert analyzer.errors == [
+        "Error Semántico (Línea 9): Identificador no encontrado. "
+        "La variable 'y' no ha sido declarada en este alcance."
+    ]
+    assert analyzer.symbol_table.bindings == {}
+
+
+# --- Tipos internados ---
+
+def test_structurally_equal_types_are_the_same_object():
+    types = TypeTable()
+    f64 = named_type('f64')
+    pair = types.tuple([I32, f64])
+    assert pair is types.tuple((I32, f64))
+    assert types.array(pair, 3) is types.array(types.tuple([I32, f64]), 3)
+    assert types.array(pair, 3) is not types.array(pair, 4)
+    assert types.fn([I32], I32) is types.fn((I32,), I32)
+    assert str(types.array(pair, 3)) == '[(i32, f64); 3]'
+    assert str(types.fn([I32, pair], types.tuple([]))) == 'Fn(i32, (i32, f64)) -> ()'
+    assert f"'{types.tuple([I32])}'" == "'(i32)'"
+
+
+def test_program_type_names_are_interned_per_analysis():
+    first, second = TypeTable(), TypeTable()
+    assert first.named('Punto') is first.named('Punto')
+    assert first.named('Punto') is not second.named('Punto')
+    assert first.named('i32') is second.named('i32') is I32
+    # Los nombres del programa no quedan en el módulo
+    with pytest.raises(KeyError):
+        named_type('Punto')
+
+
+def test_expression_types_are_interned():
+    source = """fn main() {
+    let a = (1, [2.5, 3.5]);
+    let b = (4, [5.5, 6.5]);
+    let mut c = |x: i32| x + 1;
+    c = |y| y * 2;
+}
+"""
+    ast = parse_source(source)[0]
+    analyzer = SemanticAnalyzer()
+    # La reasignación de 'c' compara dos tipos Fn(i32) -> i32 armados por separado
+    analyzer.visit(ast)
+    assert analyzer.errors == []
+    a, b = (analyzer.get_expression_type(let.value) for let in ast.items[0].body[:2])
+    assert a is b and str(a) == '(i32, [f64; 2])'
+
+
+def test_symbols_are_slotted():
+    table = SymbolTable()
+    table.add('x', 'i32', line_no=3)
+    symbol = table.lookup('x')[0]
+    assert type(symbol) is Symbol and not hasattr(symbol, '__dict__')
+    assert symbol.type is I32 and symbol.line_declared == 3
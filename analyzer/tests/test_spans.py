@@ -0,0 +1,96 @@
+# analyzer/tests/test_spans.py
+# Pruebas de las posiciones en el código: rangos de los nodos del AST,
+# LineIndex y columnas de los tokens
+
+import pickle
+
+import pytest
+
+from analyzer.ast_nodes import Node, node_span
+from analyzer.pipeline import run_pipeline
+from analyzer.ply_lexer import LineIndex, tokenize_source
+from analyzer.ply_parser_final import parse_source
+
+SOURCE = """fn main() {
+    let a = 1;
+    let r = 0..10;
+    if a > 0 && a < 5 || false {
+        a = 2;
+    }
+    while a < 10 {
+        a = a + 1;
+    }
+}
+"""
+
+
+def find(node, kind):
+    """Primer nodo de tipo `kind` (recorrido en preorden)."""
+    if isinstance(node, list):
+        for child in node:
+            found = find(child, kind)
+            if found is not None:
+                return found
+    elif isinstance(node, (Node, tuple)):
+        if node[0] == kind:
+            return node
+        return find(list(node[1:]), kind)
+    return None
+
+
+@pytest.mark.parametrize("kind, text", [
+    ("fn", SOURCE.rstrip("\n")),
+    ("let", "let a = 1;"),
+    ("range", "0..10"),
+    ("comparison", "a > 0"),
+    ("and", "a > 0 && a < 5"),
+    ("or", "a > 0 && a < 5 || false"),
+    ("if", "if a > 0 && a < 5 || false {\n        a = 2;\n    }"),
+    ("while_loop", "while a < 10 {\n        a = a + 1;\n    }"),
+    ("binop", "a + 1"),
+])
+def test_node_spans_cover_their_source(kind, text):
+    ast, errors = parse_source(SOURCE)
+    assert not errors
+    node = find(ast, kind)
+    assert isinstance(node, Node)
+    assert SOURCE[node.start:node.end] == text
+
+
+def test_nodes_still_compare_as_tuples():
+    ast, _ = parse_source("fn main() { let x = 1; }")
+    assert ast == ('program', [('fn', 'main', [], None, [('let', 'x', None, ('literal', 1, 'NUMBER'), 1)])])
+
+
+def test_node_pickles_with_span():
+    ast, _ = parse_source(SOURCE)
+    copy = pickle.loads(pickle.dumps(ast))
+    assert copy == ast
+    assert node_span(find(copy, "while_loop")) == node_span(find(ast, "while_loop"))
+
+
+def test_line_index():
+    index = LineIndex("ab\ncd\n\nxyz")
+    assert len(index) == 4
+    assert index.position(0) == (1, 1)
+    assert index.position(2) == (1, 3)
+    assert index.position(3) == (2, 1)
+    assert index.position(6) == (3, 1)
+    assert index.position(9) == (4, 3)
+    assert index.line_of(4) == 2
+    assert index.offset_of(4, 2) == 8
+
+
+def test_token_columns():
+    tokens = tokenize_source("let a = 1;\n  let b = 2;")
+    second_let = tokens[5]
+    assert second_let["value"] == "let"
+    assert (second_let["line"], second_let["column"], second_let["offset"]) == (2, 3, 13)
+    for record in tokens:
+        assert tokens.line_index.position(record["offset"]) == (record["line"], record["column"])
+
+
+def test_semantic_errors_have_lines():
+    result = run_pipeline("fn main() {\n    let a = 1;\n    let b = c + 1;\n}\n")
+    assert result["semantic_errors"]
+    assert result["semantic_error_lines"] == [3] * len(result["semantic_errors"])
@@ -0,0 +1,70 @@
+# analyzer/tests/test_token_buffer.py
+# Pruebas del TokenBuffer (tokens en columnas) devuelto por tokenize_source
+
+import pickle
+
+import pytest
+
+from analyzer.ply_lexer import TokenBuffer, lexer, tokenize_source
+
+CODE = 'fn main() {\n    let s = "hola \\"mundo\\"\\n";\n    let c = \'x\';\n    let f = 2.5;\n    let b = true;\n    let n = 42 $ 1;\n}'
+
+
+def legacy_tokenize(source):
+    """Versión anterior de tokenize_source: un diccionario por token."""
+    lex_instance = lexer.clone()
+    lex_instance.lineno = 1
+    lex_instance.input(source)
+    result = []
+    for tok in iter(lex_instance.token, None):
+        result.append({
+            "type": tok.type,
+            "value": tok.value,
+            "line": tok.lineno,
+            "column": tok.lexpos - (source.rfind("\n", 0, tok.lexpos) + 1) + 1,
+            "offset": tok.lexpos,
+            "literal": getattr(tok, "literal", tok.value),
+        })
+    return result
+
+
+def test_buffer_matches_legacy_records():
+    """El acceso por índice e iteración dan los mismos diccionarios que antes."""
+    buffer = tokenize_source(CODE)
+    expected = legacy_tokenize(CODE)
+
+    assert isinstance(buffer, TokenBuffer)
+    assert len(buffer) == len(expected)
+    assert list(buffer) == expected
+    assert buffer[0] == expected[0]
+    assert buffer[-1] == expected[-1]
+    assert buffer[2:5] == expected[2:5]
+    assert buffer == expected
+
+
+def test_literal_column_is_lazy():
+    buffer = tokenize_source(CODE)
+    assert buffer._literals is None
+
+    literals = buffer.literals
+    assert literals == [tok["literal"] for tok in legacy_tokenize(CODE)]
+    assert buffer.literals is literals
+
+
+def test_error_tokens_are_indexed():
+    buffer = tokenize_source(CODE)
+    errors = buffer.indices_of("ERROR")
+
+    assert len(errors) == 1
+    assert buffer[errors[0]]["value"] == "$"
+    assert buffer.literal_of(errors[0]) == "Illegal character '$'"
+
+
+def test_buffer_is_picklable():
+    buffer = tokenize_source(CODE)
+    assert pickle.loads(pickle.dumps(buffer)) == buffer
+
+
+def test_index_out_of_range():
+    with pytest.raises(IndexError):
+        tokenize_source("let x;")[3]
@@ -0,0 +1,205 @@
+# backend/analysis_pool.py
+# Pool de procesos para ejecutar el análisis fuera del event loop de FastAPI.
+#
+# Configuración (variables de entorno):
+#   ANALYZER_WORKERS      procesos del pool (0 = hilo auxiliar, sin procesos)
+#   ANALYZER_MAX_PENDING  trabajos admitidos a la vez (en curso + en cola)
+#   ANALYZER_JOB_TIMEOUT  segundos máximos de espera por trabajo
+
+import asyncio
+import multiprocessing
+import os
+import signal
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+
+
+class PoolBusyError(RuntimeError):
+    """La cola de trabajos está llena."""
+
+
+class JobTimeoutError(TimeoutError):
+    """Un trabajo superó el tiempo máximo permitido."""
+
+
+class JobError(RuntimeError):
+    """Un trabajo lanzó una excepción; el mensaje es el de la original."""
+
+
+def _warm_worker(pids):
+    """
+    Inicializador de cada proceso: informa su pid por `pids`, importa el
+    lexer y el parser (las tablas LALR se cargan de la caché) y ejecuta un
+    análisis mínimo, de modo que el primer trabajo real no paga el costo de
+    arranque.
+    """
+    pids.put(os.getpid())
+    from analyzer.pipeline import run_pipeline
+
+    run_pipeline("fn main() {}")
+
+
+def _call(func, *args):
+    """
+    Ejecuta `func(*args)` en el proceso del pool. Una excepción se devuelve
+    como JobError: la original puede no poder reconstruirse en el servidor
+    (p. ej. ply.lex.LexError), y entonces el pool entero se daría por roto.
+    """
+    try:
+        return func(*args)
+    except Exception as e:
+        raise JobError(str(e)) from e
+
+
+def _noop():
+    return None
+
+
+class AnalysisPool:
+    """
+    Ejecuta funciones de análisis en un pool de procesos con cola acotada,
+    timeout por trabajo y apagado ordenado.
+    """
+
+    def __init__(self, workers=None, max_pending=None, job_timeout=None):
+        if workers is None:
+            workers = int(os.getenv("ANALYZER_WORKERS", os.cpu_count() or 1))
+        if max_pending is None:
+            max_pending = int(os.getenv("ANALYZER_MAX_PENDING", max(workers, 1) * 4))
+        if job_timeout is None:
+            job_timeout = float(os.getenv("ANALYZER_JOB_TIMEOUT", 30))
+
+        self.workers = workers
+        self.max_pending = max_pending
+        self.job_timeout = job_timeout
+        self._executor = None
+        # Por pool de procesos: (cola por la que sus procesos informan su
+        # pid, pids recibidos)
+        self._pids = {}
+        self._slots = None
+        self._closing = False
+
+    def _new_executor(self):
+        context = multiprocessing.get_context("spawn")
+        pids = context.SimpleQueue()
+        executor = ProcessPoolExecutor(
+            max_workers=self.workers, mp_context=context,
+            initializer=_warm_worker, initargs=(pids,),
+        )
+        self._pids[executor] = (pids, set())
+        return executor
+
+    def _pids_of(self, executor):
+        """Pids de los procesos de `executor` que ya arrancaron."""
+        if executor not in self._pids:
+            return set()
+        pids, received = self._pids[executor]
+        while not pids.empty():
+            received.add(pids.get())
+        return received
+
+    def _forget(self, executor):
+        pids, _ = self._pids.pop(executor, (None, None))
+        if pids is not None:
+            pids.close()
+
+    async def start(self):
+        """Crea el pool y espera a que todos los procesos estén listos."""
+        self._slots = asyncio.Semaphore(self.max_pending)
+        self._closing = False
+        if self.workers <= 0:
+            return
+        self._executor = self._new_executor()
+        loop = asyncio.get_running_loop()
+        await asyncio.gather(
+            *(loop.run_in_executor(self._executor, _noop) for _ in range(self.workers))
+        )
+
+    def _replace_executor(self, executor, terminate=False):
+        """
+        Reemplaza `executor` por un pool nuevo y apaga el anterior sin esperar.
+        Con `terminate` se matan antes sus procesos: es la única forma de
+        cortar un trabajo colgado, y los demás trabajos de ese pool fallan con
+        BrokenProcessPool. Si otro trabajo ya lo reemplazó no hace nada.
+        """
+        if terminate:
+            for pid in self._pids_of(executor):
+                try:
+                    os.kill(pid, signal.SIGTERM)
+                except ProcessLookupError:
+                    pass
+        if executor is not self._executor:
+            return
+        if not self._closing:
+            self._executor = self._new_executor()
+            # Los procesos nuevos arrancan (y se precalientan) ya, no con el
+            # próximo trabajo
+            for _ in range(self.workers):
+                self._executor.submit(_noop)
+        executor.shutdown(wait=False, cancel_futures=True)
+        self._forget(executor)
+
+    def worker_pids(self):
+        """Pids de los procesos del pool (el del servidor si no hay procesos)."""
+        if self._executor is None:
+            return {os.getpid()}
+        return set(self._pids_of(self._executor))
+
+    async def run(self, func, *args):
+        """
+        Ejecuta `func(*args)` en el pool.
+        Lanza PoolBusyError si la cola está llena o el pool se reinició con el
+        trabajo adentro, JobTimeoutError si el trabajo no termina a tiempo y
+        JobError si `func` lanzó una excepción (el pool sigue en uso).
+        """
+        if self._closing or self._slots is None:
+            raise PoolBusyError("El pool de análisis no está disponible")
+        if self._slots.locked():
+            raise PoolBusyError("Demasiados análisis en curso, intente de nuevo")
+
+        await self._slots.acquire()
+        released = False
+
+        def release(_future=None):
+            nonlocal released
+            if not released:
+                released = True
+                self._slots.release()
+
+        loop = asyncio.get_running_loop()
+        executor = self._executor
+        try:
+            future = loop.run_in_executor(executor, _call, func, *args)
+        except BrokenProcessPool:
+            release()
+            self._replace_executor(executor)
+            raise PoolBusyError("El pool de análisis se reinició, intente de nuevo") from None
+
+        # El cupo se libera cuando el trabajo termina (o se cancela al
+        # reemplazar el pool), o al vencer el timeout si se mató su proceso
+        future.add_done_callback(release)
+
+        try:
+            return await asyncio.wait_for(asyncio.shield(future), self.job_timeout)
+        except asyncio.TimeoutError:
+            # Un hilo no se puede interrumpir: sin procesos, el trabajo colgado
+            # sigue ocupando su cupo hasta que termine
+            if executor is not None:
+                self._replace_executor(executor, terminate=True)
+                release()
+            raise JobTimeoutError(
+                f"El análisis superó el tiempo máximo de {self.job_timeout:g} s"
+            ) from None
+        except BrokenProcessPool:
+            # Un proceso murió (p. ej. por memoria o por el timeout de otro
+            # trabajo); se reemplaza el pool
+            self._replace_executor(executor)
+            raise PoolBusyError("El pool de análisis se reinició, intente de nuevo") from None
+
+    async def shutdown(self):
+        """Deja de aceptar trabajos y espera a que terminen los que están en curso."""
+        self._closing = True
+        if self._executor is not None:
+            executor, self._executor = self._executor, None
+            await asyncio.to_thread(executor.shutdown, wait=True)
+            self._forget(executor)
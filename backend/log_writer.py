@@ -0,0 +1,115 @@
+# backend/log_writer.py
+# Escritor de logs en segundo plano.
+#
+# Los endpoints solo encolan (nombre de archivo, función que genera el texto);
+# un hilo dedicado genera los reportes y escribe cada uno en su archivo,
+# fuera del camino de la petición. Si el disco es lento y la cola se llena,
+# la política de desborde decide si el log se descarta ("drop") o si la
+# petición espera un tiempo acotado antes de descartarlo ("block"); la
+# espera ocurre en un hilo auxiliar, así que no bloquea el event loop.
+#
+# Configuración (variables de entorno):
+#   LOG_QUEUE_SIZE      reportes pendientes como máximo
+#   LOG_OVERFLOW        "drop" (por defecto) o "block"
+#   LOG_BLOCK_TIMEOUT   segundos máximos de espera con la política "block"
+
+import asyncio
+import logging
+import os
+import queue
+import threading
+import time
+
+logger = logging.getLogger(__name__)
+
+_STOP = object()
+
+
+class LogWriter:
+    """Cola acotada de reportes de log escritos por un hilo en segundo plano."""
+
+    def __init__(self, max_queue=None, overflow=None, block_timeout=None):
+        if max_queue is None:
+            max_queue = int(os.getenv("LOG_QUEUE_SIZE", 1000))
+        if overflow is None:
+            overflow = os.getenv("LOG_OVERFLOW", "drop")
+        if block_timeout is None:
+            block_timeout = float(os.getenv("LOG_BLOCK_TIMEOUT", 0.05))
+        if overflow not in ("drop", "block"):
+            raise ValueError(f"Política de desborde desconocida: {overflow}")
+
+        self.overflow = overflow
+        self.block_timeout = block_timeout
+        self._queue = queue.Queue(maxsize=max_queue)
+        self._thread = None
+        self.written = 0
+        self.dropped = 0
+        self.failed = 0
+
+    def start(self):
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._run, name="log-writer", daemon=True)
+            self._thread.start()
+
+    async def submit(self, filename, render, *args):
+        """
+        Encola la escritura de `render(*args)` en `filename`.
+        Devuelve False si el reporte se descartó por desborde de la cola.
+        """
+        item = (filename, render, args)
+        try:
+            self._queue.put_nowait(item)
+            return True
+        except queue.Full:
+            if self.overflow != "block":
+                self.dropped += 1
+                return False
+        try:
+            await asyncio.to_thread(self._queue.put, item, timeout=self.block_timeout)
+        except queue.Full:
+            self.dropped += 1
+            return False
+        return True
+
+    def close(self, timeout=5.0):
+        """
+        Escribe lo pendiente y detiene el hilo, esperando `timeout` segundos
+        como máximo en total. Si el disco no vacía la cola a tiempo, el hilo
+        (daemon) queda escribiendo y lo que falte se pierde al salir.
+        """
+        if self._thread is None:
+            return
+        deadline = time.monotonic() + timeout
+        try:
+            self._queue.put(_STOP, timeout=timeout)
+        except queue.Full:
+            pass
+        else:
+            self._thread.join(max(deadline - time.monotonic(), 0))
+        self._thread = None
+
+    def stats(self):
+        return {
+            "pending": self._queue.qsize(),
+            "written": self.written,
+            "dropped": self.dropped,
+            "failed": self.failed,
+        }
+
+    def _run(self):
+        while True:
+            item = self._queue.get()
+            if item is _STOP:
+                return
+            self._write(*item)
+
+    def _write(self, filename, render, args):
+        try:
+            content = render(*args)
+            # "x": nunca se sobrescribe un log existente
+            with open(filename, "x", encoding="utf-8") as f:
+                f.write(content)
+            self.written += 1
+        except Exception:
+            self.failed += 1
+            logger.exception("Error guardando log %s", filename)
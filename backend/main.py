@@ -1,3 +1,7 @@
+import asyncio
+from contextlib import asynccontextmanager
+import functools
+import itertools
 from fastapi import FastAPI, HTTPException
 from fastapi.middleware.cors import CORSMiddleware
 from pydantic import BaseModel
@@ -9,14 +13,42 @@ import sys
 # Agregar el directorio analyzer al path
 sys.path.append(os.path.join(os.path.dirname(__file__), ".."))
 
-from analyzer.ply_lexer import tokenize_source
-from analyzer.ply_parser_final import parse_source, log_syntax_errors
-from analyzer.semantic_analyzer import semantic, log_semantic_errors
+from analyzer.ply_parser_final import format_syntax_report
+from analyzer.semantic_analyzer import format_semantic_report
+from analyzer.pipeline import MAX_ERRORS, run_stage_with_cache_stats
+from backend.analysis_pool import AnalysisPool, JobError, JobTimeoutError, PoolBusyError
+from backend.log_writer import LogWriter
+from backend.result_cache import ResultCache
+
+# El análisis es CPU-bound: se ejecuta en un pool de procesos para no
+# bloquear el event loop (ver analysis_pool.py para la configuración).
+analysis_pool = AnalysisPool()
+
+# Resultados ya calculados, compartidos por todos los endpoints /analyze
+result_cache = ResultCache()
+
+# Los reportes se generan y escriben en segundo plano (ver log_writer.py)
+log_writer = LogWriter()
+
+# Caché de items del parser de cada proceso del pool, por pid: cada análisis
+# trae la de su proceso junto con el resultado (ver /cache/stats)
+parse_cache_snapshots = {}
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    log_writer.start()
+    await analysis_pool.start()
+    yield
+    await analysis_pool.shutdown()
+    await asyncio.to_thread(log_writer.close)
+
 
 app = FastAPI(
     title="Analizador Léxico, Sintáctico y Semántico - Rust",
     description="API para análisis de código Rust usando PLY",
     version="1.0.0",
+    lifespan=lifespan,
 )
 
 # Configurar CORS
@@ -42,18 +74,26 @@ class CodeInput(BaseModel):
     developer: str = (
         "Alvasconv"  # MODIFICAR PARA QUE SE REGISTREN QUIEN REALIZO LAS PRUEBAS
     )
+    # Idioma de los mensajes de error semánticos ("es" o "en")
+    locale: str = "es"
+    # Máximo de errores por fase; None usa el del servidor (ver error_budget)
+    max_errors: Optional[int] = None
 
 
 class TokenOutput(BaseModel):
     type: str
     value: str
     line: int
+    column: Optional[int] = None
 
 
 class ErrorOutput(BaseModel):
     type: str
     message: str
     line: Optional[int] = None
+    column: Optional[int] = None
+    # Código de la regla (solo errores semánticos)
+    code: Optional[str] = None
 
 
 class AnalysisResponse(BaseModel):
@@ -62,6 +102,8 @@ class AnalysisResponse(BaseModel):
     errors: list[ErrorOutput] = []
     ast: Optional[str] = None
     log_file: Optional[str] = None
+    # Alguna fase se cortó al llegar al máximo de errores
+    truncated: bool = False
 
 
 # Directorio de logs
@@ -69,17 +111,167 @@ LOGS_DIR = os.path.join(os.path.dirname(__file__), "..", "logs")
 os.makedirs(LOGS_DIR, exist_ok=True)
 
 
+def token_outputs(tokens) -> list:
+    """
+    Convierte el TokenBuffer del lexer en la lista de TokenOutput de la
+    respuesta, leyendo sus columnas directamente (los valores ya tienen el
+    tipo correcto, así que se omite la validación por token).
+    """
+    line_starts = tokens.line_index.starts
+    return [
+        TokenOutput.model_construct(
+            type=type_name, value=value, line=line, column=start - line_starts[line - 1] + 1
+        )
+        for type_name, value, line, start in zip(
+            tokens.iter_types(), tokens.iter_values(), tokens.lines, tokens.starts
+        )
+    ]
+
+
+def semantic_error_outputs(errors, locale: str) -> list:
+    """
+    Convierte los Diagnostic del análisis semántico en ErrorOutput, con el
+    mensaje en `locale` y la línea y columna donde empieza el nodo del error.
+    """
+    outputs = []
+    for error in errors:
+        line, column = error.position or (error.line, None)
+        outputs.append(
+            ErrorOutput(
+                type="Error Semántico", message=error.render(locale),
+                line=line, column=column, code=error.code,
+            )
+        )
+    return outputs
+
+
+_log_sequence = itertools.count()
+
+
 def generate_log_filename(analysis_type: str, developer: str) -> str:
-    """Genera nombre de archivo de log según el formato especificado"""
-    timestamp = datetime.now().strftime("%d-%m-%Y-%H:%M")
-    filename = f"{analysis_type}-{developer}-{timestamp}.txt"
+    """
+    Genera nombre de archivo de log según el formato especificado.
+    El sufijo (microsegundos + secuencia del proceso) evita que dos análisis
+    en el mismo minuto se sobrescriban.
+    """
+    timestamp = datetime.now().strftime("%d-%m-%Y-%H_%M_%S-%f")
+    filename = f"{analysis_type}-{developer}-{timestamp}-{os.getpid()}-{next(_log_sequence)}.txt"
     return os.path.join(LOGS_DIR, filename)
 
 
-def save_log(filename: str, content: str):
-    """Guarda el contenido del análisis en un archivo de log"""
-    with open(filename, "w", encoding="utf-8") as f:
-        f.write(content)
+def format_lexico_report(code: str, developer: str, tokens: list, error_list: list) -> str:
+    """Construye el contenido del log del análisis léxico"""
+    lines = [
+        "=== ANÁLISIS LÉXICO (PLY) ===\n",
+        f"Desarrollador: {developer}\n",
+        f"Fecha: {datetime.now().strftime('%d-%m-%Y %H:%M:%S')}\n\n",
+        f"CÓDIGO:\n{code}\n\n",
+        "TOKENS:\n",
+    ]
+    for tok in tokens:
+        lines.append(f"  {tok['type']:20} | {tok['value']:30} | Línea {tok['line']}\n")
+
+    if error_list:
+        lines.append(f"\nERRORES ENCONTRADOS: {len(error_list)}\n")
+        for err in error_list:
+            lines.append(f"  Línea {err.line}: {err.message}\n")
+    else:
+        lines.append("\n✓ Análisis léxico completado sin errores\n")
+    return "".join(lines)
+
+
+async def save_log(analysis_type: str, developer: str, render, *args) -> Optional[str]:
+    """
+    Encola la escritura del log y devuelve el nombre del archivo asignado,
+    o None si el log se descartó porque la cola de escritura estaba llena.
+    """
+    filename = generate_log_filename(analysis_type, developer)
+    if not await log_writer.submit(filename, render, *args):
+        return None
+    return os.path.basename(filename)
+
+
+def error_budget(requested: Optional[int]) -> int:
+    """
+    Máximo de errores por fase de un análisis: el pedido, sin superar el del
+    servidor (MAX_ERRORS) cuando este tiene límite. Sin pedido, o con un
+    valor <= 0, se usa el del servidor.
+    """
+    if requested is None or requested <= 0:
+        return MAX_ERRORS
+    if MAX_ERRORS > 0:
+        return min(requested, MAX_ERRORS)
+    return requested
+
+
+async def run_analysis(stage: str, input_data: CodeInput) -> dict:
+    """Ejecuta una etapa de análisis en el pool y traduce sus errores a HTTP"""
+    try:
+        result, parse_cache = await analysis_pool.run(
+            run_stage_with_cache_stats, stage, input_data.code,
+            error_budget(input_data.max_errors),
+        )
+    except PoolBusyError as e:
+        raise HTTPException(status_code=503, detail=str(e))
+    except JobTimeoutError as e:
+        raise HTTPException(status_code=504, detail=str(e))
+    except JobError as e:
+        raise HTTPException(status_code=500, detail=str(e))
+    if parse_cache is not None:
+        parse_cache_snapshots[parse_cache["pid"]] = parse_cache
+    return result
+
+
+def parse_cache_summary() -> Optional[dict]:
+    """
+    Caché de items de los procesos vivos del pool, cada una como quedó tras
+    su último análisis, y la suma de todas. None si ningún proceso informó
+    todavía (o la caché está desactivada).
+    """
+    pids = analysis_pool.worker_pids()
+    for pid in parse_cache_snapshots.keys() - pids:
+        # Proceso reemplazado al reiniciar el pool
+        del parse_cache_snapshots[pid]
+    workers = [parse_cache_snapshots[pid] for pid in sorted(parse_cache_snapshots)]
+    if not workers:
+        return None
+    total = {
+        field: sum(worker[field] for worker in workers)
+        for field in ("hits", "misses", "evictions", "entries", "bytes", "max_bytes")
+    }
+    lookups = total["hits"] + total["misses"]
+    total["hit_rate"] = total["hits"] / lookups if lookups else 0.0
+    return {"workers": workers, "total": total}
+
+
+def cached_analysis(analysis_type: str):
+    """
+    Decorador para los endpoints /analyze: si el mismo código ya se analizó con
+    este tipo de análisis, devuelve la respuesta cacheada sin repetir el
+    trabajo ni escribir un nuevo log. Por eso un acierto trae `log_file` en
+    None: el log guardado es el de otra petición (con su desarrollador).
+    """
+
+    def decorator(handler):
+        @functools.wraps(handler)
+        async def wrapper(input_data: CodeInput):
+            # Los mensajes semánticos dependen del idioma pedido y los errores
+            # informados, del máximo por fase
+            budget = error_budget(input_data.max_errors)
+            key = result_cache.key(
+                f"{analysis_type}/{input_data.locale}/{budget}", input_data.code
+            )
+            cached = result_cache.get(key)
+            if cached is not None:
+                return cached.model_copy(update={"log_file": None})
+
+            response = await handler(input_data)
+            result_cache.put(key, response, len(response.model_dump_json()))
+            return response
+
+        return wrapper
+
+    return decorator
 
 
 @app.get("/")
@@ -91,76 +283,71 @@ async def root():
             "/analyze/sintactico": "POST - Análisis sintáctico",
             "/analyze/semantico": "POST - Análisis semántico",
             "/analyze/completo": "POST - Análisis completo",
+            "/cache/stats": "GET - Estadísticas de la caché de resultados",
+            "/logs/stats": "GET - Estado del escritor de logs",
         },
     }
 
 
+@app.get("/cache/stats")
+async def cache_stats():
+    return dict(result_cache.stats(), parse_cache=parse_cache_summary())
+
+
+@app.get("/logs/stats")
+async def logs_stats():
+    return log_writer.stats()
+
+
 @app.post("/analyze/lexico", response_model=AnalysisResponse)
+@cached_analysis("lexico")
 async def analyze_lexico(input_data: CodeInput):
     """Ejecuta análisis léxico del código Rust"""
     try:
         # Usar el nuevo lexer basado en PLY
-        tokens = tokenize_source(input_data.code)
-
-        token_list = []
-        error_list = []
-        log_content = f"=== ANÁLISIS LÉXICO (PLY) ===\n"
-        log_content += f"Desarrollador: {input_data.developer}\n"
-        log_content += f"Fecha: {datetime.now().strftime('%d-%m-%Y %H:%M:%S')}\n\n"
-        log_content += f"CÓDIGO:\n{input_data.code}\n\n"
-        log_content += "TOKENS:\n"
-
-        for tok in tokens:
-            token_list.append(
-                TokenOutput(type=tok["type"], value=str(tok["value"]), line=tok["line"])
-            )
-            log_content += (
-                f"  {tok['type']:20} | {tok['value']:30} | Línea {tok['line']}\n"
-            )
+        result = await run_analysis("lexico", input_data)
+        tokens = result["tokens"]
 
-            # El nuevo lexer no genera tokens de ERROR, pero se mantiene la lógica por si se añade en el futuro
-            if tok["type"] == "ERROR":
-                error_list.append(
-                    ErrorOutput(
-                        type="Error Léxico",
-                        message=str(tok.get("literal", tok["value"])),
-                        line=tok["line"],
-                    )
-                )
-
-        if error_list:
-            log_content += f"\nERRORES ENCONTRADOS: {len(error_list)}\n"
-            for err in error_list:
-                log_content += f"  Línea {err.line}: {err.message}\n"
-        else:
-            log_content += "\n✓ Análisis léxico completado sin errores\n"
+        token_list = token_outputs(tokens)
+        error_list = [
+            ErrorOutput(
+                type="Error Léxico",
+                message=str(tokens.literal_of(i)),
+                line=tokens.lines[i],
+            )
+            for i in tokens.indices_of("ERROR")
+        ]
 
-        # Guardar log
-        log_filename = generate_log_filename("lexico", input_data.developer)
-        save_log(log_filename, log_content)
+        # Guardar log (en segundo plano)
+        log_filename = await save_log(
+            "lexico", input_data.developer,
+            format_lexico_report, input_data.code, input_data.developer, tokens, error_list,
+        )
 
         return AnalysisResponse(
             status="success" if not error_list else "error",
             tokens=token_list,
             errors=error_list,
-            log_file=os.path.basename(log_filename),
+            log_file=log_filename,
+            truncated=result["truncated"],
         )
 
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
 
 @app.post("/analyze/sintactico", response_model=AnalysisResponse)
+@cached_analysis("sintactico")
 async def analyze_sintactico(input_data: CodeInput):
     """Ejecuta análisis sintáctico del código Rust"""
     try:
-        tokens = tokenize_source(input_data.code)
-        ast, syntax_errors = parse_source(input_data.code)
+        # Un solo lexeo: los mismos tokens alimentan el listado y el parser
+        result = await run_analysis("sintactico", input_data)
+        tokens, ast, syntax_errors = result["tokens"], result["ast"], result["syntax_errors"]
 
-        token_list = [
-            TokenOutput(type=t["type"], value=str(t["value"]), line=t["line"])
-            for t in tokens
-        ]
+        token_list = token_outputs(tokens)
         error_list = [
             ErrorOutput(
                 type="Error Sintáctico", message=err["message"], line=err["line"]
@@ -168,28 +355,35 @@ async def analyze_sintactico(input_data: CodeInput):
             for err in syntax_errors
         ]
 
-        # Guardar log
-        log_filename = generate_log_filename("sintactico", input_data.developer)
-        log_syntax_errors(log_filename, syntax_errors, input_data.code)
+        # Guardar log (en segundo plano)
+        log_filename = await save_log(
+            "sintactico", input_data.developer,
+            format_syntax_report, syntax_errors, input_data.code,
+        )
 
         return AnalysisResponse(
             status="success" if not error_list else "error",
             tokens=token_list,
             errors=error_list,
             ast=str(ast) if ast else None,
-            log_file=os.path.basename(log_filename),
+            log_file=log_filename,
+            truncated=result["truncated"],
         )
 
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
 
 @app.post("/analyze/semantico", response_model=AnalysisResponse)
+@cached_analysis("semantico")
 async def analyze_semantico(input_data: CodeInput):
     """Ejecuta análisis semántico del código Rust"""
     try:
         # Primero hacer análisis sintáctico para obtener el AST
-        ast, syntax_errors = parse_source(input_data.code)
+        result = await run_analysis("semantico", input_data)
+        ast, syntax_errors = result["ast"], result["syntax_errors"]
 
         if syntax_errors or not ast:
             error_list = [
@@ -200,51 +394,44 @@ async def analyze_semantico(input_data: CodeInput):
                 )
                 for err in syntax_errors
             ]
-            return AnalysisResponse(status="error", errors=error_list, log_file=None)
+            return AnalysisResponse(
+                status="error", errors=error_list, log_file=None,
+                truncated=result["truncated"],
+            )
 
-        # Luego hacer análisis semántico
-        try:
-            semantic_errors = semantic(ast) if ast else []
-        except Exception as sem_error:
-            semantic_errors = [f"Error en análisis semántico: {str(sem_error)}"]
+        # Luego el análisis semántico (ya ejecutado en el pool)
+        semantic_errors = result["semantic_errors"]
 
-        error_list = [
-            ErrorOutput(type="Error Semántico", message=err, line=None)
-            for err in semantic_errors
-        ]
+        error_list = semantic_error_outputs(semantic_errors, input_data.locale)
 
-        # Guardar log
-        log_filename = generate_log_filename("semantico", input_data.developer)
-        try:
-            log_semantic_errors(
-                log_filename, semantic_errors, input_data.code, input_data.developer
-            )
-        except Exception as log_error:
-            print(f"Error guardando log: {str(log_error)}")
+        # Guardar log (en segundo plano)
+        log_filename = await save_log(
+            "semantico", input_data.developer,
+            format_semantic_report, semantic_errors, input_data.code, input_data.developer,
+        )
 
         return AnalysisResponse(
             status="success" if not error_list else "error",
             errors=error_list,
-            log_file=os.path.basename(log_filename),
+            log_file=log_filename,
+            truncated=result["truncated"],
         )
 
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
 
 @app.post("/analyze/completo", response_model=AnalysisResponse)
+@cached_analysis("completo")
 async def analyze_completo(input_data: CodeInput):
     """Ejecuta análisis completo (léxico + sintáctico + semántico)"""
     try:
-        # 1. Análisis léxico
-        tokens = tokenize_source(input_data.code)
-        token_list = [
-            TokenOutput(type=t["type"], value=str(t["value"]), line=t["line"])
-            for t in tokens
-        ]
-
-        # 2. Análisis sintáctico
-        ast, syntax_errors = parse_source(input_data.code)
+        # 1. Análisis léxico y 2. sintáctico sobre el mismo flujo de tokens
+        result = await run_analysis("completo", input_data)
+        tokens, ast, syntax_errors = result["tokens"], result["ast"], result["syntax_errors"]
+        token_list = token_outputs(tokens)
 
         if syntax_errors or not ast:
             error_list = [
@@ -256,37 +443,32 @@ async def analyze_completo(input_data: CodeInput):
                 for err in syntax_errors
             ]
             return AnalysisResponse(
-                status="error", tokens=token_list, errors=error_list, log_file=None
+                status="error", tokens=token_list, errors=error_list, log_file=None,
+                truncated=result["truncated"],
             )
 
-        # 3. Análisis semántico
-        try:
-            semantic_errors = semantic(ast) if ast else []
-        except Exception as sem_error:
-            semantic_errors = [f"Error en análisis semántico: {str(sem_error)}"]
+        # 3. Análisis semántico (ya ejecutado por el pipeline)
+        semantic_errors = result["semantic_errors"]
 
-        error_list = [
-            ErrorOutput(type="Error Semántico", message=err, line=None)
-            for err in semantic_errors
-        ]
+        error_list = semantic_error_outputs(semantic_errors, input_data.locale)
 
-        # Guardar log
-        log_filename = generate_log_filename("completo", input_data.developer)
-        try:
-            log_semantic_errors(
-                log_filename, semantic_errors, input_data.code, input_data.developer
-            )
-        except Exception as log_error:
-            print(f"Error guardando log: {str(log_error)}")
+        # Guardar log (en segundo plano)
+        log_filename = await save_log(
+            "completo", input_data.developer,
+            format_semantic_report, semantic_errors, input_data.code, input_data.developer,
+        )
 
         return AnalysisResponse(
             status="success" if not error_list else "error",
             tokens=token_list,
             errors=error_list,
             ast=str(ast) if ast else None,
-            log_file=os.path.basename(log_filename),
+            log_file=log_filename,
+            truncated=result["truncated"],
         )
 
+    except HTTPException:
+        raise
     except Exception as e:
         print(f"ERROR en /analyze/completo: {e}")
         import traceback
@@ -0,0 +1,93 @@
+# backend/result_cache.py
+# Caché de resultados de análisis direccionada por contenido.
+#
+# La clave es (tipo de análisis, sha256 del código), así que el mismo buffer
+# enviado varias veces (cambio de foco, reintentos, varias pestañas) se
+# responde sin volver a lexear, parsear ni escribir logs.
+#
+# Configuración (variables de entorno):
+#   RESULT_CACHE_MAX_BYTES  tamaño máximo aproximado de la caché (bytes)
+#   RESULT_CACHE_TTL        segundos que vive cada entrada
+
+import hashlib
+import os
+import time
+from collections import OrderedDict
+
+
+class ResultCache:
+    """LRU acotada por tamaño en bytes con expiración por TTL."""
+
+    def __init__(self, max_bytes=None, ttl=None, clock=time.monotonic):
+        if max_bytes is None:
+            max_bytes = int(os.getenv("RESULT_CACHE_MAX_BYTES", 64 * 1024 * 1024))
+        if ttl is None:
+            ttl = float(os.getenv("RESULT_CACHE_TTL", 300))
+
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self._clock = clock
+        # clave -> (valor, tamaño, instante de expiración)
+        self._entries = OrderedDict()
+        self.current_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    @staticmethod
+    def key(analysis_type, source):
+        """Clave de caché para un tipo de análisis y un código fuente."""
+        return analysis_type, hashlib.sha256(source.encode("utf-8")).hexdigest()
+
+    def get(self, key):
+        """Devuelve el valor cacheado o None (entrada ausente o expirada)."""
+        entry = self._entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return None
+
+        value, size, expires_at = entry
+        if expires_at <= self._clock():
+            self._remove(key)
+            self.misses += 1
+            return None
+
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return value
+
+    def put(self, key, value, size):
+        """Guarda `value` ocupando `size` bytes, expulsando las entradas más antiguas."""
+        if size > self.max_bytes:
+            return
+        if key in self._entries:
+            self._remove(key)
+
+        self._entries[key] = (value, size, self._clock() + self.ttl)
+        self.current_bytes += size
+
+        while self.current_bytes > self.max_bytes:
+            oldest = next(iter(self._entries))
+            self._remove(oldest)
+            self.evictions += 1
+
+    def clear(self):
+        self._entries.clear()
+        self.current_bytes = 0
+
+    def stats(self):
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+            "evictions": self.evictions,
+            "entries": len(self._entries),
+            "bytes": self.current_bytes,
+            "max_bytes": self.max_bytes,
+            "ttl_seconds": self.ttl,
+        }
+
+    def _remove(self, key):
+        _value, size, _expires_at = self._entries.pop(key)
+        self.current_bytes -= size
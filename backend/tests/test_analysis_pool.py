@@ -0,0 +1,123 @@
+# backend/tests/test_analysis_pool.py
+# Pruebas del pool de análisis: cola acotada, timeout con reciclado del pool,
+# errores de un trabajo, reemplazo de un pool roto y apagado ordenado
+
+import asyncio
+import os
+import threading
+import time
+
+import pytest
+from fastapi.testclient import TestClient
+
+from analyzer.pipeline import run_stage_with_cache_stats
+from backend import main
+from backend.analysis_pool import AnalysisPool, JobError, JobTimeoutError, PoolBusyError
+from backend.result_cache import ResultCache
+
+
+def test_full_queue_is_rejected():
+    async def scenario():
+        pool = AnalysisPool(workers=0, max_pending=1, job_timeout=5)
+        await pool.start()
+        release = threading.Event()
+        running = asyncio.create_task(pool.run(release.wait, 5))
+        await asyncio.sleep(0.05)
+        with pytest.raises(PoolBusyError):
+            await pool.run(os.getpid)
+        release.set()
+        assert await running is True
+        # Terminado el trabajo, su cupo vuelve a estar libre
+        assert await pool.run(os.getpid) == os.getpid()
+        await pool.shutdown()
+
+    asyncio.run(scenario())
+
+
+def test_timeout_recycles_the_pool():
+    async def scenario():
+        pool = AnalysisPool(workers=1, max_pending=1, job_timeout=0.5)
+        await pool.start()
+        stuck = pool._executor
+        worker = await pool.run(os.getpid)
+        assert pool.worker_pids() == {worker}
+        processes = list(stuck._processes.values())
+        with pytest.raises(JobTimeoutError):
+            await pool.run(time.sleep, 60)
+        # El proceso colgado se terminó, el pool es otro y el cupo está libre
+        assert pool._executor is not stuck
+        for process in processes:
+            process.join(5)
+            assert process.exitcode is not None
+        # El primer trabajo del pool nuevo espera a que su proceso arranque
+        pool.job_timeout = 30
+        replacement = await pool.run(os.getpid)
+        assert replacement != worker
+        assert pool.worker_pids() == {replacement}
+        await pool.shutdown()
+
+    asyncio.run(scenario())
+
+
+def test_failing_job_does_not_break_the_pool():
+    async def scenario():
+        pool = AnalysisPool(workers=1, max_pending=2, job_timeout=30)
+        await pool.start()
+        executor = pool._executor
+        worker = await pool.run(os.getpid)
+        # "vec!" lanza ply.lex.LexError, que no se puede reconstruir fuera
+        # del proceso: llega como JobError con el mismo mensaje
+        for _ in range(2):
+            with pytest.raises(JobError, match="VEC_CREATE"):
+                await pool.run(run_stage_with_cache_stats, "lexico", "vec![1]")
+        assert pool._executor is executor
+        assert await pool.run(os.getpid) == worker
+        await pool.shutdown()
+
+    asyncio.run(scenario())
+
+
+def test_failing_job_is_a_server_error(monkeypatch, tmp_path):
+    monkeypatch.setattr(main, "analysis_pool", AnalysisPool(workers=1, max_pending=2, job_timeout=30))
+    monkeypatch.setattr(main, "parse_cache_snapshots", {})
+    monkeypatch.setattr(main, "result_cache", ResultCache(max_bytes=1 << 20, ttl=60))
+    monkeypatch.setattr(main, "LOGS_DIR", str(tmp_path))
+    with TestClient(main.app) as client:
+        executor = main.analysis_pool._executor
+        responses = [client.post("/analyze/lexico", json={"code": "vec![1]"}) for _ in range(2)]
+        assert main.analysis_pool._executor is executor
+        ok = client.post("/analyze/lexico", json={"code": "fn main() {}"})
+    assert [response.status_code for response in responses] == [500, 500]
+    assert "VEC_CREATE" in responses[0].json()["detail"]
+    assert ok.status_code == 200
+
+
+def test_broken_pool_is_replaced_and_shut_down():
+    async def scenario():
+        pool = AnalysisPool(workers=1, max_pending=2, job_timeout=30)
+        await pool.start()
+        broken = pool._executor
+        with pytest.raises(PoolBusyError):
+            await pool.run(os._exit, 1)
+        assert pool._executor is not broken
+        assert broken._shutdown_thread
+        assert await pool.run(os.getpid) != os.getpid()
+        await pool.shutdown()
+
+    asyncio.run(scenario())
+
+
+def test_shutdown_waits_for_running_jobs():
+    async def scenario():
+        pool = AnalysisPool(workers=1, max_pending=2, job_timeout=30)
+        await pool.start()
+        running = asyncio.create_task(pool.run(time.sleep, 0.5))
+        await asyncio.sleep(0.1)
+        started = time.perf_counter()
+        await pool.shutdown()
+        assert time.perf_counter() - started > 0.2
+        assert await running is None
+        with pytest.raises(PoolBusyError):
+            await pool.run(os.getpid)
+
+    asyncio.run(scenario())
@@ -0,0 +1,127 @@
+# backend/tests/test_log_writer.py
+# Pruebas del escritor de logs en segundo plano: orden de escritura,
+# políticas de desborde, contadores y cierre
+
+import asyncio
+import threading
+import time
+
+from backend.log_writer import _STOP, LogWriter
+
+
+def submit_all(writer, items):
+    async def scenario():
+        return [await writer.submit(*item) for item in items]
+
+    return asyncio.run(scenario())
+
+
+def test_reports_are_written_in_order(tmp_path):
+    writer = LogWriter(max_queue=10)
+    order = []
+
+    def render(text):
+        order.append(text)
+        return text
+
+    names = [tmp_path / f"log-{i}.txt" for i in range(7)]
+    assert all(submit_all(writer, [(name, render, name.name) for name in names]))
+    writer._queue.put(_STOP)
+    writer._run()
+    assert order == [name.name for name in names]
+    assert [name.read_text(encoding="utf-8") for name in names] == [name.name for name in names]
+    assert writer.stats() == {"pending": 0, "written": 7, "dropped": 0, "failed": 0}
+
+
+def test_drop_policy_discards_when_full(tmp_path):
+    writer = LogWriter(max_queue=2, overflow="drop")
+    items = [(tmp_path / f"log-{i}.txt", str, i) for i in range(3)]
+    assert submit_all(writer, items) == [True, True, False]
+    assert writer.stats() == {"pending": 2, "written": 0, "dropped": 1, "failed": 0}
+
+
+def test_block_policy_waits_off_the_event_loop(tmp_path):
+    writer = LogWriter(max_queue=1, overflow="block", block_timeout=0.3)
+
+    async def scenario():
+        assert await writer.submit(tmp_path / "a.txt", str, "a")
+        ticks = 0
+
+        async def ticker():
+            nonlocal ticks
+            while True:
+                ticks += 1
+                await asyncio.sleep(0.01)
+
+        task = asyncio.create_task(ticker())
+        started = time.perf_counter()
+        accepted = await writer.submit(tmp_path / "b.txt", str, "b")
+        waited = time.perf_counter() - started
+        task.cancel()
+        return accepted, waited, ticks
+
+    accepted, waited, ticks = asyncio.run(scenario())
+    assert not accepted and waited >= 0.25
+    # El event loop siguió atendiendo otras tareas durante la espera
+    assert ticks > 5
+    assert writer.stats()["dropped"] == 1
+
+
+def test_block_policy_accepts_when_space_frees(tmp_path):
+    writer = LogWriter(max_queue=1, overflow="block", block_timeout=5)
+    first, second = tmp_path / "a.txt", tmp_path / "b.txt"
+    assert submit_all(writer, [(first, str, "a")]) == [True]
+    threading.Timer(0.1, writer.start).start()
+    assert submit_all(writer, [(second, str, "b")]) == [True]
+    writer.close()
+    assert first.read_text(encoding="utf-8") == "a"
+    assert second.read_text(encoding="utf-8") == "b"
+
+
+def test_failures_are_counted(tmp_path, caplog):
+    writer = LogWriter()
+    existing = tmp_path / "existente.txt"
+    existing.write_text("previo", encoding="utf-8")
+
+    def broken():
+        raise ValueError("reporte roto")
+
+    writer.start()
+    submit_all(writer, [(existing, str, "nuevo"), (tmp_path / "roto.txt", broken),
+                        (tmp_path / "ok.txt", str, "ok")])
+    writer.close()
+    # Un log existente no se sobrescribe
+    assert existing.read_text(encoding="utf-8") == "previo"
+    assert not (tmp_path / "roto.txt").exists()
+    assert writer.stats() == {"pending": 0, "written": 1, "dropped": 0, "failed": 2}
+    # Cada fallo queda en el log del servidor con su traza
+    failures = [record for record in caplog.records if record.name == "backend.log_writer"]
+    assert len(failures) == 2 and all(record.exc_info for record in failures)
+
+
+def test_close_writes_pending_reports(tmp_path):
+    writer = LogWriter()
+    names = [tmp_path / f"log-{i}.txt" for i in range(5)]
+    submit_all(writer, [(name, str, "x") for name in names])
+    writer.start()
+    writer.close()
+    assert all(name.exists() for name in names)
+    assert writer.stats()["written"] == 5
+
+
+def test_close_does_not_hang_with_a_full_queue(tmp_path):
+    writer = LogWriter(max_queue=1)
+    release = threading.Event()
+
+    def slow(text):
+        release.wait(5)
+        return text
+
+    writer.start()
+    submit_all(writer, [(tmp_path / "lento.txt", slow, "a")])
+    time.sleep(0.05)  # El hilo ya tomó el primer reporte y está escribiendo
+    submit_all(writer, [(tmp_path / "b.txt", str, "b")])
+    started = time.perf_counter()
+    writer.close(timeout=0.2)
+    assert time.perf_counter() - started < 1
+    release.set()
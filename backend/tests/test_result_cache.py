@@ -0,0 +1,122 @@
+# backend/tests/test_result_cache.py
+# Pruebas de la caché de resultados: LRU, límite en bytes, TTL, contadores,
+# un acierto en un endpoint /analyze y las estadísticas de /cache/stats
+
+import os
+
+from fastapi.testclient import TestClient
+
+from analyzer.pipeline import run_stage_with_cache_stats
+from backend import main
+from backend.analysis_pool import AnalysisPool
+from backend.log_writer import LogWriter
+from backend.result_cache import ResultCache
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_least_recently_used_entry_is_evicted():
+    cache = ResultCache(max_bytes=30, ttl=60)
+    cache.put("a", 1, 10)
+    cache.put("b", 2, 10)
+    cache.put("c", 3, 10)
+    assert cache.get("a") == 1  # "b" pasa a ser la más antigua
+    cache.put("d", 4, 10)
+    assert cache.get("b") is None
+    assert [cache.get(key) for key in "acd"] == [1, 3, 4]
+    assert cache.stats()["evictions"] == 1
+
+
+def test_size_bound_in_bytes():
+    cache = ResultCache(max_bytes=100, ttl=60)
+    cache.put("grande", "x", 101)  # Más grande que toda la caché: no se guarda
+    assert cache.get("grande") is None
+    cache.put("a", 1, 60)
+    cache.put("b", 2, 50)  # Expulsa "a" para no pasar de 100 bytes
+    assert cache.get("a") is None and cache.get("b") == 2
+    cache.put("b", 3, 20)  # Reemplazar descuenta el tamaño anterior
+    assert cache.stats()["bytes"] == 20 and cache.stats()["entries"] == 1
+
+
+def test_entries_expire_after_ttl():
+    clock = FakeClock()
+    cache = ResultCache(max_bytes=100, ttl=10, clock=clock)
+    cache.put("a", 1, 10)
+    clock.now = 9.9
+    assert cache.get("a") == 1
+    clock.now = 10
+    assert cache.get("a") is None
+    assert cache.stats()["entries"] == 0 and cache.stats()["bytes"] == 0
+
+
+def test_hit_and_miss_counters():
+    cache = ResultCache(max_bytes=100, ttl=60)
+    assert cache.stats()["hit_rate"] == 0.0
+    cache.put(cache.key("lexico", "fn main() {}"), "r", 1)
+    assert cache.get(cache.key("lexico", "fn main() {}")) == "r"
+    assert cache.get(cache.key("sintactico", "fn main() {}")) is None
+    assert cache.get(cache.key("lexico", "fn otro() {}")) is None
+    stats = cache.stats()
+    assert (stats["hits"], stats["misses"]) == (1, 2)
+    assert abs(stats["hit_rate"] - 1 / 3) < 1e-9
+
+
+def test_cache_hit_skips_analysis_and_log(monkeypatch):
+    calls = []
+
+    def counting_stage(*args):
+        calls.append(args[0])
+        return run_stage_with_cache_stats(*args)
+
+    class RecordingWriter(LogWriter):
+        async def submit(self, filename, render, *args):
+            calls.append("log")
+            return True
+
+    monkeypatch.setattr(main, "analysis_pool", AnalysisPool(workers=0))
+    monkeypatch.setattr(main, "log_writer", RecordingWriter())
+    monkeypatch.setattr(main, "result_cache", ResultCache(max_bytes=1 << 20, ttl=60))
+    monkeypatch.setattr(main, "run_stage_with_cache_stats", counting_stage)
+    monkeypatch.setattr(main, "parse_cache_snapshots", {})
+
+    request = {"code": "fn main() {\n    let a: i32 = true;\n}\n"}
+    with TestClient(main.app) as client:
+        first = client.post("/analyze/semantico", json=request)
+        second = client.post("/analyze/semantico", json=request)
+        stats = client.get("/cache/stats").json()
+    assert first.status_code == second.status_code == 200
+    # El acierto no escribió log: no informa el de la primera petición
+    assert first.json()["log_file"] is not None
+    assert second.json() == dict(first.json(), log_file=None)
+    assert calls == ["semantico", "log"]
+    assert main.result_cache.stats()["hits"] == 1
+    assert (stats["hits"], stats["misses"]) == (1, 1)
+    # Sin procesos, el análisis corrió en el propio servidor
+    assert [worker["pid"] for worker in stats["parse_cache"]["workers"]] == [os.getpid()]
+
+
+def test_parse_cache_stats_are_summed_over_live_workers(monkeypatch):
+    class FakePool:
+        def worker_pids(self):
+            return {11, 12}
+
+    def snapshot(pid, hits, misses):
+        return {"hits": hits, "misses": misses, "hit_rate": 0.0, "evictions": 0,
+                "entries": misses, "bytes": 10 * misses, "max_bytes": 100, "pid": pid}
+
+    snapshots = {12: snapshot(12, 3, 1), 11: snapshot(11, 0, 4), 99: snapshot(99, 7, 7)}
+    monkeypatch.setattr(main, "analysis_pool", FakePool())
+    monkeypatch.setattr(main, "parse_cache_snapshots", snapshots)
+    summary = main.parse_cache_summary()
+    # El proceso 99 ya no está en el pool: se descarta
+    assert [worker["pid"] for worker in summary["workers"]] == [11, 12]
+    assert 99 not in snapshots
+    total = summary["total"]
+    assert (total["hits"], total["misses"], total["entries"], total["bytes"]) == (3, 5, 5, 50)
+    assert total["max_bytes"] == 200 and total["hit_rate"] == 3 / 8